@@ -2,6 +2,7 @@ import bpy
 import os
 from bpy.types import Operator
 from ..utils.blender import clear_scene
+from ..utils.discovery import discover_files
 
 class SSTOOL_OT_ApplyModificationsOperator(Operator):
 	bl_idname = "sstool.apply_modifications"
@@ -34,35 +35,24 @@ class SSTOOL_OT_ApplyModificationsOperator(Operator):
 		processed_count = 0
 		error_count = 0
 
-		# Walk through directory
-		if props.include_subfolders:
-			file_iterator = os.walk(input_dir)
-		else:
-			# Only process files in the root directory
-			root_files = []
-			if os.path.exists(input_dir):
-				for file in os.listdir(input_dir):
-					file_path = os.path.join(input_dir, file)
-					if os.path.isfile(file_path):
-						root_files.append((input_dir, [], [file]))
-			file_iterator = root_files
-
-		for root, dirs, files in file_iterator:
-			for file in files:
-				if file.endswith('.blend'):
-					filepath = os.path.join(root, file)
-					try:
-						if self.process_blend_file(filepath, apply_location, apply_rotation, apply_scale):
-							processed_count += 1
-							self.report({'INFO'}, f"Processed: {file}")
-						else:
-							error_count += 1
-							self.report({'WARNING'}, f"No objects to process in: {file}")
-					except Exception as e:
-						error_count += 1
-						self.report({'ERROR'}, f"Failed to process {file}: {str(e)}")
-					finally:
-						clear_scene()
+		# Discover .blend files lazily; processing starts while the walk continues
+		discovery = discover_files(input_dir, ".blend", recursive=props.include_subfolders)
+
+		for discovered in discovery:
+			filepath = discovered.path
+			file = os.path.basename(filepath)
+			try:
+				if self.process_blend_file(filepath, apply_location, apply_rotation, apply_scale):
+					processed_count += 1
+					self.report({'INFO'}, f"Processed: {file} ({discovery.progress(processed_count + error_count)})")
+				else:
+					error_count += 1
+					self.report({'WARNING'}, f"No objects to process in: {file}")
+			except Exception as e:
+				error_count += 1
+				self.report({'ERROR'}, f"Failed to process {file}: {str(e)}")
+			finally:
+				clear_scene()
 
 		if processed_count > 0:
 			self.report({'INFO'}, f"Successfully processed {processed_count} files")
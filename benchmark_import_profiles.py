@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark adaptive FBX import profiles against Blender's default importer options
+Run with: blender --background --python benchmark_import_profiles.py -- <fbx_folder> [repeats]
+"""
+
+import bpy
+import importlib
+import os
+import sys
+import time
+
+# Make the add-on importable as a package so its relative imports resolve
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(addon_path) not in sys.path:
+    sys.path.append(os.path.dirname(addon_path))
+addon_name = os.path.basename(addon_path)
+
+profiles = importlib.import_module(f"{addon_name}.fbx2glb.importers.profiles")
+fbx_importer = importlib.import_module(f"{addon_name}.fbx2glb.importers.fbx")
+
+def clear_scene():
+    """Remove everything a previous import created"""
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+def time_import(filepath, options):
+    clear_scene()
+    start = time.perf_counter()
+    bpy.ops.import_scene.fbx(filepath=filepath, **options)
+    return time.perf_counter() - start
+
+def run_benchmark(folder, repeats):
+    fbx_files = []
+    for root, dirs, files in os.walk(folder):
+        fbx_files.extend(os.path.join(root, f) for f in files if f.lower().endswith('.fbx'))
+
+    if not fbx_files:
+        print(f"No FBX files found in {folder}")
+        return
+
+    # profile name -> [file count, default seconds, profile seconds, probe seconds]
+    totals = {}
+    for fbx_file in sorted(fbx_files):
+        import_path = fbx_importer.resolve_binary_fbx(fbx_file)
+
+        probe_start = time.perf_counter()
+        profile = profiles.select_import_profile(import_path)
+        probe_time = time.perf_counter() - probe_start
+
+        default_time = min(time_import(import_path, {}) for _ in range(repeats))
+        profile_time = min(time_import(import_path, profile.options) for _ in range(repeats))
+
+        entry = totals.setdefault(profile.name, [0, 0.0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += default_time
+        entry[2] += profile_time
+        entry[3] += probe_time
+        print(f"{os.path.basename(fbx_file)}: {profile.name} "
+              f"default={default_time:.3f}s profile={profile_time:.3f}s probe={probe_time * 1000:.1f}ms")
+
+    print("\n=== Import profile savings ===")
+    print(f"{'Profile':<10} {'Files':>6} {'Default (s)':>12} {'Profile (s)':>12} {'Probe (s)':>10} {'Saved':>8}")
+    for name, (count, default_total, profile_total, probe_total) in sorted(totals.items()):
+        saved = default_total - (profile_total + probe_total)
+        percent = (saved / default_total * 100) if default_total else 0.0
+        print(f"{name:<10} {count:>6} {default_total:>12.3f} {profile_total:>12.3f} {probe_total:>10.3f} {percent:>7.1f}%")
+
+if __name__ == "__main__":
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if not args:
+        print("Usage: blender --background --python benchmark_import_profiles.py -- <fbx_folder> [repeats]")
+    else:
+        run_benchmark(args[0], int(args[1]) if len(args) > 1 else 3)
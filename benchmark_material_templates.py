@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark building material node trees node by node against cloning template prototypes
+Run with: blender --background --python benchmark_material_templates.py -- [count] [texture_folder]
+"""
+
+import bpy
+import importlib
+import os
+import sys
+import time
+
+# Make the add-on importable as a package so its relative imports resolve
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(addon_path) not in sys.path:
+    sys.path.append(os.path.dirname(addon_path))
+addon_name = os.path.basename(addon_path)
+
+base_material = importlib.import_module(f"{addon_name}.fbx2glb.materials.base_material")
+file_detection = importlib.import_module(f"{addon_name}.utils.file_detection")
+
+TEMPLATES = {
+    'standard': lambda name, textures: base_material.StandardPBRMaterial(name, textures),
+    'emissive': lambda name, textures: base_material.EmissiveMaterial(name, textures),
+    'error': lambda name, textures: base_material.ErrorMaterial(name),
+}
+
+def find_textures(folder):
+    """Best texture of each type in the folder, as the material factory picks them"""
+    if not folder:
+        return {}
+    detected = file_detection.TextureDetector.detect_textures_in_folder(folder)
+    textures = {}
+    for texture_type, candidates in detected.items():
+        best = file_detection.TextureDetector.get_best_texture(candidates)
+        if best:
+            textures[texture_type] = best.path
+    return textures
+
+def time_materials(make_builder, textures, count, clone):
+    """Seconds to create count materials, which are removed again afterwards"""
+    materials = []
+    start = time.perf_counter()
+    for index in range(count):
+        builder = make_builder(f"Benchmark_{index:05d}", textures)
+        material = builder.create_material() if clone else builder.build_material()
+        materials.append(material)
+    elapsed = time.perf_counter() - start
+    for material in materials:
+        if material is not None:
+            bpy.data.materials.remove(material)
+    return elapsed
+
+def run_benchmark(count, texture_folder):
+    textures = find_textures(texture_folder)
+    print(f"Textures: {', '.join(sorted(textures)) or 'none'}")
+
+    print("\n=== Material creation ===")
+    print(f"{'Template':<10} {'Count':>6} {'Build (s)':>10} {'Clone (s)':>10} {'Speedup':>8}")
+    for name, make_builder in TEMPLATES.items():
+        # Build the prototype outside the timing; it is built once per batch
+        warmup = make_builder("Benchmark_Warmup", textures).create_material()
+        if warmup is not None:
+            bpy.data.materials.remove(warmup)
+        build_time = time_materials(make_builder, textures, count, clone=False)
+        clone_time = time_materials(make_builder, textures, count, clone=True)
+        speedup = build_time / clone_time if clone_time else 0.0
+        print(f"{name:<10} {count:>6} {build_time:>10.3f} {clone_time:>10.3f} {speedup:>7.1f}x")
+
+if __name__ == "__main__":
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    run_benchmark(int(args[0]) if args else 1000, args[1] if len(args) > 1 else None)
@@ -1,6 +1,7 @@
 import bpy
 import os
 from bpy.types import Operator
+from ..utils.image_dedup import dedup_images
 
 class SSTOOL_OT_CleanBlendOperator(Operator):
 	bl_idname = "sstool.clean_blend_execute"
@@ -40,6 +41,8 @@ class SSTOOL_OT_CleanBlendOperator(Operator):
 							if node.type == 'TEX_IMAGE':
 								node.image = image
 
+				# Images left on other users (e.g. lights, worlds) that duplicate the new one
+				dedup_images()
 				bpy.ops.wm.save_mainfile(filepath=os.path.join(folder, file))
 
 		self.report({'INFO'}, "Blend files processed.")
@@ -1,18 +1,76 @@
 import bpy
 import os
+import time
+from urllib.parse import quote, unquote
+from .gltf_container import GLTFFormatError, read_gltf, write_gltf
+from .image_cache import ImageSubstitution
+from ...utils.texture_store import MIME_EXTENSIONS, TextureStore
 
-def export_as_glb(original_fbx_path, output_folder):
+_texture_stores = {}
+
+def get_texture_store(root_folder):
+	"""Shared texture store for an output root (kept for the session)"""
+	root_folder = os.path.abspath(root_folder)
+	if root_folder not in _texture_stores:
+		_texture_stores[root_folder] = TextureStore(root_folder)
+	return _texture_stores[root_folder]
+
+def link_shared_textures(output_path, store, written_since=None):
+	"""
+	Move an exported file's images into the shared texture store.
+
+	Embedded images are pulled out of the GLB binary chunk and external images
+	are moved (if the exporter just wrote them) or copied (original input
+	textures) into the store. Every image URI is rewritten to point at the
+	stored file. Returns the number of images linked.
+	"""
+	document = read_gltf(output_path)
+	images = document.data.get('images', [])
+	output_dir = document.base_dir
+	removed_views = []
+	stored_sources = {}
+	for image in images:
+		if 'bufferView' in image:
+			data = document.buffer_view_bytes(image['bufferView'])
+			stored = store.add_bytes(data, MIME_EXTENSIONS.get(image.get('mimeType'), '.png'))
+			removed_views.append(image.pop('bufferView'))
+		elif 'uri' in image and not image['uri'].startswith('data:'):
+			source = os.path.normpath(os.path.join(output_dir, unquote(image['uri'])))
+			stored = stored_sources.get(source)
+			if stored is None:
+				if not os.path.isfile(source):
+					print(f"[WARNING] Exported image not found: {source}")
+					continue
+				written_by_export = written_since is not None and os.path.getmtime(source) >= written_since
+				stored = store.add_file(source, move=written_by_export)
+				if stored is None:
+					continue
+				stored_sources[source] = stored
+		else:
+			continue
+		image['uri'] = quote(store.relative_uri(stored, output_dir))
+
+	document.remove_buffer_views(removed_views)
+	write_gltf(document)
+	return len(images)
+
+def export_as_glb(original_fbx_path, output_folder, texture_store_root=None):
 	"""
 	Export scene as GLB/GLTF with configurable texture handling.
 
 	Supports both embedded textures (larger files) and separate texture files
-	based on user preferences.
+	based on user preferences. Separate textures go to a shared,
+	content-addressed texture folder under texture_store_root (default: the
+	output folder) unless shared textures are turned off.
 	"""
 	try:
 		# Get export settings from scene properties
 		props = bpy.context.scene.fbx2glb_props
 		embed_textures = getattr(props, 'embed_textures', False)
 		export_format = getattr(props, 'export_format', 'GLB')
+		share_textures = getattr(props, 'share_textures', True)
+		# Textures already transcoded by the texture pipeline are passed through as-is
+		external_image_format = 'AUTO' if getattr(props, 'texture_format', 'KEEP') != 'KEEP' else 'JPEG'
 
 		base_name = os.path.splitext(os.path.basename(original_fbx_path))[0]
 
@@ -56,17 +114,56 @@ def export_as_glb(original_fbx_path, output_folder):
 				print(f"[INFO] Exporting GLB with embedded textures: {output_path}")
 			else:
 				# GLB without embedded textures - use external texture references
-				export_params['export_image_format'] = 'JPEG'  # Don't embed, reference external
+				export_params['export_image_format'] = external_image_format  # Don't embed, reference external
 				export_params['export_texture_dir'] = output_folder
 				print(f"[INFO] Exporting GLB with external texture references: {output_path}")
 		else:
 			# For GLTF_SEPARATE, always use separate texture files
-			export_params['export_image_format'] = 'JPEG'
+			export_params['export_image_format'] = external_image_format
 			export_params['export_texture_dir'] = output_folder
 			print(f"[INFO] Exporting GLTF with separate texture files: {output_path}")
 
+		use_texture_store = share_textures and (export_format_setting == 'GLTF_SEPARATE' or not embed_textures)
+		if use_texture_store:
+			# Reference the source images instead of re-encoding them for every model
+			export_params['export_keep_originals'] = True
+
+		# Embedded images already encoded earlier in the batch are spliced in after export
+		substitution = None
+		if export_format_setting == 'GLB' and embed_textures:
+			settings_key = (export_params['export_image_format'], export_params.get('export_jpeg_quality'))
+			substitution = ImageSubstitution(settings_key)
+
 		# Perform the export
-		bpy.ops.export_scene.gltf(**export_params)
+		export_started = time.time()
+		try:
+			if substitution is not None:
+				substitution.apply()
+			bpy.ops.export_scene.gltf(**export_params)
+		finally:
+			if substitution is not None:
+				substitution.restore()
+
+		if substitution is not None:
+			try:
+				spliced, harvested = substitution.finish(output_path)
+				if spliced or harvested:
+					print(f"[INFO] Reused {spliced} encoded images, cached {harvested} new ones")
+			except (OSError, GLTFFormatError) as e:
+				if not substitution.placeholders:
+					print(f"[WARNING] Could not cache encoded images from {output_path}: {e}")
+				else:
+					# The file still holds the 1x1 placeholders: export it again with the real images
+					print(f"[WARNING] Could not splice cached images into {output_path}: {e}; exporting again")
+					bpy.ops.export_scene.gltf(**export_params)
+
+		if use_texture_store:
+			store = get_texture_store(texture_store_root or output_folder)
+			try:
+				linked = link_shared_textures(output_path, store, export_started)
+				print(f"[INFO] Linked {linked} images to shared textures ({store.written} written, {store.reused} reused)")
+			except (OSError, GLTFFormatError) as e:
+				print(f"[WARNING] Could not link shared textures for {output_path}: {e}")
 
 		return output_path
 
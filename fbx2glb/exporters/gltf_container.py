@@ -0,0 +1,147 @@
+import json
+import os
+import struct
+
+# Minimal reader/writer for exported .glb/.gltf files, used to post-process
+# exporter output (image URIs, embedded image buffers) without re-exporting.
+
+GLB_MAGIC = b'glTF'
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+class GLTFFormatError(Exception):
+	"""Raised when a file is not a glTF 2.0 container we understand"""
+
+class GLTFDocument:
+	"""The JSON part of a glTF file plus, for GLB, its binary chunk"""
+	def __init__(self, path, data, binary=None, is_glb=False):
+		self.path = path
+		self.data = data
+		self.binary = binary
+		self.is_glb = is_glb
+
+	@property
+	def base_dir(self):
+		return os.path.dirname(os.path.abspath(self.path))
+
+	def buffer_view_bytes(self, index):
+		"""Bytes of a buffer view stored in the GLB binary chunk"""
+		view = self.data['bufferViews'][index]
+		if not self.is_glb or view.get('buffer', 0) != 0 or self.binary is None:
+			raise GLTFFormatError("Buffer view is not stored in the GLB binary chunk")
+		start = view.get('byteOffset', 0)
+		return bytes(self.binary[start:start + view['byteLength']])
+
+	def remove_buffer_views(self, indices):
+		"""
+		Remove buffer views from the GLB binary chunk and compact it.
+
+		Remaining views are repacked in order (4-byte aligned) and every
+		'bufferView' reference in the document is renumbered.
+		"""
+		indices = set(indices)
+		if indices:
+			self._repack(indices, {})
+
+	def replace_buffer_views(self, replacements):
+		"""Replace the bytes of GLB buffer views ({index: bytes}) and repack the binary chunk"""
+		if replacements:
+			self._repack(set(), replacements)
+
+	def _repack(self, removed, replacements):
+		views = self.data.get('bufferViews', [])
+		remap = {}
+		kept = []
+		packed = bytearray()
+		for index, view in enumerate(views):
+			if index in removed:
+				continue
+			if view.get('buffer', 0) == 0 and self.binary is not None:
+				if index in replacements:
+					data = replacements[index]
+				else:
+					start = view.get('byteOffset', 0)
+					data = self.binary[start:start + view['byteLength']]
+				packed.extend(b'\x00' * (-len(packed) % 4))
+				view['byteOffset'] = len(packed)
+				view['byteLength'] = len(data)
+				packed.extend(data)
+			remap[index] = len(kept)
+			kept.append(view)
+
+		self.data['bufferViews'] = kept
+		if removed:
+			_remap_buffer_views(self.data, remap)
+		if self.binary is not None:
+			packed.extend(b'\x00' * (-len(packed) % 4))
+			self.binary = bytes(packed)
+			if self.binary:
+				self.data['buffers'][0]['byteLength'] = len(self.binary)
+			elif len(self.data['buffers']) == 1:
+				# Images were the only binary data; a zero-length buffer is invalid
+				del self.data['buffers']
+				self.binary = None
+
+def _remap_buffer_views(node, remap):
+	"""Renumber every 'bufferView' reference (accessors, images, extensions)"""
+	if isinstance(node, dict):
+		for key, value in node.items():
+			if key == 'bufferView' and isinstance(value, int):
+				node[key] = remap[value]
+			elif key != 'bufferViews':
+				_remap_buffer_views(value, remap)
+	elif isinstance(node, list):
+		for item in node:
+			_remap_buffer_views(item, remap)
+
+def read_gltf(path):
+	"""Read a .glb or .gltf file"""
+	with open(path, 'rb') as f:
+		content = f.read()
+
+	if content[:4] != GLB_MAGIC:
+		try:
+			return GLTFDocument(path, json.loads(content.decode('utf-8')))
+		except (UnicodeDecodeError, ValueError) as e:
+			raise GLTFFormatError(f"Not a glTF file: {e}")
+
+	magic, version, length = struct.unpack_from('<4sII', content, 0)
+	if version != GLB_VERSION:
+		raise GLTFFormatError(f"Unsupported GLB version {version}")
+
+	data = None
+	binary = None
+	offset = 12
+	while offset + 8 <= min(length, len(content)):
+		chunk_length, chunk_type = struct.unpack_from('<II', content, offset)
+		chunk = content[offset + 8:offset + 8 + chunk_length]
+		if chunk_type == CHUNK_JSON:
+			data = json.loads(chunk.decode('utf-8'))
+		elif chunk_type == CHUNK_BIN and binary is None:
+			binary = chunk
+		offset += 8 + chunk_length
+
+	if data is None:
+		raise GLTFFormatError("GLB has no JSON chunk")
+	return GLTFDocument(path, data, binary, is_glb=True)
+
+def write_gltf(document, path=None):
+	"""Write a document back to disk (atomically)"""
+	path = path or document.path
+	json_bytes = json.dumps(document.data, separators=(',', ':')).encode('utf-8')
+
+	temp_path = path + ".tmp"
+	with open(temp_path, 'wb') as f:
+		if not document.is_glb:
+			f.write(json_bytes)
+		else:
+			json_bytes += b' ' * (-len(json_bytes) % 4)
+			chunks = [struct.pack('<II', len(json_bytes), CHUNK_JSON), json_bytes]
+			if document.binary:
+				binary = document.binary + b'\x00' * (-len(document.binary) % 4)
+				chunks += [struct.pack('<II', len(binary), CHUNK_BIN), binary]
+			body = b''.join(chunks)
+			f.write(struct.pack('<4sII', GLB_MAGIC, GLB_VERSION, 12 + len(body)))
+			f.write(body)
+	os.replace(temp_path, path)
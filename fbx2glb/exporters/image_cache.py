@@ -0,0 +1,178 @@
+import bpy
+import os
+from collections import OrderedDict
+from .gltf_container import GLTFFormatError, read_gltf, write_gltf
+from ...utils.texture_index import texture_index
+
+# Encoded image bytes for embedded GLB textures.
+#
+# The glTF exporter encodes every image it embeds, so a folder sharing one
+# atlas encodes it once per model. Images whose encoded bytes are already
+# cached are swapped for a 1x1 placeholder before export; afterwards the
+# placeholder's image data in the GLB is replaced with the cached bytes.
+# Images exported for real are harvested into the cache from the GLB.
+#
+# Only images the exporter passes through unchanged are cached: image nodes
+# feeding Base Color (optionally with their own alpha), Emission, or a
+# Normal Map node. Channel-packed textures (roughness, metallic, occlusion)
+# are composited by the exporter and always exported normally.
+
+PLACEHOLDER_PREFIX = "sstool_encoded_"
+DEFAULT_BUDGET_BYTES = 512 * 1024 * 1024
+
+# (node type, input) pairs an image colour output may feed and still be exported as-is
+PASSTHROUGH_INPUTS = {
+	('BSDF_PRINCIPLED', 'Base Color'),
+	('BSDF_PRINCIPLED', 'Emission'),
+	('BSDF_PRINCIPLED', 'Emission Color'),
+	('EMISSION', 'Color'),
+	('NORMAL_MAP', 'Color'),
+}
+
+class EncodedImageCache:
+	"""LRU cache of (mime type, encoded bytes) keyed by content hash and encode settings"""
+	_instance = None
+
+	def __new__(cls):
+		if cls._instance is None:
+			cls._instance = super().__new__(cls)
+			cls._instance.entries = OrderedDict()
+			cls._instance.budget_bytes = DEFAULT_BUDGET_BYTES
+			cls._instance.cached_bytes = 0
+			cls._instance.hits = 0
+			cls._instance.misses = 0
+		return cls._instance
+
+	def get(self, key):
+		entry = self.entries.get(key)
+		if entry is not None:
+			self.entries.move_to_end(key)
+		return entry
+
+	def put(self, key, mime_type, data):
+		if key in self.entries:
+			return
+		self.entries[key] = (mime_type, data)
+		self.cached_bytes += len(data)
+		while self.cached_bytes > self.budget_bytes and len(self.entries) > 1:
+			_, (_, evicted) = self.entries.popitem(last=False)
+			self.cached_bytes -= len(evicted)
+
+	def clear(self):
+		self.entries.clear()
+		self.cached_bytes = 0
+
+def _gltf_image_name(image_name):
+	"""Name the glTF exporter gives an image exported from a single Blender image"""
+	name, extension = os.path.splitext(image_name)
+	return name if extension.lower() in ('.png', '.jpg', '.jpeg') else image_name
+
+def _is_passthrough(node, links):
+	"""Whether the exporter embeds this image node's image without compositing it"""
+	for link in links:
+		if link.from_node != node:
+			continue
+		target = (link.to_node.type, link.to_socket.name)
+		if link.from_socket.name == 'Color' and target in PASSTHROUGH_INPUTS:
+			continue
+		if link.from_socket.name == 'Alpha' and target == ('BSDF_PRINCIPLED', 'Alpha'):
+			continue
+		return False
+	return True
+
+def _image_content_hash(image):
+	if image.packed_file or image.source != 'FILE' or image.is_dirty or not image.filepath:
+		return None
+	return texture_index.get_content_hash(bpy.path.abspath(image.filepath))
+
+class ImageSubstitution:
+	"""Placeholder swaps for one export, undone by restore()"""
+
+	def __init__(self, settings_key):
+		self.settings_key = settings_key
+		self.swaps = []  # (node, original image)
+		self.placeholders = {}  # glTF image name -> (mime type, encoded bytes, original glTF name)
+		self.harvest = {}  # glTF image name -> cache key, for images exported for real
+		self._placeholder_images = []
+
+	def apply(self):
+		"""Swap every passthrough image with cached bytes for a placeholder"""
+		placeholder_images = {}
+		harvest_names = {}
+		for material in bpy.data.materials:
+			# Batch-cached template materials aren't exported
+			if not material.use_nodes or not material.node_tree or material.get('_synty_cached', False):
+				continue
+			links = material.node_tree.links
+			for node in material.node_tree.nodes:
+				if node.type != 'TEX_IMAGE' or node.image is None:
+					continue
+				content_hash = _image_content_hash(node.image)
+				if content_hash is None:
+					continue
+				cache_key = (content_hash,) + self.settings_key
+				passthrough = _is_passthrough(node, links)
+				gltf_name = _gltf_image_name(node.image.name)
+				entry = encoded_image_cache.get(cache_key) if passthrough else None
+				if entry is not None:
+					placeholder = placeholder_images.get(cache_key)
+					if placeholder is None:
+						placeholder = bpy.data.images.new(PLACEHOLDER_PREFIX + content_hash[:16], 1, 1, alpha=True)
+						placeholder_images[cache_key] = placeholder
+						self._placeholder_images.append(placeholder)
+						self.placeholders[_gltf_image_name(placeholder.name)] = entry + (gltf_name,)
+					self.swaps.append((node, node.image))
+					node.image = placeholder
+				else:
+					# A name used by a composited image too is ambiguous in the output
+					harvest_names.setdefault(gltf_name, set()).add(cache_key if passthrough else None)
+
+		self.harvest = {name: keys.pop() for name, keys in harvest_names.items()
+						if len(keys) == 1 and None not in keys}
+		return self
+
+	def restore(self):
+		"""Put the original images back and delete the placeholders"""
+		for node, image in self.swaps:
+			node.image = image
+		for placeholder in self._placeholder_images:
+			bpy.data.images.remove(placeholder)
+		self.swaps = []
+		self._placeholder_images = []
+
+	def finish(self, output_path):
+		"""Splice cached bytes into the exported GLB and harvest newly encoded images"""
+		if not self.placeholders and not self.harvest:
+			return 0, 0
+		document = read_gltf(output_path)
+		names = [image.get('name') for image in document.data.get('images', [])]
+		# Every placeholder must appear exactly once as embedded data, or the file keeps 1x1 textures
+		embedded = [image.get('name') for image in document.data.get('images', []) if 'bufferView' in image]
+		missing = [name for name in self.placeholders if name not in embedded]
+		repeated = [name for name in self.placeholders if names.count(name) > 1]
+		if missing or repeated:
+			raise GLTFFormatError(f"Placeholder images not spliced (missing: {missing}, repeated: {repeated})")
+		replacements = {}
+		harvested = 0
+		for image, name in zip(document.data.get('images', []), names):
+			if 'bufferView' not in image:
+				continue
+			if name in self.placeholders:
+				mime_type, data, original_name = self.placeholders[name]
+				image['name'] = original_name
+				image['mimeType'] = mime_type
+				replacements[image['bufferView']] = data
+				encoded_image_cache.hits += 1
+			elif name in self.harvest and names.count(name) == 1:
+				encoded_image_cache.put(self.harvest[name], image.get('mimeType', 'image/png'),
+										document.buffer_view_bytes(image['bufferView']))
+				encoded_image_cache.misses += 1
+				harvested += 1
+
+		if replacements:
+			document.replace_buffer_views(replacements)
+			write_gltf(document)
+		return len(replacements), harvested
+
+# Global encoded image cache instance
+encoded_image_cache = EncodedImageCache()
@@ -1,8 +1,12 @@
 # importers/fbx.py
 
 import bpy
+import os
 from ..utils.clean_up import clean_up_clutter
 from ..utils.corrections import rotate_armatures, normalize_object_group_scale
+from ...utils.file_detection import read_fbx_header, is_ascii_fbx_header
+from ...utils.fbx_ascii_converter import FBXConversionError, get_converted_fbx_path
+from .profiles import PROFILES, select_import_profile
 
 def is_ascii_fbx(filepath):
 	"""
@@ -10,42 +14,66 @@ def is_ascii_fbx(filepath):
 	Blender only supports binary FBX files.
 	"""
 	try:
-		with open(filepath, 'rb') as f:
-			header = f.read(512)
-			if b'Kaydara FBX ASCII' in header:
-				return True
-			if header.strip().startswith(b';'):  # Legacy ASCII FBX signature
-				return True
-			return False
+		return is_ascii_fbx_header(read_fbx_header(filepath))
 	except Exception as e:
 		print(f"[ERROR] Could not read FBX header: {e}")
 		return False
 
 
-def import_fbx(filepath):
+def resolve_binary_fbx(filepath, is_ascii=None, content_hash=None):
+	"""
+	Returns a path Blender's FBX importer can read.
+
+	Binary files are returned unchanged. ASCII files are converted to binary
+	in the add-on cache directory (and reused while the source is unchanged).
+	If the caller already knows the file format (e.g. from the pre-flight
+	scan), pass is_ascii to skip reading the header again.
+	"""
+	if is_ascii is None:
+		is_ascii = is_ascii_fbx(filepath)
+
+	if not is_ascii:
+		return filepath
+
+	try:
+		converted_path = get_converted_fbx_path(filepath, content_hash)
+	except FBXConversionError as e:
+		raise RuntimeError(f"ASCII FBX conversion failed:\n{filepath}\n\n{e}")
+
+	print(f"[INFO] Using binary conversion of ASCII FBX: {os.path.basename(filepath)}")
+	return converted_path
+
+
+def import_fbx(filepath, is_ascii=None, content_hash=None, metadata=None):
 	"""
 	Imports an FBX file into the current Blender scene.
 
 	Uses Blender's built-in FBX importer to load the specified file.
+	ASCII files are converted to binary first (see resolve_binary_fbx).
+	With adaptive import enabled, importer options come from the file's
+	import profile (metadata from the pre-flight scan is reused if given).
 	Applies optional rotation fix and cleans up common import clutter.
 	"""
 
-	if is_ascii_fbx(filepath):
-		raise RuntimeError(
-			f"ASCII FBX files are not supported:\n{filepath}\n\n"
-			"Use Autodesk FBX Converter to convert it to binary format."
-		)
+	filepath = resolve_binary_fbx(filepath, is_ascii, content_hash)
 
 	scene = bpy.context.scene
 	settings = scene.fbx2glb_props
 
+	if getattr(settings, 'adaptive_import', True):
+		profile = select_import_profile(filepath, metadata)
+	else:
+		profile = PROFILES['DEFAULT']
+	scene['import_profile'] = profile.name  # Store for reporting
+
 	force_rotate = settings.character_rotate_fix
 	auto_normalize_scale = settings.auto_normalize_scale
 
 	scale_flags = set()
 
 	# Import FBX
-	bpy.ops.import_scene.fbx(filepath=filepath)
+	print(f"[INFO] Importing with {profile.name} profile: {os.path.basename(filepath)}")
+	bpy.ops.import_scene.fbx(filepath=filepath, **profile.options)
 
 	#Apply scale 1.0
 	for obj in bpy.context.selected_objects:
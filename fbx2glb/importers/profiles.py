@@ -0,0 +1,61 @@
+# importers/profiles.py
+
+import os
+from ...utils.fbx_reader import FBXReadError, read_fbx_metadata
+
+class ImportProfile:
+	"""A named set of options for bpy.ops.import_scene.fbx"""
+	def __init__(self, name, description, options):
+		self.name = name
+		self.description = description
+		self.options = options
+
+
+# Materials are always replaced after import, so the importer never needs to
+# search for missing images. Animation baking and armature handling are only
+# paid for when the file actually contains them.
+PROFILES = {
+	'STATIC': ImportProfile('STATIC', "Static mesh, no armature or animation", {
+		'use_anim': False,
+		'use_image_search': False,
+		'use_custom_props': False,
+	}),
+	'SKINNED': ImportProfile('SKINNED', "Skinned mesh without animation", {
+		'use_anim': False,
+		'use_image_search': False,
+	}),
+	'ANIMATED': ImportProfile('ANIMATED', "Contains animation curves", {
+		'use_image_search': False,
+	}),
+	'DEFAULT': ImportProfile('DEFAULT', "Probe failed, Blender's importer defaults", {}),
+}
+
+
+def profile_for_metadata(metadata):
+	"""
+	Returns the cheapest profile that still imports the file correctly.
+	"""
+	if metadata is None:
+		return PROFILES['DEFAULT']
+	if metadata.has_animation:
+		return PROFILES['ANIMATED']
+	if metadata.is_skinned or metadata.bone_count > 0:
+		return PROFILES['SKINNED']
+	return PROFILES['STATIC']
+
+
+def select_import_profile(filepath, metadata=None):
+	"""
+	Picks the import profile for a binary FBX file.
+
+	Uses metadata from the pre-flight scan when available, otherwise probes
+	the file's records (no geometry is decoded). Falls back to Blender's
+	defaults if the file can't be probed.
+	"""
+	if metadata is None:
+		try:
+			metadata = read_fbx_metadata(filepath, count_polygons=False)
+		except (FBXReadError, OSError) as e:
+			print(f"[WARNING] Could not probe {os.path.basename(filepath)}, using default import options: {e}")
+			return PROFILES['DEFAULT']
+	return profile_for_metadata(metadata)
@@ -1,8 +1,56 @@
 import bpy
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 # Removed logger import to avoid conflicts
 from ...utils.texture_cache import texture_cache
+from ..textures.alpha import apply_alpha_mode
+
+# Custom node group the glTF exporter reads extra outputs (occlusion) from
+GLTF_OUTPUT_GROUP_NAME = "glTF Material Output"
+
+def get_gltf_output_group() -> bpy.types.NodeTree:
+    """Return (creating if needed) the 'glTF Material Output' node group with an Occlusion input"""
+    group = bpy.data.node_groups.get(GLTF_OUTPUT_GROUP_NAME)
+    if group is None:
+        group = bpy.data.node_groups.new(GLTF_OUTPUT_GROUP_NAME, 'ShaderNodeTree')
+        if hasattr(group, 'interface'):
+            # Blender 4.0+
+            socket = group.interface.new_socket("Occlusion", in_out='INPUT', socket_type='NodeSocketFloat')
+        else:
+            socket = group.inputs.new('NodeSocketFloat', "Occlusion")
+        socket.default_value = 1.0
+        socket.min_value = 0.0
+        socket.max_value = 1.0
+    return group
+
+# Custom property of prototype materials; the same marker scene clears, texture stages and merges skip
+PROTOTYPE_PROPERTY = "_synty_cached"
+
+# Texture slots a PBR template can fill, in node layout order, with their colour spaces
+TEXTURE_SLOTS = (
+    ('diffuse', 'sRGB'),
+    ('normal', 'Non-Color'),
+    ('roughness', 'Non-Color'),
+    ('metallic', 'Non-Color'),
+    ('occlusion', 'Non-Color'),
+)
+
+# (builder class, node layout) -> prototype material, built once per batch
+_prototypes: Dict[Tuple, bpy.types.Material] = {}
+
+def is_material_alive(material) -> bool:
+    """Whether a material reference still points at a material in bpy.data"""
+    try:
+        return material is not None and bpy.data.materials.get(material.name) == material
+    except ReferenceError:
+        return False
+
+def clear_prototypes():
+    """Remove the prototype materials; the next material of each layout builds a new one"""
+    for prototype in _prototypes.values():
+        if is_material_alive(prototype):
+            bpy.data.materials.remove(prototype)
+    _prototypes.clear()
 
 class MaterialNode:
     """Represents a shader node with its properties and connections"""
@@ -13,7 +61,13 @@ class MaterialNode:
         self.connections = []  # List of (output_socket, input_socket) tuples
 
 class BaseMaterial(ABC):
-    """Base class for all material builders"""
+    """
+    Base class for all material builders.
+
+    The node tree of each layout (which texture slots are filled) is built
+    once per batch as a prototype material. Materials are clones of the
+    prototype (Material.copy()) with only their images and values patched.
+    """
 
     def __init__(self, name: str):
         self.name = name
@@ -22,16 +76,16 @@ class BaseMaterial(ABC):
         self.node_tree = None
 
     def create_material(self) -> Optional[bpy.types.Material]:
-        """Create and return the complete material"""
+        """Create and return the complete material, cloned from its layout's prototype"""
         try:
-            self.material = bpy.data.materials.new(name=self.name)
-            self.material.use_nodes = True
-            self.node_tree = self.material.node_tree
-            self.node_tree.nodes.clear()
-
-            # Build the material
-            self._build_nodes()
-            self._setup_connections()
+            self._prepare()
+            material = self._get_prototype().copy()
+            del material[PROTOTYPE_PROPERTY]
+            material.use_fake_user = False
+            material.name = self.name
+            self._attach(material)
+
+            self._patch_nodes()
             self._configure_material_properties()
 
             print(f"[DEBUG] Created material: {self.name}")
@@ -41,6 +95,53 @@ class BaseMaterial(ABC):
             print(f"[ERROR] Failed to create material {self.name}: {e}")
             return None
 
+    def build_material(self) -> Optional[bpy.types.Material]:
+        """Create the material node by node, without a prototype (what cloning saves)"""
+        try:
+            self._prepare()
+            self._build_tree(self.name)
+            self._patch_nodes()
+            self._configure_material_properties()
+            return self.material
+
+        except Exception as e:
+            print(f"[ERROR] Failed to build material {self.name}: {e}")
+            return None
+
+    def _get_prototype(self) -> bpy.types.Material:
+        """The prototype for this builder's layout, building it on first use"""
+        key = (type(self).__name__,) + self._layout_key()
+        prototype = _prototypes.get(key)
+        if not is_material_alive(prototype):
+            prototype = self._build_tree("_SSTOOL_Prototype_" + "_".join(key))
+            prototype.use_fake_user = True
+            prototype[PROTOTYPE_PROPERTY] = True
+            _prototypes[key] = prototype
+        return prototype
+
+    def _build_tree(self, name: str) -> bpy.types.Material:
+        """New material with this layout's nodes and links (no images or per-material values)"""
+        material = bpy.data.materials.new(name=name)
+        material.use_nodes = True
+        material.node_tree.nodes.clear()
+        self._attach(material)
+        self._build_nodes()
+        self._setup_connections()
+        return material
+
+    def _attach(self, material: bpy.types.Material):
+        self.material = material
+        self.node_tree = material.node_tree
+        # Nodes are named by their key, so clones find their nodes by name
+        self.nodes = {node.name: node for node in self.node_tree.nodes}
+
+    def _prepare(self):
+        """Resolve what decides the layout (e.g. loaded textures) before the prototype is looked up"""
+
+    def _layout_key(self) -> Tuple:
+        """What distinguishes node layouts of this builder; one prototype is kept per key"""
+        return ()
+
     @abstractmethod
     def _build_nodes(self):
         """Build all required nodes for this material type"""
@@ -51,19 +152,21 @@ class BaseMaterial(ABC):
         """Setup connections between nodes"""
         pass
 
+    def _patch_nodes(self):
+        """Set the per-material images and values on a clone"""
+
     def _configure_material_properties(self):
         """Configure material-level properties (blend mode, etc.)"""
         if self.material:
-            self.material.blend_method = 'BLEND'
-            # shadow_method was removed in Blender 4.0+
-            if hasattr(self.material, 'shadow_method'):
-                self.material.shadow_method = 'HASHED'
+            # OPAQUE, CLIP or BLEND depending on the base colour texture's alpha coverage
+            apply_alpha_mode(self.material)
             self.material.use_backface_culling = False
 
     def add_node(self, key: str, node_type: str, location: tuple = (0, 0)) -> Optional[bpy.types.Node]:
         """Add a node to the material"""
         try:
             node = self.node_tree.nodes.new(node_type)
+            node.name = key
             node.location = location
             self.nodes[key] = node
             return node
@@ -85,29 +188,6 @@ class BaseMaterial(ABC):
         except Exception as e:
             print(f"[ERROR] Failed to connect nodes: {e}")
 
-    def add_texture_node(self, key: str, texture_path: str, location: tuple = (0, 0),
-                        colorspace: str = 'sRGB') -> Optional[bpy.types.Node]:
-        """Add a texture node with cached image loading"""
-        if not texture_path:
-            return None
-
-        try:
-            texture_node = self.add_node(key, "ShaderNodeTexImage", location)
-            if texture_node:
-                image = texture_cache.get_texture(texture_path)
-                if image:
-                    texture_node.image = image
-                    if colorspace != 'sRGB':
-                        image.colorspace_settings.name = colorspace
-                    print(f"[DEBUG] Added texture node {key} with image: {texture_path}")
-                    return texture_node
-                else:
-                    print(f"[WARNING] Failed to load texture for {key}: {texture_path}")
-            return None
-        except Exception as e:
-            print(f"[ERROR] Failed to add texture node {key}: {e}")
-            return None
-
 class StandardPBRMaterial(BaseMaterial):
     """Standard PBR material with support for common texture maps"""
 
@@ -116,35 +196,40 @@ class StandardPBRMaterial(BaseMaterial):
         super().__init__(name)
         self.textures = textures or {}
         self.inherit_from = inherit_from
+        self.images = {}
+
+    def _prepare(self):
+        """Load the textures (through the cache); slots whose texture fails to load are left out"""
+        self.images = {}
+        for slot, _ in TEXTURE_SLOTS:
+            texture_path = self.textures.get(slot)
+            if not texture_path:
+                continue
+            image = texture_cache.get_texture(texture_path)
+            if image:
+                self.images[slot] = image
+            else:
+                print(f"[WARNING] Failed to load texture for {slot}: {texture_path}")
+
+    def _layout_key(self) -> Tuple:
+        return tuple(slot for slot, _ in TEXTURE_SLOTS if slot in self.images)
 
     def _build_nodes(self):
         """Build PBR material nodes"""
         # Main BSDF shader
-        bsdf = self.add_node('bsdf', "ShaderNodeBsdfPrincipled", (0, 0))
-
-        # Set default values or inherit from original material
-        if self.inherit_from and self.inherit_from.use_nodes:
-            self._inherit_bsdf_values(bsdf)
-        else:
-            self._set_default_bsdf_values(bsdf)
+        self.add_node('bsdf', "ShaderNodeBsdfPrincipled", (0, 0))
 
         # Add texture nodes
         y_offset = 0
-        if 'diffuse' in self.textures:
-            self.add_texture_node('diffuse', self.textures['diffuse'], (-300, y_offset))
-            y_offset -= 300
-
-        if 'normal' in self.textures:
-            self.add_texture_node('normal', self.textures['normal'], (-300, y_offset), 'Non-Color')
-            normal_map = self.add_node('normal_map', "ShaderNodeNormalMap", (-100, y_offset))
-            y_offset -= 300
-
-        if 'roughness' in self.textures:
-            self.add_texture_node('roughness', self.textures['roughness'], (-300, y_offset), 'Non-Color')
-            y_offset -= 300
-
-        if 'metallic' in self.textures:
-            self.add_texture_node('metallic', self.textures['metallic'], (-300, y_offset), 'Non-Color')
+        for slot, _ in TEXTURE_SLOTS:
+            if slot not in self.images:
+                continue
+            self.add_node(slot, "ShaderNodeTexImage", (-300, y_offset))
+            if slot == 'normal':
+                self.add_node('normal_map', "ShaderNodeNormalMap", (-100, y_offset))
+            elif slot == 'occlusion':
+                gltf_output = self.add_node('gltf_output', "ShaderNodeGroup", (300, y_offset))
+                gltf_output.node_tree = get_gltf_output_group()
             y_offset -= 300
 
         # Output node
@@ -169,9 +254,33 @@ class StandardPBRMaterial(BaseMaterial):
         if 'metallic' in self.nodes:
             self.connect_nodes('metallic', 'Color', 'bsdf', 'Metallic')
 
-        # Connect to output
+        # Connect occlusion to the glTF output group
+        if 'occlusion' in self.nodes and 'gltf_output' in self.nodes:
+            self.connect_nodes('occlusion', 'Color', 'gltf_output', 'Occlusion')
+
+        self._connect_surface()
+
+    def _connect_surface(self):
+        """Connect the shader to the material output"""
         self.connect_nodes('bsdf', 'BSDF', 'output', 'Surface')
 
+    def _patch_nodes(self):
+        """Set the images and BSDF values"""
+        for slot, colorspace in TEXTURE_SLOTS:
+            image = self.images.get(slot)
+            if image is None:
+                continue
+            self.nodes[slot].image = image
+            if colorspace != 'sRGB':
+                image.colorspace_settings.name = colorspace
+
+        # Set default values or inherit from original material
+        bsdf = self.nodes['bsdf']
+        if self.inherit_from and self.inherit_from.use_nodes:
+            self._inherit_bsdf_values(bsdf)
+        else:
+            self._set_default_bsdf_values(bsdf)
+
     def _inherit_bsdf_values(self, bsdf_node):
         """Inherit values from original material"""
         for node in self.inherit_from.node_tree.nodes:
@@ -208,48 +317,42 @@ class EmissiveMaterial(StandardPBRMaterial):
         super()._build_nodes()
 
         # Add emission nodes
-        emission = self.add_node('emission', "ShaderNodeEmission", (200, -200))
-        emission.inputs["Strength"].default_value = self.emission_strength
-
-        mix_shader = self.add_node('mix_shader', "ShaderNodeMixShader", (400, 0))
-        mix_shader.inputs["Fac"].default_value = self.emission_factor
-
-    def _setup_connections(self):
-        """Setup connections including emission"""
-        # Setup base PBR connections first
-        super()._setup_connections()
-
-        # Disconnect BSDF from output and route through mix shader
-        # Remove existing connection
-        for link in self.node_tree.links:
-            if (link.from_node == self.nodes['bsdf'] and
-                link.to_node == self.nodes['output']):
-                self.node_tree.links.remove(link)
-                break
+        self.add_node('emission', "ShaderNodeEmission", (200, -200))
+        self.add_node('mix_shader', "ShaderNodeMixShader", (400, 0))
 
+    def _connect_surface(self):
+        """Route the BSDF through a mix with the emission"""
         # Connect emission
         if 'diffuse' in self.nodes:
             self.connect_nodes('diffuse', 'Color', 'emission', 'Color')
-        else:
-            # Use BSDF base color as fallback
-            emission_node = self.nodes['emission']
-            emission_node.inputs["Color"].default_value = self.nodes['bsdf'].inputs["Base Color"].default_value
 
         # Connect through mix shader
         self.connect_nodes('bsdf', 'BSDF', 'mix_shader', 'Shader')
         self.connect_nodes('emission', 'Emission', 'mix_shader', 'Shader_001')
         self.connect_nodes('mix_shader', 'Shader', 'output', 'Surface')
 
+    def _patch_nodes(self):
+        """Set the images, BSDF values and emission settings"""
+        super()._patch_nodes()
+        emission = self.nodes['emission']
+        emission.inputs["Strength"].default_value = self.emission_strength
+        self.nodes['mix_shader'].inputs["Fac"].default_value = self.emission_factor
+        if 'diffuse' not in self.images:
+            # Use BSDF base color as fallback
+            emission.inputs["Color"].default_value = self.nodes['bsdf'].inputs["Base Color"].default_value
+
 class ErrorMaterial(BaseMaterial):
     """Bright error material for debugging"""
 
-    def __init__(self, name: str = "ERROR_MATERIAL"):
+    def __init__(self, name: str = "ERROR_MATERIAL", textures: Dict[str, str] = None,
+                 inherit_from: Optional[bpy.types.Material] = None):
+        # Textures and inherited values don't apply; accepted so the factory can use it as a template
         super().__init__(name)
 
     def _build_nodes(self):
         """Build error material nodes"""
         checker = self.add_node('checker', "ShaderNodeTexChecker", (-200, 0))
-        checker.inputs['Scale'].default_value = 15.0
+        checker.inputs['Scale'].default_value = 15.0  # Fixed, so part of the prototype
 
         emission = self.add_node('emission', "ShaderNodeEmission", (0, 0))
         emission.inputs["Strength"].default_value = 5.0
@@ -1,8 +1,44 @@
+import hashlib
+import os
 import bpy
-from typing import Dict, Optional, List
-from .base_material import StandardPBRMaterial, EmissiveMaterial, ErrorMaterial
+from typing import Any, Dict, Optional, List
+from .base_material import StandardPBRMaterial, EmissiveMaterial, ErrorMaterial, clear_prototypes, is_material_alive
 # Removed logger import to avoid conflicts
-from ...utils.file_detection import TextureDetector
+from ...utils.file_detection import TextureDetector, TextureInfo
+
+# Custom property marking batch-cached materials; shared with cached images, which scene clears keep too
+CACHED_PROPERTY = '_synty_cached'
+
+def _inherited_values(material: Optional[bpy.types.Material]) -> Optional[tuple]:
+    """The BSDF values a template inherits from a material (None when nothing is inherited)"""
+    if not material or not material.use_nodes or not material.node_tree:
+        return None
+    for node in material.node_tree.nodes:
+        if node.type == "BSDF_PRINCIPLED":
+            try:
+                return (tuple(round(value, 4) for value in node.inputs["Base Color"].default_value),
+                        round(node.inputs["Roughness"].default_value, 4),
+                        round(node.inputs["Metallic"].default_value, 4),
+                        round(node.inputs["Alpha"].default_value, 4))
+            except (KeyError, TypeError):
+                return ('unreadable', material.name)
+    return ()
+
+def material_signature(template_name: str, kwargs: Dict[str, Any]) -> str:
+    """Key of the material a template builds from these arguments (the name aside)"""
+    parts = [template_name]
+    for key, value in sorted(kwargs.items()):
+        if key == 'name':
+            continue
+        if key == 'textures':
+            value = sorted((texture_type, os.path.normcase(os.path.normpath(path)))
+                           for texture_type, path in value.items())
+        elif key == 'inherit_from':
+            value = _inherited_values(value)
+        elif isinstance(value, float):
+            value = round(value, 6)
+        parts.append(f"{key}={value!r}")
+    return hashlib.sha1("|".join(parts).encode('utf-8')).hexdigest()
 
 class MaterialTemplate:
     """Template for creating materials with specific settings"""
@@ -27,25 +63,29 @@ class MaterialFactory:
 
     def __init__(self):
         self.material_counter = 1
+        # Signature -> material built once per batch. Cached materials keep a fake user and
+        # stay out of the scene, so scene clears and per-asset texture stages never touch them.
+        self.material_cache: Dict[str, bpy.types.Material] = {}
+        # Signature -> copy of the cached material shared by the objects of the current file
+        self.file_materials: Dict[str, bpy.types.Material] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def create_material(self, template_name: str, obj: bpy.types.Object,
                        textures: Dict[str, str] = None,
                        inherit_from: Optional[bpy.types.Material] = None,
                        settings: Dict = None) -> Optional[bpy.types.Material]:
-        """Create a material using the specified template"""
+        """Material from the specified template, shared by objects whose material signature matches"""
 
         if template_name not in self.TEMPLATES:
             print(f"[ERROR] Unknown material template: {template_name}")
             template_name = 'error'
 
         template = self.TEMPLATES[template_name]
-        material_name = f"{obj.name}_{template.name}_{self.material_counter:03d}"
-        self.material_counter += 1
 
         try:
             # Prepare constructor arguments
             kwargs = {
-                'name': material_name,
                 'textures': textures or {},
                 'inherit_from': inherit_from
             }
@@ -58,13 +98,22 @@ class MaterialFactory:
             if settings:
                 kwargs.update(settings)
 
+            # Objects with the same look share one material
+            signature = material_signature(template_name, kwargs)
+            material = self._file_material(signature, obj, template)
+            if material:
+                self.cache_hits += 1
+                return material
+
             # Create material using the template
+            kwargs['name'] = f"{template.name} [{signature[:8]}]"
             material_builder = template.material_class(**kwargs)
             material = material_builder.create_material()
 
             if material:
+                self._cache_material(signature, material)
                 print(f"[INFO] Created {template.name} material for {obj.name}")
-                return material
+                return self._file_material(signature, obj, template)
             else:
                 print(f"[ERROR] Failed to create material for {obj.name}")
                 return self._create_fallback_material(obj.name)
@@ -77,11 +126,20 @@ class MaterialFactory:
                                   template_name: str = 'standard',
                                   force_texture: bool = False,
                                   inherit_from: Optional[bpy.types.Material] = None,
-                                  settings: Dict = None) -> Optional[bpy.types.Material]:
-        """Create material automatically detecting textures from folder"""
+                                  settings: Dict = None,
+                                  detected_textures: Optional[Dict[str, List[TextureInfo]]] = None,
+                                  texture_overrides: Optional[Dict[str, str]] = None) -> Optional[bpy.types.Material]:
+        """
+        Create material automatically detecting textures from folder.
+
+        Pass detected_textures (e.g. from the pre-flight plan) to skip
+        re-scanning the folder for every object. texture_overrides replaces
+        detected textures by type (e.g. a folder atlas as 'diffuse').
+        """
 
         # Detect textures in folder
-        detected_textures = TextureDetector.detect_textures_in_folder(folder_path)
+        if detected_textures is None:
+            detected_textures = TextureDetector.detect_textures_in_folder(folder_path)
 
         # Build texture map
         texture_map = {}
@@ -97,19 +155,15 @@ class MaterialFactory:
             texture_map['normal'] = best_normal.path
 
         # Get other texture types
-        for tex_type in ['roughness', 'metallic', 'emission']:
-            best_tex = TextureDetector.get_best_texture(detected_textures[tex_type])
+        for tex_type in ['roughness', 'metallic', 'emission', 'occlusion']:
+            best_tex = TextureDetector.get_best_texture(detected_textures.get(tex_type, []))
             if best_tex:
                 texture_map[tex_type] = best_tex.path
 
-        # Check if we should apply textures
-        should_apply_textures = (
-            force_texture or
-            not inherit_from or
-            self._has_image_textures(inherit_from)
-        )
+        if texture_overrides:
+            texture_map.update(texture_overrides)
 
-        if not should_apply_textures:
+        if not self.should_apply_textures(force_texture, inherit_from):
             texture_map = {}
 
         print(f"[DEBUG] Detected textures for {obj.name}: {list(texture_map.keys())}")
@@ -122,6 +176,55 @@ class MaterialFactory:
             settings=settings
         )
 
+    def should_apply_textures(self, force_texture: bool,
+                              inherit_from: Optional[bpy.types.Material]) -> bool:
+        """Folder textures apply unless inheriting from a material that had none (and not forced)"""
+        return force_texture or not inherit_from or self._has_image_textures(inherit_from)
+
+    def _file_material(self, signature: str, obj: bpy.types.Object,
+                       template: MaterialTemplate) -> Optional[bpy.types.Material]:
+        """The current file's material for a signature, copied from the batch cache on first use"""
+        material = self.file_materials.get(signature)
+        if is_material_alive(material):
+            return material
+
+        cached = self.material_cache.get(signature)
+        if not is_material_alive(cached):
+            self.material_cache.pop(signature, None)
+            return None
+        # Texture stages rewrite a file's materials per asset, so each file gets its own copy
+        material = cached.copy()
+        del material[CACHED_PROPERTY]
+        material.use_fake_user = False
+        material.name = f"{obj.name}_{template.name}_{self.material_counter:03d}"
+        self.material_counter += 1
+        self.file_materials[signature] = material
+        return material
+
+    def _cache_material(self, signature: str, material: bpy.types.Material):
+        """Keep a freshly built material for the rest of the batch"""
+        material.use_fake_user = True
+        material[CACHED_PROPERTY] = True
+        self.material_cache[signature] = material
+        self.cache_misses += 1
+
+    def begin_file(self):
+        """Start sharing materials for a new file (the previous file's materials are gone with its scene)"""
+        self.file_materials = {}
+
+    def clear_cache(self):
+        """Remove the batch's cached materials and template prototypes"""
+        for material in self.material_cache.values():
+            if is_material_alive(material):
+                bpy.data.materials.remove(material)
+        clear_prototypes()
+        if self.material_cache:
+            print(f"[INFO] Material cache: built {self.cache_misses} materials, reused {self.cache_hits} times")
+        self.material_cache = {}
+        self.file_materials = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def _has_image_textures(self, material: bpy.types.Material) -> bool:
         """Check if material has image texture nodes"""
         if not material or not material.use_nodes:
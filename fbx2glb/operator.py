@@ -1,6 +1,12 @@
 import bpy
 import os
+import time
 from bpy.types import Operator
+from .importers.fbx import resolve_binary_fbx
+from .importers.profiles import PROFILES, select_import_profile
+from ..utils.memory import get_memory_usage
+from ..utils.timing_history import timing_history
+from ..utils.discovery import discover_folders
 
 
 def simple_clear_scene():
@@ -151,24 +157,16 @@ class SSTOOL_OT_FBX2GLBOperator(Operator):
 
 			print(f"[INFO] Input folder: {input_folder}")
 
-			# Get folders to process
-			folders_to_process = []
-			if props.search_subfolders:
-				# Simple subfolder search
-				for root, dirs, files in os.walk(input_folder):
-					if any(f.lower().endswith('.fbx') for f in files):
-						folders_to_process.append(root)
-			else:
-				folders_to_process.append(input_folder)
-
-			print(f"[INFO] Processing {len(folders_to_process)} folders")
+			# Folders are discovered lazily: each one is processed as soon as
+			# it has been scanned while the walk continues in the background
+			discovery = discover_folders(input_folder, ".fbx", recursive=props.search_subfolders)
 
 			total_processed = 0
 			total_failed = 0
 
 			# Process each folder
-			for folder in folders_to_process:
-				print(f"[INFO] Processing folder: {folder}")
+			for folder, discovered_files in discovery:
+				print(f"[INFO] Processing folder: {folder} ({discovery.progress(total_processed + total_failed)} files)")
 
 				# Auto-detect texture (no normal maps)
 				texture_file = ""
@@ -199,20 +197,8 @@ class SSTOOL_OT_FBX2GLBOperator(Operator):
 					output_folder = os.path.join(folder, "output")
 					os.makedirs(output_folder, exist_ok=True)
 
-				# Get FBX files
-				fbx_files = []
-				try:
-					for filename in os.listdir(folder):
-						if filename.lower().endswith('.fbx'):
-							fbx_files.append(os.path.join(folder, filename))
-				except Exception as e:
-					print(f"[ERROR] Cannot list files in {folder}: {e}")
-					continue
-
-				if not fbx_files:
-					print(f"[WARNING] No FBX files found in {folder}")
-					continue
-
+				# FBX files of this folder, as found by the discovery walk
+				fbx_files = [discovered.path for discovered in discovered_files]
 				print(f"[INFO] Found {len(fbx_files)} FBX files")
 
 				# Process each FBX file
@@ -220,13 +206,18 @@ class SSTOOL_OT_FBX2GLBOperator(Operator):
 					try:
 						filename = os.path.basename(fbx_file)
 						print(f"[INFO] Processing: {filename}")
+						start_time = time.perf_counter()
+						start_memory = get_memory_usage()
 
 						# Clear scene
 						simple_clear_scene()
 
-						# Import FBX
-						print(f"[INFO] Importing FBX: {filename}")
-						bpy.ops.import_scene.fbx(filepath=fbx_file)
+						# Import FBX (ASCII files are converted to binary first)
+						import_path = resolve_binary_fbx(fbx_file)
+						profile = select_import_profile(import_path) if props.adaptive_import else PROFILES['DEFAULT']
+						print(f"[INFO] Importing FBX: {filename} ({profile.name} profile)")
+						context.scene['import_profile'] = profile.name
+						bpy.ops.import_scene.fbx(filepath=import_path, **profile.options)
 
 						# Normalize object scales if enabled
 						if props.reset_object_scale:
@@ -269,6 +260,13 @@ class SSTOOL_OT_FBX2GLBOperator(Operator):
 						if os.path.exists(export_path):
 							total_processed += 1
 							print(f"[INFO] Successfully exported: {filename}")
+
+							# Remember timing and memory use for batch estimates
+							end_memory = get_memory_usage()
+							memory_bytes = None
+							if start_memory is not None and end_memory is not None:
+								memory_bytes = max(0, end_memory - start_memory)
+							timing_history.record(profile.name, os.path.getsize(fbx_file), time.perf_counter() - start_time, memory_bytes)
 						else:
 							total_failed += 1
 							print(f"[ERROR] Export failed: {filename}")
@@ -280,8 +278,13 @@ class SSTOOL_OT_FBX2GLBOperator(Operator):
 						traceback.print_exc()
 						continue
 
+			if discovery.discovered == 0:
+				self.report({'WARNING'}, "No FBX files found to process")
+				return {'CANCELLED'}
+
 			# Final cleanup
 			simple_clear_scene()
+			timing_history.save()
 
 			# Report results
 			if total_processed > 0:
@@ -1,13 +1,64 @@
 import bpy
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 from bpy.types import Operator
-from ..utils.file_detection import FileValidator, TextureDetector
+from ..utils.file_detection import (
+    FileValidator, TextureDetector, TEXTURE_EXTENSIONS,
+    read_fbx_header, is_binary_fbx_header, is_ascii_fbx_header, get_fbx_version
+)
+from ..utils.fbx_reader import FBXReadError, read_fbx_metadata
+from ..utils.image_probe import ImageHeader, probe_image
 from ..utils.logging import logger
+from ..utils.timing_history import timing_history
+from ..utils.tree_index import TreeIndex, IndexedFile
+from .importers.profiles import profile_for_metadata
+
+def _format_bytes(size: int) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+def probe_index_entry(entry: IndexedFile) -> Dict:
+    """Header-level probe of an indexed file; the result is cached in the tree index"""
+    if entry.extension != '.fbx':
+        header = probe_image(entry.path)
+        if header is None:
+            return {'format': None}
+        return {'format': header.file_format, 'width': header.width, 'height': header.height,
+                'channels': header.channels, 'bit_depth': header.bit_depth, 'has_alpha': header.has_alpha}
+
+    try:
+        header = read_fbx_header(entry.path) if entry.size else b''
+    except OSError as e:
+        return {'status': 'INVALID', 'message': str(e), 'category': 'DEFAULT'}
+
+    is_valid, message = FileValidator.validate_fbx_file(entry.path, header)
+    if not is_valid:
+        return {'status': 'INVALID', 'message': message, 'category': 'DEFAULT'}
+    if is_ascii_fbx_header(header) and not is_binary_fbx_header(header):
+        return {'status': 'ASCII', 'version': get_fbx_version(header), 'category': 'DEFAULT'}
+
+    # Category comes from the object records only; no geometry is decoded
+    try:
+        metadata = read_fbx_metadata(entry.path, count_polygons=False)
+        category = profile_for_metadata(metadata).name
+    except (FBXReadError, OSError):
+        category = 'DEFAULT'
+    return {'status': 'READY', 'version': get_fbx_version(header), 'category': category}
 
 class SSTOOL_OT_PreviewBatchOperator(Operator):
     bl_idname = "sstool.preview_batch"
     bl_label = "Preview Batch"
-    bl_description = "Preview what files will be processed before starting"
+    bl_description = "Preview what files will be processed, with time and memory estimates, before starting"
     bl_options = {'REGISTER'}
 
     def execute(self, context):
@@ -15,96 +66,131 @@ class SSTOOL_OT_PreviewBatchOperator(Operator):
         try:
             props = context.scene.fbx2glb_props
 
-            if not props.fbx_folder:
+            if not props.fbx_folder or not os.path.isdir(props.fbx_folder):
                 self.report({'ERROR'}, "No input folder specified")
                 return {'CANCELLED'}
 
-            # Get folders to analyze
-            folders = [props.fbx_folder]
-            if props.search_subfolders:
-                from ..utils.folder_operations import get_subfolders
-                folders = get_subfolders(props.fbx_folder, "fbx")
-
-            total_files = 0
-            valid_files = 0
-            invalid_files = 0
-            folders_with_textures = 0
+            # Stat the tree and re-probe only files that changed since the last preview
+            index = TreeIndex(props.fbx_folder, TEXTURE_EXTENSIONS | {'.fbx'})
+            folders = index.refresh(recursive=props.search_subfolders)
+            with ThreadPoolExecutor(max_workers=max(1, props.preflight_workers),
+                                    thread_name_prefix="sstool_preview") as pool:
+                probed = index.probe_stale(probe_index_entry, pool)
+            index.save()
+            logger.info(f"Tree index: {probed} files probed, "
+                        f"{sum(len(entries) for entries in folders.values()) - probed} reused", "PREVIEW")
 
             preview_info = []
-
-            for folder in folders:
-                if not os.path.exists(folder):
+            for folder, entries in sorted(folders.items()):
+                fbx_entries = [entry for entry in entries if entry.extension == '.fbx']
+                if not fbx_entries:
                     continue
+                preview_info.append(self._analyze_folder(folder, entries, fbx_entries))
 
-                # Analyze FBX files
-                files_with_validation = FileValidator.get_files_with_validation(folder, "fbx")
-                folder_files = len(files_with_validation)
-                folder_valid = sum(1 for _, is_valid, _ in files_with_validation if is_valid)
-                folder_invalid = folder_files - folder_valid
-
-                # Analyze textures
-                textures = TextureDetector.detect_textures_in_folder(folder)
-                has_diffuse = len(textures['diffuse']) > 0
-                has_normal = len(textures['normal']) > 0
-
-                if has_diffuse or has_normal:
-                    folders_with_textures += 1
-
-                preview_info.append({
-                    'folder': folder,
-                    'total_files': folder_files,
-                    'valid_files': folder_valid,
-                    'invalid_files': folder_invalid,
-                    'has_diffuse': has_diffuse,
-                    'has_normal': has_normal,
-                    'diffuse_count': len(textures['diffuse']),
-                    'normal_count': len(textures['normal'])
-                })
-
-                total_files += folder_files
-                valid_files += folder_valid
-                invalid_files += folder_invalid
-
-            # Generate preview report
+            total_files = sum(info['total_files'] for info in preview_info)
             if total_files == 0:
                 self.report({'WARNING'}, "No FBX files found to process")
                 return {'CANCELLED'}
 
+            valid_files = sum(info['valid_files'] for info in preview_info)
+            invalid_files = total_files - valid_files
+            total_seconds = sum(info['seconds'] for info in preview_info)
+
+            # Texture caches are per folder unless they are kept between folders,
+            # in which case they are bounded by the cache budget
+            if props.clear_cache_between_folders:
+                peak_memory = max(info['peak_memory'] for info in preview_info)
+            else:
+                cache_budget = props.texture_cache_budget_mb * 1024 * 1024
+                peak_memory = (max(info['file_memory'] for info in preview_info) +
+                               max(max(info['texture_memory'] for info in preview_info),
+                                   min(cache_budget, sum(info['texture_memory'] for info in preview_info))))
+
             # Show preview in console
             logger.info("=== BATCH PROCESSING PREVIEW ===")
-            logger.info(f"Total folders: {len(folders)}")
+            logger.info(f"Total folders: {len(preview_info)}")
             logger.info(f"Total FBX files: {total_files}")
-            logger.info(f"Valid files: {valid_files}")
+            logger.info(f"Valid files: {valid_files} ({sum(info['ascii_files'] for info in preview_info)} ASCII, converted on import)")
             logger.info(f"Invalid files: {invalid_files}")
-            logger.info(f"Folders with textures: {folders_with_textures}")
+            logger.info(f"Folders with textures: {sum(1 for info in preview_info if info['diffuse_count'] or info['normal_count'])}")
+            logger.info(f"Estimated time: {_format_seconds(total_seconds)}, peak memory: {_format_bytes(peak_memory)} "
+                        f"(from {timing_history.sample_count()} previous samples)")
 
             for info in preview_info:
-                folder_name = os.path.basename(info['folder'])
-                texture_info = ""
-                if info['has_diffuse']:
-                    texture_info += f"{info['diffuse_count']} diffuse"
-                if info['has_normal']:
-                    if texture_info:
-                        texture_info += f", {info['normal_count']} normal"
-                    else:
-                        texture_info += f"{info['normal_count']} normal"
-
-                logger.info(f"  {folder_name}: {info['valid_files']}/{info['total_files']} files" +
-                           (f", textures: {texture_info}" if texture_info else ", no textures"))
+                folder_name = os.path.relpath(info['folder'], props.fbx_folder)
+                texture_info = []
+                if info['diffuse_count']:
+                    texture_info.append(f"{info['diffuse_count']} diffuse")
+                if info['normal_count']:
+                    texture_info.append(f"{info['normal_count']} normal")
+                categories = ", ".join(f"{count} {name.lower()}" for name, count in sorted(info['categories'].items()))
+
+                logger.info(f"  {folder_name}: {info['valid_files']}/{info['total_files']} files ({categories})" +
+                            (f", textures: {', '.join(texture_info)}" if texture_info else ", no textures") +
+                            f", ~{_format_seconds(info['seconds'])}, peak ~{_format_bytes(info['peak_memory'])}")
 
             logger.info("=== END PREVIEW ===")
 
             # Report summary to user
+            estimate = f"est. {_format_seconds(total_seconds)}, peak {_format_bytes(peak_memory)}"
             if invalid_files > 0:
                 self.report({'WARNING'},
-                           f"Preview: {valid_files} valid files, {invalid_files} invalid files. Check console for details.")
+                           f"Preview: {valid_files} valid files, {invalid_files} invalid files, {estimate}. Check console for details.")
             else:
                 self.report({'INFO'},
-                           f"Preview: {valid_files} files ready to process in {len(folders)} folders")
+                           f"Preview: {valid_files} files ready to process in {len(preview_info)} folders, {estimate}")
 
             return {'FINISHED'}
 
         except Exception as e:
             logger.error(f"Preview failed: {e}")
             self.report({'ERROR'}, f"Preview failed: {e}")
-            return {'CANCELLED'}
\ No newline at end of file
+            return {'CANCELLED'}
+
+    def _analyze_folder(self, folder, entries, fbx_entries) -> Dict:
+        """Summarize one folder from cached probes and estimate its cost"""
+        categories = {}
+        seconds = 0.0
+        file_memory = 0
+        valid_files = 0
+        ascii_files = 0
+        for entry in fbx_entries:
+            probe = entry.probe or {}
+            if probe.get('status') == 'INVALID':
+                continue
+            valid_files += 1
+            if probe.get('status') == 'ASCII':
+                ascii_files += 1
+            category = probe.get('category', 'DEFAULT')
+            categories[category] = categories.get(category, 0) + 1
+            seconds += timing_history.estimate_seconds(category, entry.size)
+            file_memory = max(file_memory, timing_history.estimate_memory(category, entry.size))
+
+        diffuse_count = 0
+        normal_count = 0
+        texture_memory = 0
+        for entry in entries:
+            if entry.extension == '.fbx' or not entry.probe or not entry.probe.get('format'):
+                continue
+            texture_type, _ = TextureDetector._classify_texture(os.path.basename(entry.path))
+            if texture_type == 'diffuse':
+                diffuse_count += 1
+            elif texture_type == 'normal':
+                normal_count += 1
+            probe = entry.probe
+            texture_memory += ImageHeader(probe['format'], probe['width'], probe['height'],
+                                          probe['channels'], probe['bit_depth']).estimated_bytes()
+
+        return {
+            'folder': folder,
+            'total_files': len(fbx_entries),
+            'valid_files': valid_files,
+            'ascii_files': ascii_files,
+            'categories': categories,
+            'diffuse_count': diffuse_count,
+            'normal_count': normal_count,
+            'seconds': seconds,
+            'file_memory': file_memory,
+            'texture_memory': texture_memory,
+            'peak_memory': file_memory + texture_memory,
+        }
@@ -81,6 +81,12 @@ class SSTOOL_PG_FBX2GLBProperties(PropertyGroup):
 		default=True
 	) # type: ignore
 
+	adaptive_import: BoolProperty(
+		name="Adaptive Import",
+		description="Probe each FBX file and skip importer work it doesn't need (animation baking, image search) for static and skinned meshes",
+		default=True
+	) # type: ignore
+
 	reset_object_scale: BoolProperty(
 		name="Reset object scale to 1.0",
 		description="Set all object scales directly to (1.0, 1.0, 1.0) - useful for tiny 0.01 scaled objects",
@@ -124,10 +130,40 @@ class SSTOOL_PG_FBX2GLBProperties(PropertyGroup):
 
 	clear_cache_between_folders: BoolProperty(
 		name="Clear Cache Between Folders",
-		description="Clear texture cache when moving to next folder",
+		description="Clear texture cache when moving to next folder. Not needed with a texture memory budget",
+		default=False
+	) # type: ignore
+
+	texture_cache_budget_mb: IntProperty(
+		name="Texture Cache Budget (MB)",
+		description="Estimated decoded image memory kept in the texture cache before least recently used images are evicted",
+		default=2048,
+		min=64,
+		max=65536
+	) # type: ignore
+
+	preflight_workers: IntProperty(
+		name="Pre-flight Threads",
+		description="Number of worker threads used to validate, hash and probe files before processing",
+		default=4,
+		min=1,
+		max=32
+	) # type: ignore
+
+	hash_input_files: BoolProperty(
+		name="Hash Input Files",
+		description="Compute a content hash for every FBX file during the pre-flight scan",
 		default=True
 	) # type: ignore
 
+	watch_debounce_seconds: FloatProperty(
+		name="Watch Debounce",
+		description="Seconds a file must stay unchanged before watch mode converts it",
+		default=2.0,
+		min=0.5,
+		max=60.0
+	) # type: ignore
+
 	# Emission Settings (when using emissive template)
 
 	emission_strength: FloatProperty(
@@ -194,6 +230,12 @@ class SSTOOL_PG_FBX2GLBProperties(PropertyGroup):
 		default=False
 	) # type: ignore
 
+	share_textures: BoolProperty(
+		name="Shared Texture Folder",
+		description="Write each external texture once to a content-addressed 'textures' folder and point every exported model at it",
+		default=True
+	) # type: ignore
+
 	export_format: EnumProperty(
 		name="Export Format",
 		description="Choose export format",
@@ -204,6 +246,102 @@ class SSTOOL_PG_FBX2GLBProperties(PropertyGroup):
 		default='GLB'
 	) # type: ignore
 
+	bake_vertex_colors: BoolProperty(
+		name="Vertex Colours Instead of Textures",
+		description="Bake palette atlas colours into vertex colours and export without textures. Meshes whose UVs span colour gradients keep their textures",
+		default=False
+	) # type: ignore
+
+	vertex_color_tolerance: FloatProperty(
+		name="Colour Tolerance",
+		description="Largest colour difference within a face that still counts as a flat swatch",
+		default=0.02,
+		min=0.0,
+		max=1.0
+	) # type: ignore
+
+	pack_orm_textures: BoolProperty(
+		name="Pack ORM Textures",
+		description="Pack occlusion, roughness and metallic maps into one glTF ORM texture (cached per source maps)",
+		default=False
+	) # type: ignore
+
+	optimize_normal_maps: BoolProperty(
+		name="Two-Channel Normal Maps",
+		description="Store normal maps as renormalized X/Y only (BC5/EAC friendly, smaller files); Z is rebuilt in the material",
+		default=False
+	) # type: ignore
+
+	normal_map_convention: EnumProperty(
+		name="Normal Map Convention",
+		description="Green channel convention of the source normal maps (output is always OpenGL, as glTF expects)",
+		items=[
+			('OPENGL', 'OpenGL (Y+)', 'Blender, glTF, Unity'),
+			('DIRECTX', 'DirectX (Y-)', 'Unreal, 3ds Max; the green channel is flipped'),
+		],
+		default='OPENGL'
+	) # type: ignore
+
+	compact_atlases: BoolProperty(
+		name="Compact Palette Atlases",
+		description="Crop shared palette atlases to the regions each model samples and repack them into a smaller texture (remaps UVs)",
+		default=False
+	) # type: ignore
+
+	texture_max_size: EnumProperty(
+		name="Max Texture Size",
+		description="Downscale textures larger than this before export (cached, so each texture is resized once)",
+		items=[
+			('0', 'No Limit', 'Keep source texture resolution'),
+			('4096', '4096', 'Desktop, high quality'),
+			('2048', '2048', 'Desktop'),
+			('1024', '1024', 'Mobile'),
+			('512', '512', 'Low-end mobile'),
+			('256', '256', 'Thumbnails and distant LODs'),
+		],
+		default='0'
+	) # type: ignore
+
+	texture_format: EnumProperty(
+		name="Texture Format",
+		description="Transcode textures before export. Textures are converted once per batch, in parallel",
+		items=[
+			('KEEP', 'Keep Source', 'Use textures in their original format'),
+			('JPEG', 'JPEG', 'Smallest files; textures with alpha stay in their source format'),
+			('WEBP', 'WebP', 'Small files with alpha support (needs EXT_texture_webp in the engine)'),
+		],
+		default='KEEP'
+	) # type: ignore
+
+	texture_quality: IntProperty(
+		name="Texture Quality",
+		description="Quality of transcoded JPEG/WebP textures",
+		default=90,
+		min=1,
+		max=100
+	) # type: ignore
+
+	transcode_workers: IntProperty(
+		name="Transcode Processes",
+		description="Number of background Blender processes used to transcode textures",
+		default=4,
+		min=1,
+		max=32
+	) # type: ignore
+
+	build_folder_atlas: BoolProperty(
+		name="Atlas Folder Textures",
+		description="Pack all diffuse textures of a folder into one atlas and remap UVs, so each model uses one material instead of needing a subfolder per texture",
+		default=False
+	) # type: ignore
+
+	texture_library_path: StringProperty(
+		name="Texture Library",
+		description="Folder of shared pack textures. Textures an FBX references are looked up here by name when its folder doesn't provide that texture type",
+		subtype='DIR_PATH',
+		default=""
+	) # type: ignore
+
 	use_legacy_materials: BoolProperty(
 		name="Use Legacy Material System",
 		description="Use the original material system if new system has issues",
@@ -0,0 +1,189 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from ...utils.file_detection import (
+    FileValidator, TextureDetector, TextureInfo, TEXTURE_EXTENSIONS,
+    read_fbx_header, is_binary_fbx_header, is_ascii_fbx_header, get_fbx_version
+)
+from ...utils.image_probe import ImageHeader
+from ...utils.fbx_reader import FBXMetadata, FBXReadError, read_fbx_metadata
+from ...utils.hashing import hash_file
+from ...utils.logging import logger
+from ...utils.texture_index import texture_index
+
+DEFAULT_PREFLIGHT_WORKERS = 4
+
+class PreflightStatus(Enum):
+    READY = "READY"
+    ASCII = "ASCII"
+    INVALID = "INVALID"
+
+class FilePlan:
+    """Pre-flight result for a single FBX file"""
+    def __init__(self, path: str, status: PreflightStatus, message: str = "",
+                 file_size: int = 0, fbx_version: Optional[int] = None,
+                 content_hash: Optional[str] = None, metadata: Optional[FBXMetadata] = None):
+        self.path = path
+        self.status = status
+        self.message = message
+        self.file_size = file_size
+        self.fbx_version = fbx_version
+        self.content_hash = content_hash
+        self.metadata = metadata  # Only set when the scanner reads FBX metadata
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == PreflightStatus.READY
+
+    @property
+    def is_ascii(self) -> bool:
+        return self.status == PreflightStatus.ASCII
+
+    @property
+    def is_importable(self) -> bool:
+        """Binary files import directly, ASCII files after conversion"""
+        return self.status in (PreflightStatus.READY, PreflightStatus.ASCII)
+
+class FolderPlan:
+    """Pre-flight result for a single input folder"""
+    def __init__(self, folder_path: str):
+        self.folder_path = folder_path
+        self.files: List[FilePlan] = []
+        self.texture_probes: Dict[str, ImageHeader] = {}
+        self._textures: Optional[Dict[str, List[TextureInfo]]] = None
+
+    @property
+    def ready_files(self) -> List[FilePlan]:
+        return [f for f in self.files if f.is_ready]
+
+    def get_textures(self) -> Dict[str, List[TextureInfo]]:
+        """Detected textures for this folder, validated from the pre-flight probes"""
+        if self._textures is None:
+            self._textures = TextureDetector.detect_textures_in_folder(self.folder_path, self.texture_probes)
+        return self._textures
+
+class PreflightPlan:
+    """Ready-to-run plan produced by the pre-flight scan"""
+    def __init__(self):
+        self.folders: List[FolderPlan] = []
+
+    def iter_files(self):
+        for folder_plan in self.folders:
+            yield from folder_plan.files
+
+    def get_summary(self) -> Dict[str, int]:
+        summary = {status.value.lower(): 0 for status in PreflightStatus}
+        summary['total'] = 0
+        for file_plan in self.iter_files():
+            summary[file_plan.status.value.lower()] += 1
+            summary['total'] += 1
+        return summary
+
+class PreflightScanner:
+    """
+    Runs all I/O-bound validation ahead of the Blender-bound work.
+
+    Folder listing, FBX header validation, content hashing, texture header
+    probing (through the persistent texture index) and optionally FBX metadata
+    reading run on a bounded thread pool. Each FBX header is read exactly once
+    and the result is carried in the plan, so the importer never re-reads it.
+    Nothing here touches bpy.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_PREFLIGHT_WORKERS,
+                 hash_files: bool = True, probe_textures: bool = True,
+                 read_metadata: bool = False):
+        self.max_workers = max(1, max_workers)
+        self.hash_files = hash_files
+        self.probe_textures = probe_textures
+        self.read_metadata = read_metadata
+
+    def scan(self, folders: List[str], file_filter: Optional[Set[str]] = None) -> PreflightPlan:
+        """
+        Scan the given folders and return the resulting plan.
+
+        If file_filter is given, only FBX files whose normalized path is in it
+        are planned; textures are still probed for the whole folder.
+        """
+        plan = PreflightPlan()
+        plan.folders = [FolderPlan(folder) for folder in folders]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sstool_preflight") as pool:
+            listings = list(pool.map(self._list_folder, folders))
+            if file_filter is not None:
+                listings = [([p for p in fbx_paths if os.path.normpath(p) in file_filter], texture_paths)
+                            for fbx_paths, texture_paths in listings]
+
+            fbx_jobs = []
+            texture_jobs = []
+            for folder_plan, (fbx_paths, texture_paths) in zip(plan.folders, listings):
+                for path in fbx_paths:
+                    fbx_jobs.append((folder_plan, pool.submit(self._scan_fbx, path)))
+                if self.probe_textures:
+                    for path in texture_paths:
+                        texture_jobs.append((folder_plan, path, pool.submit(texture_index.probe, path)))
+
+            # Collect in submission order so the plan keeps the folder listing order
+            for folder_plan, future in fbx_jobs:
+                folder_plan.files.append(future.result())
+
+            for folder_plan, path, future in texture_jobs:
+                probe = future.result()
+                if probe:
+                    folder_plan.texture_probes[path] = probe
+
+        summary = plan.get_summary()
+        logger.info(f"Pre-flight: {summary['ready']}/{summary['total']} files ready "
+                    f"({summary['ascii']} ASCII, {summary['invalid']} invalid)", "PREFLIGHT")
+        return plan
+
+    def _list_folder(self, folder_path: str) -> Tuple[List[str], List[str]]:
+        """List FBX and texture files in a folder"""
+        fbx_paths = []
+        texture_paths = []
+        try:
+            for filename in os.listdir(folder_path):
+                file_path = os.path.join(folder_path, filename)
+                ext = Path(filename).suffix.lower()
+                if ext == '.fbx':
+                    fbx_paths.append(file_path)
+                elif ext in TEXTURE_EXTENSIONS and os.path.isfile(file_path):
+                    texture_paths.append(file_path)
+        except Exception as e:
+            logger.error(f"Error scanning folder {folder_path}: {e}", "PREFLIGHT")
+        return fbx_paths, texture_paths
+
+    def _scan_fbx(self, file_path: str) -> FilePlan:
+        """Validate a single FBX file, reading its header only once"""
+        try:
+            file_size = os.path.getsize(file_path)
+            header = read_fbx_header(file_path) if file_size else b''
+        except OSError as e:
+            return FilePlan(file_path, PreflightStatus.INVALID, f"Could not read file: {e}")
+
+        is_valid, message = FileValidator.validate_fbx_file(file_path, header)
+        if not is_valid:
+            return FilePlan(file_path, PreflightStatus.INVALID, message, file_size)
+
+        fbx_version = get_fbx_version(header)
+        content_hash = hash_file(file_path) if self.hash_files else None
+
+        metadata = None
+        if is_binary_fbx_header(header):
+            status = PreflightStatus.READY
+            if self.read_metadata:
+                try:
+                    # Planning needs no polygon count; skip decompressing geometry arrays
+                    metadata = read_fbx_metadata(file_path, count_polygons=False)
+                except (FBXReadError, OSError) as e:
+                    logger.warning(f"Could not read metadata from {os.path.basename(file_path)}: {e}", "PREFLIGHT")
+        elif is_ascii_fbx_header(header):
+            status = PreflightStatus.ASCII
+            message = "ASCII FBX, will be converted to binary before import"
+        else:
+            status = PreflightStatus.INVALID
+            message = "Unrecognized FBX header"
+
+        return FilePlan(file_path, status, message, file_size, fbx_version, content_hash, metadata)
@@ -1,11 +1,14 @@
 import os
+import time
 import bpy
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Set
 from ...utils.logging import BatchProcessor, ProcessingResult
-from ...utils.file_detection import FileValidator, TextureDetector
+from ...utils.file_detection import TextureDetector, TextureInfo
 from ...utils.texture_cache import texture_cache
+from ...utils.texture_library import get_texture_library, referenced_texture_names
 from ...utils.blender import clear_scene, force_clear_scene
-from ...utils.memory import purge_unused_data
+from ...utils.memory import purge_unused_data, get_memory_usage
+from ...utils.timing_history import timing_history
 from ...utils.folder_operations import create_output_folder, get_subfolders
 from ..materials.material_factory import material_factory
 from ..importers.fbx import import_fbx
@@ -13,6 +16,10 @@ from ..exporters.glb import export_as_glb
 from ..utils.corrections import rotate_armatures, normalize_object_group_scale
 from ..utils.clean_up import remove_import_clutter
 from ...simplifymat.operator import merge_duplicate_materials
+from ..textures.stages import build_texture_pipeline
+from ..textures.atlas_builder import FolderAtlas, build_folder_atlas, has_non_diffuse_textures
+from ..textures.transcode import transcode_textures
+from .preflight import PreflightScanner, PreflightPlan, FolderPlan, FilePlan, DEFAULT_PREFLIGHT_WORKERS
 
 class ProcessingSettings:
     """Configuration for FBX to GLB processing"""
@@ -52,6 +59,7 @@ class ProcessingSettings:
         self.character_rotate_fix = props.character_rotate_fix if props else False
         self.auto_normalize_scale = props.auto_normalize_scale if props else True
         self.remove_clutter = props.remove_clutter if props else True
+        self.adaptive_import = getattr(props, 'adaptive_import', True)
 
         # Error handling
         self.continue_on_error = getattr(props, 'continue_on_error', True)
@@ -59,13 +67,29 @@ class ProcessingSettings:
         self.max_retries = getattr(props, 'max_retries', 1)
 
         # Performance
-        self.clear_cache_between_folders = getattr(props, 'clear_cache_between_folders', True)
+        self.clear_cache_between_folders = getattr(props, 'clear_cache_between_folders', False)
+        self.texture_cache_budget_mb = getattr(props, 'texture_cache_budget_mb', 2048)
         self.thorough_scene_clear = getattr(props, 'thorough_scene_clear', True)
+        self.preflight_workers = getattr(props, 'preflight_workers', DEFAULT_PREFLIGHT_WORKERS)
+        self.hash_input_files = getattr(props, 'hash_input_files', True)
 
         # Export settings
         self.embed_textures = getattr(props, 'embed_textures', False)
         self.export_format = getattr(props, 'export_format', 'GLB')
+        self.share_textures = getattr(props, 'share_textures', True)
+        self.bake_vertex_colors = getattr(props, 'bake_vertex_colors', False)
+        self.vertex_color_tolerance = getattr(props, 'vertex_color_tolerance', 0.02)
+        self.pack_orm_textures = getattr(props, 'pack_orm_textures', False)
+        self.optimize_normal_maps = getattr(props, 'optimize_normal_maps', False)
+        self.normal_map_convention = getattr(props, 'normal_map_convention', 'OPENGL')
+        self.compact_atlases = getattr(props, 'compact_atlases', False)
+        self.texture_max_size = int(getattr(props, 'texture_max_size', '0'))
+        self.texture_format = getattr(props, 'texture_format', 'KEEP')
+        self.texture_quality = getattr(props, 'texture_quality', 90)
+        self.transcode_workers = getattr(props, 'transcode_workers', 4)
         self.use_legacy_materials = getattr(props, 'use_legacy_materials', False)
+        self.build_folder_atlas = getattr(props, 'build_folder_atlas', False)
+        self.texture_library_path = getattr(props, 'texture_library_path', '')
 
 class FBXProcessingService:
     """Service for processing FBX files to GLB with enhanced error handling and performance"""
@@ -74,9 +98,14 @@ class FBXProcessingService:
         self.settings = settings
         self.progress_callback = progress_callback
         self.batch_processor = BatchProcessor(continue_on_error=settings.continue_on_error)
+        self.texture_pipeline = build_texture_pipeline(settings)
+        self.folder_atlas: Optional[FolderAtlas] = None
+        self.texture_library = get_texture_library(settings.texture_library_path)
+        self._file_texture_names: List[str] = []
 
-        # Reset material counter for consistent naming
+        # Reset material counter for consistent naming; cached materials last one batch
         material_factory.reset_counter()
+        material_factory.clear_cache()
 
         print("[INFO] FBX Processing Service initialized")
 
@@ -95,36 +124,72 @@ class FBXProcessingService:
             total_folders = len(folders_to_process)
             print(f"[INFO] Processing {total_folders} folders")
 
-            # Process each folder
-            for i, folder_path in enumerate(folders_to_process):
-                if self.progress_callback:
-                    self.progress_callback(i / total_folders, f"Processing folder {i+1}/{total_folders}")
+            # Validate, hash and probe everything up front, off the main thread
+            plan = self._run_preflight(folders_to_process)
+            return self._process_plan(plan)
 
-                self._process_folder(folder_path)
-
-                # Clear cache between folders if requested
-                if self.settings.clear_cache_between_folders:
-                    texture_cache.clear_cache()
+        except Exception as e:
+            print(f"[ERROR] Batch processing failed: {e}")
+            result = ProcessingResult(False, f"Batch processing error: {e}")
+            self.batch_processor.add_result(result)
+            return self.batch_processor.get_summary()
 
-            # Final cleanup
-            if self.settings.thorough_scene_clear:
-                clear_scene()
-            else:
-                from ...utils.blender import clear_scene_legacy
-                clear_scene_legacy()
-            purge_unused_data()
+    def process_files(self, file_paths: List[str]) -> Dict:
+        """
+        Process only the given FBX files (e.g. files reported by the folder watcher).
 
-            summary = self.batch_processor.get_summary()
-            print(f"[INFO] Batch processing complete: {summary['successful']}/{summary['total_processed']} successful")
+        Files are grouped by folder and go through the same pre-flight scan
+        and per-folder processing as a full batch, without rescanning the
+        rest of the input tree.
+        """
+        print(f"[INFO] Processing {len(file_paths)} changed files")
 
-            return summary
+        try:
+            file_filter = {os.path.normpath(path) for path in file_paths}
+            folders = sorted({os.path.dirname(path) for path in file_filter})
+            plan = self._run_preflight(folders, file_filter)
+            return self._process_plan(plan)
 
         except Exception as e:
-            print(f"[ERROR] Batch processing failed: {e}")
-            result = ProcessingResult(False, f"Batch processing error: {e}")
+            print(f"[ERROR] Processing changed files failed: {e}")
+            result = ProcessingResult(False, f"Processing error: {e}")
             self.batch_processor.add_result(result)
             return self.batch_processor.get_summary()
 
+    def _process_plan(self, plan: PreflightPlan) -> Dict:
+        """Process every folder of a pre-flight plan and return the summary"""
+        total_folders = len(plan.folders)
+        texture_cache.set_budget(self.settings.texture_cache_budget_mb * 1024 * 1024)
+
+        if self.settings.texture_format != 'KEEP':
+            self._transcode_batch_textures(plan)
+
+        # Process each folder
+        for i, folder_plan in enumerate(plan.folders):
+            if self.progress_callback:
+                self.progress_callback(i / total_folders, f"Processing folder {i+1}/{total_folders}")
+
+            self._process_folder(folder_plan)
+
+            # Clear cache between folders if requested
+            if self.settings.clear_cache_between_folders:
+                texture_cache.clear_cache()
+
+        # Final cleanup
+        material_factory.clear_cache()
+        if self.settings.thorough_scene_clear:
+            clear_scene()
+        else:
+            from ...utils.blender import clear_scene_legacy
+            clear_scene_legacy()
+        purge_unused_data()
+        timing_history.save()
+
+        summary = self.batch_processor.get_summary()
+        print(f"[INFO] Batch processing complete: {summary['successful']}/{summary['total_processed']} successful")
+
+        return summary
+
     def _get_folders_to_process(self) -> List[str]:
         """Get list of folders to process"""
         folders = []
@@ -142,14 +207,36 @@ class FBXProcessingService:
         print(f"[DEBUG] Found {len(folders)} folders to process")
         return folders
 
-    def _process_folder(self, folder_path: str) -> bool:
+    def _run_preflight(self, folders: List[str], file_filter: Optional[Set[str]] = None) -> PreflightPlan:
+        """Run the threaded pre-flight scan over all folders"""
+        scanner = PreflightScanner(
+            max_workers=self.settings.preflight_workers,
+            hash_files=self.settings.hash_input_files,
+            read_metadata=self.settings.adaptive_import
+        )
+        return scanner.scan(folders, file_filter)
+
+    def _transcode_batch_textures(self, plan: PreflightPlan):
+        """Transcode every unique texture of the batch up front, in parallel processes"""
+        max_size = self.settings.texture_max_size
+        paths = []
+        for folder_plan in plan.folders:
+            for path, probe in folder_plan.texture_probes.items():
+                # Oversized textures are written in the target format by the resample stage
+                if max_size and max(probe.width, probe.height) > max_size:
+                    continue
+                paths.append(path)
+        if paths:
+            transcode_textures(paths, self.settings.texture_format, self.settings.texture_quality,
+                               self.settings.transcode_workers)
+
+    def _process_folder(self, folder_plan: FolderPlan) -> bool:
         """Process all FBX files in a single folder"""
+        folder_path = folder_plan.folder_path
         print(f"[INFO] Processing folder: {folder_path}")
 
         try:
-            # Get and validate FBX files
-            files_with_validation = FileValidator.get_files_with_validation(folder_path, "fbx")
-            if not files_with_validation:
+            if not folder_plan.files:
                 print(f"[WARNING] No FBX files found in {folder_path}")
                 return True
 
@@ -159,15 +246,19 @@ class FBXProcessingService:
                 print(f"[ERROR] Failed to setup output folder for {folder_path}")
                 return False
 
-            # Process each FBX file
-            for file_path, is_valid, message in files_with_validation:
-                if not is_valid:
-                    print(f"[WARNING] Skipping invalid file {file_path}: {message}")
-                    result = ProcessingResult(False, f"Invalid file: {message}")
-                    self.batch_processor.add_result(result, file_path)
+            self.folder_atlas = None
+            if self.settings.build_folder_atlas and not self.settings.use_legacy_materials:
+                self.folder_atlas = self._build_folder_atlas(folder_plan)
+
+            # Only files the pre-flight scan marked as importable reach Blender
+            for file_plan in folder_plan.files:
+                if not file_plan.is_importable:
+                    print(f"[WARNING] Skipping invalid file {file_plan.path}: {file_plan.message}")
+                    result = ProcessingResult(False, f"Invalid file: {file_plan.message}")
+                    self.batch_processor.add_result(result, file_plan.path)
                     continue
 
-                success = self._process_single_file(file_path, folder_path, output_folder)
+                success = self._process_single_file(file_plan, folder_plan, output_folder)
                 if not success and not self.settings.continue_on_error:
                     return False
 
@@ -179,13 +270,32 @@ class FBXProcessingService:
             self.batch_processor.add_result(result, folder_path)
             return False
 
-    def _process_single_file(self, file_path: str, folder_path: str, output_folder: str) -> bool:
+    def _build_folder_atlas(self, folder_plan: FolderPlan) -> Optional[FolderAtlas]:
+        """Atlas of the folder's diffuse textures (limited to those its FBX files reference, when known)"""
+        if has_non_diffuse_textures(folder_plan.get_textures()):
+            print(f"[INFO] Not atlasing {folder_plan.folder_path}: it has maps besides diffuse")
+            return None
+        referenced = set()
+        for file_plan in folder_plan.files:
+            if file_plan.metadata is not None:
+                referenced.update(file_plan.metadata.texture_files)
+        try:
+            return build_folder_atlas(folder_plan.folder_path, folder_plan.get_textures()['diffuse'], referenced)
+        except Exception as e:
+            print(f"[WARNING] Could not build texture atlas for {folder_plan.folder_path}: {e}")
+            return None
+
+    def _process_single_file(self, file_plan: FilePlan, folder_plan: FolderPlan, output_folder: str) -> bool:
         """Process a single FBX file"""
+        file_path = file_plan.path
+        folder_path = folder_plan.folder_path
         filename = os.path.basename(file_path)
         print(f"[INFO] Processing file: {filename}")
 
         retries = 0
         max_retries = self.settings.max_retries if self.settings.retry_failed_imports else 0
+        start_time = time.perf_counter()
+        start_memory = get_memory_usage()
 
         while retries <= max_retries:
             try:
@@ -207,7 +317,7 @@ class FBXProcessingService:
                 # Import FBX
                 print(f"[DEBUG] Starting FBX import for {filename}")
                 try:
-                    import_success = self._import_fbx_with_retry(file_path)
+                    import_success = self._import_fbx_with_retry(file_path, file_plan)
                     if not import_success:
                         if retries < max_retries:
                             retries += 1
@@ -235,7 +345,8 @@ class FBXProcessingService:
                     if self.settings.use_legacy_materials:
                         self._process_imported_objects_legacy(folder_path)
                     else:
-                        self._process_imported_objects(folder_path)
+                        self._file_texture_names = file_plan.metadata.texture_files if file_plan.metadata else []
+                        self._process_imported_objects(folder_path, folder_plan.get_textures())
                     print(f"[DEBUG] Object processing successful for {filename}")
                 except Exception as e:
                     print(f"[ERROR] Object processing failed for {filename}: {e}")
@@ -259,13 +370,31 @@ class FBXProcessingService:
                     print(f"[WARNING] Material merging failed for {filename}: {e}")
                     # Continue anyway
 
+                # Optional texture stages (resampling, ...)
+                texture_report = {}
+                if self.texture_pipeline:
+                    try:
+                        replaced = self.texture_pipeline.run()
+                        texture_report = self.texture_pipeline.report()
+                        if replaced:
+                            print(f"[DEBUG] Texture pipeline replaced {replaced} images for {filename}")
+                        if 'atlas_compact' in texture_report:
+                            saved = texture_report['atlas_compact']['bytes_saved']
+                            print(f"[INFO] Atlas compaction saved {saved / 1024:.0f} KB for {filename}")
+                    except Exception as e:
+                        print(f"[WARNING] Texture pipeline failed for {filename}: {e}")
+
                 # Export as GLB
                 print(f"[DEBUG] Starting GLB export for {filename}")
                 try:
-                    export_path = export_as_glb(file_path, output_folder)
+                    export_path = export_as_glb(file_path, output_folder, self.settings.output_folder or None)
                     if export_path:
-                        result = ProcessingResult(True, f"Successfully exported to {export_path}")
+                        result = ProcessingResult(True, f"Successfully exported to {export_path}",
+                                                  {'content_hash': file_plan.content_hash,
+                                                   'import_profile': bpy.context.scene.get('import_profile'),
+                                                   'texture_report': texture_report})
                         self.batch_processor.add_result(result, file_path)
+                        self._record_timing(file_plan, start_time, start_memory)
                         print(f"[INFO] Successfully processed: {filename}")
                         return True
                     else:
@@ -293,17 +422,29 @@ class FBXProcessingService:
         print(f"[ERROR] Exhausted all retries for {filename}")
         return False
 
-    def _import_fbx_with_retry(self, file_path: str) -> bool:
+    def _record_timing(self, file_plan: FilePlan, start_time: float, start_memory: Optional[int]):
+        """Store how long the file took (and how much memory it added) for future estimates"""
+        end_memory = get_memory_usage()
+        memory_bytes = max(0, end_memory - start_memory) if start_memory is not None and end_memory is not None else None
+        category = bpy.context.scene.get('import_profile', 'DEFAULT')
+        timing_history.record(category, file_plan.file_size, time.perf_counter() - start_time, memory_bytes)
+
+    def _import_fbx_with_retry(self, file_path: str, file_plan: Optional[FilePlan] = None) -> bool:
         """Import FBX with error handling"""
         try:
-            import_fbx(file_path)
+            # The pre-flight scan already read the header, don't read it again.
+            # ASCII files are converted to binary before import.
+            if file_plan:
+                import_fbx(file_path, is_ascii=file_plan.is_ascii, content_hash=file_plan.content_hash,
+                           metadata=file_plan.metadata)
+            else:
+                import_fbx(file_path)
             print(f"[DEBUG] Successfully imported: {file_path}")
             return True
         except RuntimeError as e:
             error_msg = str(e)
             if "ASCII" in error_msg.upper():
-                print(f"[ERROR] ASCII FBX import failed: {file_path}")
-                # Could potentially implement ASCII FBX conversion here
+                print(f"[ERROR] ASCII FBX conversion failed: {file_path} - {e}")
                 return False
             else:
                 print(f"[ERROR] FBX import failed: {file_path} - {e}")
@@ -312,9 +453,11 @@ class FBXProcessingService:
             print(f"[ERROR] Unexpected import error for {file_path}: {e}")
             return False
 
-    def _process_imported_objects(self, folder_path: str):
+    def _process_imported_objects(self, folder_path: str,
+                                  detected_textures: Optional[Dict[str, List[TextureInfo]]] = None):
         """Process all imported objects (materials, corrections, cleanup)"""
         scene_objects = list(bpy.context.scene.objects)
+        material_factory.begin_file()
 
         for obj in scene_objects:
             try:
@@ -329,7 +472,7 @@ class FBXProcessingService:
 
                 # Apply materials to mesh objects
                 if obj.type == 'MESH':
-                    self._apply_material_to_object(obj, folder_path)
+                    self._apply_material_to_object(obj, folder_path, detected_textures)
 
             except Exception as e:
                 print(f"[ERROR] Error processing object {obj.name}: {e}")
@@ -341,7 +484,8 @@ class FBXProcessingService:
             except Exception as e:
                 print(f"[WARNING] Failed to remove import clutter: {e}")
 
-    def _apply_material_to_object(self, obj: bpy.types.Object, folder_path: str):
+    def _apply_material_to_object(self, obj: bpy.types.Object, folder_path: str,
+                                  detected_textures: Optional[Dict[str, List[TextureInfo]]] = None):
         """Apply material to a mesh object"""
         try:
             original_material = obj.active_material if obj.active_material else None
@@ -357,15 +501,40 @@ class FBXProcessingService:
                 material_settings['emission_strength'] = 1.0
                 material_settings['emission_factor'] = 0.25
 
+            # Textures the FBX references but the folder lacks come from the shared library
+            if self.texture_library is not None:
+                names = referenced_texture_names(obj) or self._file_texture_names
+                if detected_textures is None:
+                    detected_textures = TextureDetector.detect_textures_in_folder(folder_path)
+                detected_textures = self.texture_library.textures_for(names, detected_textures)
+
+            inherit_from = original_material if self.settings.inherit_material_values else None
+
+            # With a folder atlas, meshes whose UVs can be remapped sample the atlas as their diffuse;
+            # the material cache shares one material between objects that end up looking the same.
+            # Only the diffuse is atlased, so objects that get other maps keep their own UVs.
+            atlas = self.folder_atlas
+            use_atlas = (
+                atlas is not None and
+                material_factory.should_apply_textures(self.settings.force_texture, inherit_from) and
+                not (detected_textures is not None and has_non_diffuse_textures(detected_textures)) and
+                atlas.can_remap(obj)
+            )
+
             # Create material using factory
             new_material = material_factory.create_material_from_folder(
                 obj=obj,
                 folder_path=folder_path,
                 template_name=template_name,
                 force_texture=self.settings.force_texture,
-                inherit_from=original_material if self.settings.inherit_material_values else None,
-                settings=material_settings
+                inherit_from=inherit_from,
+                settings=material_settings,
+                detected_textures=detected_textures,
+                texture_overrides={'diffuse': atlas.path} if use_atlas else None
             )
+            # The UVs only move once the material really samples the atlas
+            if use_atlas and atlas.is_bound(new_material):
+                atlas.remap_object(obj)
 
             if new_material:
                 # Replace all materials with the new one
@@ -456,6 +625,11 @@ class FBXProcessingService:
         cache_stats = texture_cache.get_cache_stats()
         summary['cache_stats'] = cache_stats
 
+        # Add texture stage savings
+        summary['atlas_bytes_saved'] = sum(
+            result.data.get('texture_report', {}).get('atlas_compact', {}).get('bytes_saved', 0)
+            for result in self.batch_processor.results)
+
         # Add session duration
         summary['session_duration'] = 0  # Simplified for now
 
@@ -0,0 +1,293 @@
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from ...utils.logging import logger
+
+# Watches a folder tree for new or changed FBX files.
+#
+# Detection runs on a background thread (inotify on Linux, stat polling
+# elsewhere or when inotify is unavailable). Changes are debounced so a file
+# is only reported once it has stopped changing, then handed over through a
+# thread-safe queue. A file is also held back while it is still being
+# written: with inotify until it is closed after writing (or moved into
+# place), with polling until its size and mtime have stayed the same for
+# STABLE_POLLS polls. Nothing here touches bpy; the consumer drains the queue
+# on Blender's main thread.
+
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+DEFAULT_POLL_INTERVAL = 1.0
+WATCH_EXTENSIONS = ('.fbx',)
+STABLE_POLLS = 2
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+INOTIFY_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+INOTIFY_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+INOTIFY_READ_SIZE = 64 * 1024
+
+def _load_inotify():
+    """Return libc if it provides inotify, otherwise None"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+class FolderWatcher:
+    """Background watcher that reports debounced FBX changes under a root folder"""
+
+    def __init__(self, root_folder: str, debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, force_polling: bool = False):
+        self.root_folder = os.path.normpath(root_folder)
+        self.debounce_seconds = max(0.1, debounce_seconds)
+        self.poll_interval = max(0.1, poll_interval)
+        self.force_polling = force_polling
+        self.backend = None  # 'inotify' or 'polling' once started
+
+        self._ready: "queue.Queue[str]" = queue.Queue()
+        self._pending: Dict[str, float] = {}
+        self._held: Set[str] = set()  # Pending files still being written
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # inotify state
+        self._libc = None
+        self._inotify_fd = -1
+        self._watch_dirs: Dict[int, str] = {}
+
+        # polling state: path -> (mtime_ns, size), and unchanged polls of held files
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._stable_polls: Dict[str, int] = {}
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        if not os.path.isdir(self.root_folder):
+            raise FileNotFoundError(f"Watch folder does not exist: {self.root_folder}")
+
+        self._stop_event.clear()
+        if not self.force_polling and self._start_inotify():
+            self.backend = 'inotify'
+            target = self._run_inotify
+        else:
+            self.backend = 'polling'
+            self._snapshot = self._take_snapshot()
+            target = self._run_polling
+
+        self._thread = threading.Thread(target=target, name="sstool_watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.root_folder} ({self.backend})", "WATCH")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        if self._inotify_fd >= 0:
+            os.close(self._inotify_fd)
+            self._inotify_fd = -1
+        self._watch_dirs.clear()
+        logger.info(f"Stopped watching {self.root_folder}", "WATCH")
+
+    def pop_ready(self) -> List[str]:
+        """Return all files that have settled since the last call (main thread)"""
+        paths = []
+        while True:
+            try:
+                path = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if path not in paths:
+                paths.append(path)
+        return paths
+
+    # --- Debouncing ---
+
+    def _is_watched_file(self, path: str) -> bool:
+        return path.lower().endswith(WATCH_EXTENSIONS)
+
+    def _touch(self, path: str, hold: bool = False):
+        """Restart a file's debounce; held files aren't reported until released"""
+        with self._lock:
+            self._pending[path] = time.monotonic()
+            if hold:
+                self._held.add(path)
+            else:
+                self._held.discard(path)
+
+    def _release(self, path: str):
+        with self._lock:
+            self._held.discard(path)
+
+    def _flush_pending(self):
+        """Move files that have been quiet for the debounce period to the ready queue"""
+        now = time.monotonic()
+        with self._lock:
+            # Held files that were deleted will never be released
+            for path in [path for path in self._held if not os.path.exists(path)]:
+                self._held.discard(path)
+                self._pending.pop(path, None)
+            settled = [path for path, last_change in self._pending.items()
+                       if path not in self._held and now - last_change >= self.debounce_seconds]
+            for path in settled:
+                del self._pending[path]
+        for path in settled:
+            if os.path.isfile(path):
+                self._ready.put(path)
+
+    # --- inotify backend ---
+
+    def _start_inotify(self) -> bool:
+        self._libc = _load_inotify()
+        if self._libc is None:
+            return False
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return False
+        self._inotify_fd = fd
+        try:
+            for root, _, _ in os.walk(self.root_folder):
+                self._add_watch(root)
+        except OSError as e:
+            # Usually the per-user watch limit; polling still works
+            logger.warning(f"inotify unavailable ({e}), falling back to polling", "WATCH")
+            os.close(fd)
+            self._inotify_fd = -1
+            self._watch_dirs.clear()
+            return False
+        return True
+
+    def _add_watch(self, folder: str):
+        wd = self._libc.inotify_add_watch(self._inotify_fd, os.fsencode(folder), INOTIFY_WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), folder)
+        self._watch_dirs[wd] = folder
+
+    def _run_inotify(self):
+        timeout = min(self.poll_interval, self.debounce_seconds / 2)
+        while not self._stop_event.is_set():
+            try:
+                readable, _, _ = select.select([self._inotify_fd], [], [], timeout)
+                if readable:
+                    self._read_inotify_events(os.read(self._inotify_fd, INOTIFY_READ_SIZE))
+            except (OSError, ValueError) as e:
+                if self._stop_event.is_set():
+                    break
+                logger.error(f"inotify read failed: {e}", "WATCH")
+                time.sleep(timeout)
+            self._flush_pending()
+
+    def _read_inotify_events(self, data: bytes):
+        offset = 0
+        while offset + INOTIFY_EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_length = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b'\x00')
+            offset += name_length
+
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflowed, rescanning watch folder", "WATCH")
+                self._rescan_after_overflow()
+                continue
+            if mask & IN_IGNORED:
+                self._watch_dirs.pop(wd, None)
+                continue
+
+            folder = self._watch_dirs.get(wd)
+            if folder is None or not name:
+                continue
+            path = os.path.join(folder, os.fsdecode(name))
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_new_folder(path)
+            elif self._is_watched_file(path):
+                if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    self._touch(path)
+                elif mask & (IN_CREATE | IN_MODIFY):
+                    # Still open for writing: hold it until it's closed
+                    self._touch(path, hold=True)
+
+    def _watch_new_folder(self, folder: str):
+        """Watch a newly created folder and queue files that landed before the watch existed"""
+        try:
+            for root, _, files in os.walk(folder):
+                self._add_watch(root)
+                for filename in files:
+                    path = os.path.join(root, filename)
+                    if self._is_watched_file(path):
+                        self._touch(path)
+        except OSError as e:
+            logger.error(f"Could not watch new folder {folder}: {e}", "WATCH")
+
+    def _rescan_after_overflow(self):
+        known = set(self._watch_dirs.values())
+        for root, _, files in os.walk(self.root_folder):
+            if root not in known:
+                try:
+                    self._add_watch(root)
+                except OSError:
+                    pass
+            for filename in files:
+                path = os.path.join(root, filename)
+                if self._is_watched_file(path):
+                    self._touch(path)
+
+    # --- polling backend ---
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for root, _, files in os.walk(self.root_folder):
+            for filename in files:
+                path = os.path.join(root, filename)
+                if not self._is_watched_file(path):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _run_polling(self):
+        while not self._stop_event.wait(self.poll_interval):
+            snapshot = self._take_snapshot()
+            for path, signature in snapshot.items():
+                if self._snapshot.get(path) != signature:
+                    self._stable_polls[path] = 0
+                    self._touch(path, hold=True)
+                elif path in self._stable_polls:
+                    self._stable_polls[path] += 1
+                    if self._stable_polls[path] >= STABLE_POLLS:
+                        del self._stable_polls[path]
+                        self._release(path)
+            for path in [path for path in self._stable_polls if path not in snapshot]:
+                del self._stable_polls[path]
+            self._snapshot = snapshot
+            self._flush_pending()
@@ -0,0 +1 @@
+# Texture processing pipeline package
\ No newline at end of file
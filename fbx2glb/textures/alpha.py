@@ -0,0 +1,109 @@
+import bpy
+import numpy as np
+from typing import Dict, Optional
+from ...utils.texture_index import texture_index
+from .pipeline import image_content_hash, read_pixels
+
+# Alpha coverage analysis.
+#
+# Classifies a texture's alpha channel as OPAQUE (no transparency), CLIP
+# (binary cutout, e.g. foliage cards; a thin anti-aliased fringe is allowed)
+# or BLEND (real translucency), and sets up the material to match so only
+# genuinely translucent materials are exported as alpha-blended. Results are
+# cached per content hash in the texture index, so each texture is decoded
+# for analysis at most once.
+
+ALPHA_OPAQUE = 'OPAQUE'
+ALPHA_CLIP = 'CLIP'
+ALPHA_BLEND = 'BLEND'
+
+OPAQUE_LEVEL = 250 / 255
+TRANSPARENT_LEVEL = 5 / 255
+# Largest share of non-opaque texels that may be partially transparent for a cutout
+CLIP_PARTIAL_RATIO = 0.25
+ALPHA_CLIP_THRESHOLD = 0.5
+
+_alpha_modes: Dict[str, str] = {}
+
+def classify_alpha(alpha: np.ndarray) -> str:
+    """Classify an array of alpha values in [0, 1]"""
+    non_opaque = np.count_nonzero(alpha < OPAQUE_LEVEL)
+    if non_opaque == 0:
+        return ALPHA_OPAQUE
+    partial = non_opaque - np.count_nonzero(alpha <= TRANSPARENT_LEVEL)
+    return ALPHA_CLIP if partial <= non_opaque * CLIP_PARTIAL_RATIO else ALPHA_BLEND
+
+def get_alpha_mode(image) -> str:
+    """Alpha mode of an image, from the cache or by analysing its pixels once"""
+    content_hash = image_content_hash(image)
+    if content_hash is not None:
+        if content_hash in _alpha_modes:
+            return _alpha_modes[content_hash]
+        record = texture_index.find(content_hash)
+        if record is not None and (record.alpha_mode or record.has_alpha is False):
+            mode = record.alpha_mode or ALPHA_OPAQUE
+            _alpha_modes[content_hash] = mode
+            return mode
+
+    if image.channels not in (2, 4) or image.alpha_mode == 'NONE':
+        mode = ALPHA_OPAQUE
+    else:
+        mode = classify_alpha(read_pixels(image)[..., -1])
+
+    if content_hash is not None:
+        _alpha_modes[content_hash] = mode
+        texture_index.set_alpha_mode(content_hash, mode)
+    return mode
+
+def set_material_alpha_mode(material, mode: str):
+    """Set blend/shadow settings for an alpha mode (covers pre- and post-4.2 EEVEE settings)"""
+    blend_method = {ALPHA_OPAQUE: 'OPAQUE', ALPHA_CLIP: 'CLIP', ALPHA_BLEND: 'BLEND'}[mode]
+    try:
+        material.blend_method = blend_method
+    except TypeError:
+        material.blend_method = 'HASHED'
+    if hasattr(material, 'alpha_threshold'):
+        material.alpha_threshold = ALPHA_CLIP_THRESHOLD
+    # shadow_method was removed in Blender 4.0+
+    if hasattr(material, 'shadow_method'):
+        material.shadow_method = {ALPHA_OPAQUE: 'OPAQUE', ALPHA_CLIP: 'CLIP', ALPHA_BLEND: 'HASHED'}[mode]
+    if hasattr(material, 'surface_render_method'):
+        material.surface_render_method = 'BLENDED' if mode == ALPHA_BLEND else 'DITHERED'
+
+def apply_alpha_mode(material) -> Optional[str]:
+    """
+    Classify a material's base colour texture and set the material up to match.
+
+    The texture's alpha output is wired to the BSDF for CLIP and BLEND. From
+    Blender 4.2 the glTF exporter reads alpha clipping from the node tree
+    (a Round node means a 0.5 cutoff) rather than from blend_method.
+    """
+    if not material or not material.use_nodes or not material.node_tree:
+        return None
+    tree = material.node_tree
+    bsdf = next((node for node in tree.nodes if node.type == 'BSDF_PRINCIPLED'), None)
+    if bsdf is None:
+        return None
+
+    alpha_input = bsdf.inputs["Alpha"]
+    image_node = next((link.from_node for link in tree.links
+                       if link.to_socket == bsdf.inputs["Base Color"] and link.from_node.type == 'TEX_IMAGE'), None)
+
+    mode = ALPHA_OPAQUE
+    if image_node is not None and image_node.image is not None:
+        mode = get_alpha_mode(image_node.image)
+    if not alpha_input.is_linked and alpha_input.default_value < 1.0:
+        mode = ALPHA_BLEND  # Inherited constant translucency
+
+    if image_node is not None and mode != ALPHA_OPAQUE and not alpha_input.is_linked:
+        alpha_output = image_node.outputs["Alpha"]
+        if mode == ALPHA_CLIP and bpy.app.version >= (4, 2, 0):
+            round_node = tree.nodes.new("ShaderNodeMath")
+            round_node.operation = 'ROUND'
+            round_node.location = (image_node.location[0] + 150, image_node.location[1] - 250)
+            tree.links.new(alpha_output, round_node.inputs[0])
+            alpha_output = round_node.outputs[0]
+        tree.links.new(alpha_output, alpha_input)
+
+    set_material_alpha_mode(material, mode)
+    return mode
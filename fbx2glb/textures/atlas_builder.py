@@ -0,0 +1,218 @@
+import hashlib
+import os
+import bpy
+import numpy as np
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from ...utils.file_detection import TextureDetector, TextureInfo
+from ...utils.texture_cache import texture_cache
+from ...utils.texture_index import texture_index
+from .compaction import shelf_pack
+from .pipeline import derived_texture_path, read_pixels, write_image
+
+# Per-folder diffuse atlas.
+#
+# Folders whose assets use several diffuse textures normally get the single
+# "best" one (or have to be split into subfolders by hand). Instead, all the
+# folder's diffuse textures are packed into one atlas, and every mesh's UVs
+# are remapped per material slot into the sub-rectangle of the texture that
+# slot used, so all meshes of an asset share one material and one texture.
+# Each texture gets an edge-replicated gutter so filtering and mipmaps don't
+# bleed between neighbours. The atlas is cached by the content hashes of
+# its sources. Only the diffuse is atlased, so folders (or objects) that
+# also use normal, roughness or other maps keep their own UVs and textures:
+# those maps would otherwise be sampled with the remapped UVs.
+
+ATLAS_PADDING = 8
+MAX_ATLAS_SIZE = 8192
+UV_TOLERANCE = 1e-4
+# Mesh custom property marking UVs already remapped into an atlas
+ATLAS_PROPERTY = "_sstool_atlas"
+
+def _next_pow2(value: int) -> int:
+    return 1 << max(0, int(value) - 1).bit_length()
+
+class AtlasEntry:
+    """Where one source texture sits in the atlas (pixels, origin at the bottom left)"""
+    def __init__(self, path: str, x: int, y: int, width: int, height: int):
+        self.path = path
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def uv_transform(self, atlas_width: int, atlas_height: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(scale, offset) taking the texture's UVs into the atlas"""
+        scale = np.array([self.width / atlas_width, self.height / atlas_height], dtype=np.float32)
+        offset = np.array([self.x / atlas_width, self.y / atlas_height], dtype=np.float32)
+        return scale, offset
+
+def _image_stem(image) -> str:
+    path = image.filepath or image.name
+    return Path(bpy.path.basename(path.replace('\\', '/'))).stem.lower()
+
+class FolderAtlas:
+    """A built atlas and the UV remapping for meshes that used its source textures"""
+
+    def __init__(self, path: str, width: int, height: int, entries: Dict[str, AtlasEntry], default: str):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.entries = entries  # Lowercase file stem -> entry
+        self.default = default  # Stem of the texture used by slots without a known texture
+
+    def entry_for_material(self, material) -> AtlasEntry:
+        """Atlas entry for the diffuse texture an imported material referenced"""
+        if material is not None and material.use_nodes and material.node_tree:
+            for node in material.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image is not None:
+                    entry = self.entries.get(_image_stem(node.image))
+                    if entry is not None:
+                        return entry
+        return self.entries[self.default]
+
+    def is_bound(self, material) -> bool:
+        """True if a material samples the atlas image"""
+        if material is None or not material.use_nodes or not material.node_tree:
+            return False
+        target = os.path.normcase(os.path.abspath(self.path))
+        return any(node.type == 'TEX_IMAGE' and node.image is not None and
+                   os.path.normcase(os.path.abspath(bpy.path.abspath(node.image.filepath))) == target
+                   for node in material.node_tree.nodes)
+
+    def _render_uvs(self, mesh) -> Optional[Tuple[object, np.ndarray]]:
+        """(layer, loop UVs) of the render UV layer, or None if the mesh has none or tiles a texture"""
+        layer = next((layer for layer in mesh.uv_layers if layer.active_render), None)
+        if layer is None or not len(mesh.polygons):
+            return None
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        layer.data.foreach_get("uv", uvs)
+        if uvs.size and (uvs.min() < -UV_TOLERANCE or uvs.max() > 1 + UV_TOLERANCE):
+            return None
+        return layer, uvs.reshape(-1, 2)
+
+    def can_remap(self, obj) -> bool:
+        """True if remap_object would succeed, without touching the mesh"""
+        mesh = obj.data
+        return mesh.get(ATLAS_PROPERTY) == self.path or self._render_uvs(mesh) is not None
+
+    def remap_object(self, obj) -> bool:
+        """
+        Move a mesh's UVs into the atlas, per material slot.
+
+        Returns False (leaving the mesh untouched) if the mesh has no UVs or
+        tiles any texture, which an atlas sub-rectangle can't reproduce.
+        """
+        mesh = obj.data
+        if mesh.get(ATLAS_PROPERTY) == self.path:
+            return True  # Shared mesh, already remapped through another object
+        render_uvs = self._render_uvs(mesh)
+        if render_uvs is None:
+            return False
+        layer, uvs = render_uvs
+
+        slot_entries = [self.entry_for_material(slot.material) for slot in obj.material_slots] or \
+                       [self.entries[self.default]]
+        transforms = [entry.uv_transform(self.width, self.height) for entry in slot_entries]
+        scales = np.array([scale for scale, _ in transforms])
+        offsets = np.array([offset for _, offset in transforms])
+
+        count = len(mesh.polygons)
+        material_index = np.empty(count, dtype=np.int32)
+        loop_total = np.empty(count, dtype=np.int64)
+        loop_start = np.empty(count, dtype=np.int64)
+        mesh.polygons.foreach_get("material_index", material_index)
+        mesh.polygons.foreach_get("loop_total", loop_total)
+        mesh.polygons.foreach_get("loop_start", loop_start)
+
+        loop_slots = np.zeros(len(mesh.loops), dtype=np.int64)
+        starts = np.cumsum(loop_total) - loop_total
+        loops = np.repeat(loop_start - starts, loop_total) + np.arange(loop_total.sum())
+        loop_slots[loops] = np.repeat(np.clip(material_index, 0, len(slot_entries) - 1), loop_total)
+
+        uvs = np.clip(uvs, 0.0, 1.0) * scales[loop_slots] + offsets[loop_slots]
+        layer.data.foreach_set("uv", uvs.astype(np.float32).ravel())
+        mesh[ATLAS_PROPERTY] = self.path
+        mesh.update()
+        return True
+
+def has_non_diffuse_textures(textures: Dict[str, List[TextureInfo]]) -> bool:
+    """True if any valid texture besides diffuse is present; those keep the original UV layout"""
+    return any(texture.is_valid for texture_type, candidates in textures.items()
+               if texture_type != 'diffuse' for texture in candidates)
+
+def plan_atlas(sizes: List[Tuple[int, int]], padding: int = ATLAS_PADDING,
+               max_size: int = MAX_ATLAS_SIZE) -> Optional[Tuple[np.ndarray, Tuple[int, int]]]:
+    """Positions of padded textures in the smallest power-of-two atlas, or None if they don't fit"""
+    widths = np.array([width + 2 * padding for width, _ in sizes], dtype=np.int64)
+    heights = np.array([height + 2 * padding for _, height in sizes], dtype=np.int64)
+    best = None
+    bin_width = _next_pow2(max(widths.max(), int(np.ceil(np.sqrt((widths * heights).sum())))))
+    while bin_width <= max_size:
+        positions, used_height = shelf_pack(widths, heights, bin_width)
+        size = (bin_width, _next_pow2(used_height))
+        if size[1] <= max_size and (best is None or size[0] * size[1] < best[1][0] * best[1][1]):
+            best = (positions + padding, size)
+        bin_width *= 2
+    return best
+
+def _select_textures(diffuse: List[TextureInfo], referenced: Optional[Iterable[str]]) -> List[TextureInfo]:
+    """Valid diffuse textures, limited to those the folder's FBX files reference when that is known"""
+    valid = [texture for texture in diffuse if texture.is_valid and texture.resolution]
+    names = {Path(name).stem.lower() for name in referenced or ()}
+    used = [texture for texture in valid if Path(texture.path).stem.lower() in names]
+    textures = used if used else valid
+    return sorted(textures, key=lambda texture: os.path.basename(texture.path).lower())
+
+def build_folder_atlas(folder_path: str, diffuse: List[TextureInfo],
+                       referenced: Optional[Iterable[str]] = None) -> Optional[FolderAtlas]:
+    """Atlas of a folder's diffuse textures, or None if there is nothing to combine or it won't fit"""
+    textures = _select_textures(diffuse, referenced)
+    if len(textures) < 2:
+        return None
+    hashes = [texture_index.get_content_hash(texture.path) for texture in textures]
+    if None in hashes:
+        return None
+    layout = plan_atlas([tuple(texture.resolution) for texture in textures])
+    if layout is None:
+        print(f"[WARNING] Diffuse textures in {folder_path} don't fit a {MAX_ATLAS_SIZE}px atlas")
+        return None
+    positions, (width, height) = layout
+
+    entries = {}
+    for texture, (x, y) in zip(textures, positions):
+        entries[Path(texture.path).stem.lower()] = AtlasEntry(texture.path, int(x), int(y), *texture.resolution)
+    default = Path(TextureDetector.get_best_texture(textures).path).stem.lower()
+
+    combined = hashlib.sha256("|".join(hashes).encode('ascii')).hexdigest()
+    path = derived_texture_path(os.path.basename(os.path.normpath(folder_path)) + "_atlas", combined,
+                                f"atlas{ATLAS_PADDING}", ".png")
+    if not os.path.exists(path):
+        pixels = _compose(textures, positions, width, height)
+        if pixels is None:
+            return None
+        write_image(pixels, path, 'PNG')
+        print(f"[INFO] Built {width}x{height} atlas of {len(textures)} textures for {folder_path}")
+    return FolderAtlas(path, width, height, entries, default)
+
+def _compose(textures: List[TextureInfo], positions: np.ndarray, width: int, height: int) -> Optional[np.ndarray]:
+    sources = []
+    for texture in textures:
+        image = texture_cache.get_texture(texture.path)
+        if image is None:
+            return None
+        sources.append(read_pixels(image))
+    channels = 4 if any(pixels.shape[2] in (2, 4) for pixels in sources) else 3
+    atlas = np.zeros((height, width, channels), dtype=np.float32)
+    if channels == 4:
+        atlas[..., 3] = 1.0
+    for pixels, (x, y) in zip(sources, positions):
+        if pixels.shape[2] < 3:
+            pixels = np.concatenate([pixels[..., :1].repeat(3, axis=2), pixels[..., 1:]], axis=2)
+        if channels == 4 and pixels.shape[2] == 3:
+            pixels = np.concatenate([pixels, np.ones(pixels.shape[:2] + (1,), dtype=np.float32)], axis=2)
+        padded = np.pad(pixels[..., :channels], ((ATLAS_PADDING, ATLAS_PADDING), (ATLAS_PADDING, ATLAS_PADDING), (0, 0)),
+                        mode='edge')
+        h, w = padded.shape[:2]
+        atlas[y - ATLAS_PADDING:y - ATLAS_PADDING + h, x - ATLAS_PADDING:x - ATLAS_PADDING + w] = padded
+    return atlas
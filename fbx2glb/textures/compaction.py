@@ -0,0 +1,284 @@
+import hashlib
+import os
+import bpy
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from ...utils.texture_cache import texture_cache
+from .pipeline import ImageUsage, TextureStage, image_source_path, read_pixels, write_image
+
+# Palette atlas compaction.
+#
+# Synty props colour themselves by sampling small swatches of a large shared
+# palette atlas, yet every GLB with embedded textures carries the whole
+# image. For each atlas, the UV footprint of every polygon that samples it
+# is rasterized onto a coarse grid over the atlas, the used cells (plus a
+# gutter for filtering) are grouped into regions, and the regions are
+# repacked into a much smaller power-of-two texture. The polygons' UVs are
+# shifted to match. Footprints are polygon bounding boxes, so the result is
+# conservative: every texel a polygon can sample survives.
+#
+# Atlases are only compacted when the layout is unambiguous: UVs inside
+# [0, 1] (no tiling), materials whose only image is the atlas, image nodes
+# using the default UV map, and mesh instances that agree on which
+# material slots use it.
+
+# Footprint grid resolution along the atlas' longer side
+GRID_CELLS = 256
+MIN_CELL_SIZE = 4
+# Gutter around every footprint, in cells
+PADDING_CELLS = 1
+# Compact only when the result is at most this share of the source area
+MAX_AREA_RATIO = 0.5
+UV_TOLERANCE = 1e-4
+
+def _next_pow2(value: int) -> int:
+    return 1 << max(0, int(value) - 1).bit_length()
+
+class _UVTarget:
+    """Loops of one mesh that sample the atlas, grouped by polygon"""
+    def __init__(self, mesh, layer, loops: np.ndarray, loop_polygons: np.ndarray, polygon_starts: np.ndarray):
+        self.mesh = mesh
+        self.layer = layer
+        self.loops = loops
+        self.loop_polygons = loop_polygons
+        self.polygon_starts = polygon_starts
+        uvs = np.empty(len(layer.data) * 2, dtype=np.float32)
+        layer.data.foreach_get("uv", uvs)
+        self.all_uvs = uvs.reshape(-1, 2)
+
+    @property
+    def uvs(self) -> np.ndarray:
+        return self.all_uvs[self.loops]
+
+    def write(self, uvs: np.ndarray):
+        self.all_uvs[self.loops] = uvs
+        self.layer.data.foreach_set("uv", self.all_uvs.ravel())
+        self.mesh.update()
+
+def _atlas_materials(usage: ImageUsage) -> Optional[set]:
+    """Materials sampling the image, or None if any of them can't be compacted"""
+    trees = {material.node_tree: material for material in bpy.data.materials
+             if material.use_nodes and material.node_tree}
+    materials = set()
+    for node in usage.nodes:
+        material = trees.get(node.id_data)
+        if material is None or node.inputs["Vector"].is_linked:
+            return None
+        images = {other.image for other in material.node_tree.nodes if other.type == 'TEX_IMAGE' and other.image}
+        if len(images) > 1:
+            return None  # Other textures share the UVs
+        materials.add(material)
+    return materials
+
+def _collect_uv_targets(materials: set) -> Optional[List[_UVTarget]]:
+    """Mesh loops whose polygons use one of the materials"""
+    slots_by_mesh = {}
+    for obj in bpy.context.scene.objects:
+        if obj.type != 'MESH' or obj.data is None:
+            continue
+        flags = tuple(slot.material in materials for slot in obj.material_slots)
+        if slots_by_mesh.setdefault(obj.data, flags) != flags:
+            return None  # Instances disagree on which slots use the atlas
+
+    targets = []
+    for mesh, flags in slots_by_mesh.items():
+        if not any(flags):
+            continue
+        layer = next((layer for layer in mesh.uv_layers if layer.active_render), None)
+        if layer is None:
+            return None
+        count = len(mesh.polygons)
+        material_index = np.empty(count, dtype=np.int32)
+        loop_start = np.empty(count, dtype=np.int64)
+        loop_total = np.empty(count, dtype=np.int64)
+        mesh.polygons.foreach_get("material_index", material_index)
+        mesh.polygons.foreach_get("loop_start", loop_start)
+        mesh.polygons.foreach_get("loop_total", loop_total)
+
+        polygons = np.flatnonzero(np.array(flags)[np.clip(material_index, 0, len(flags) - 1)])
+        if not len(polygons):
+            continue
+        totals = loop_total[polygons]
+        polygon_starts = np.cumsum(totals) - totals
+        loops = np.repeat(loop_start[polygons] - polygon_starts, totals) + np.arange(totals.sum())
+        loop_polygons = np.repeat(np.arange(len(polygons)), totals)
+        targets.append(_UVTarget(mesh, layer, loops, loop_polygons, polygon_starts))
+    return targets
+
+def label_regions(mask: np.ndarray) -> np.ndarray:
+    """4-connected component labels of a boolean grid (label = smallest flat index in the component)"""
+    background = mask.size
+    labels = np.where(mask, np.arange(mask.size).reshape(mask.shape), background)
+    while True:
+        spread = labels.copy()
+        spread[1:] = np.minimum(spread[1:], labels[:-1])
+        spread[:-1] = np.minimum(spread[:-1], labels[1:])
+        spread[:, 1:] = np.minimum(spread[:, 1:], labels[:, :-1])
+        spread[:, :-1] = np.minimum(spread[:, :-1], labels[:, 1:])
+        # Pointer jumping: adopt the label of the cell our label points at
+        flat = spread.ravel()
+        spread = np.where(mask, np.minimum(spread, flat[np.minimum(spread, background - 1)]), background)
+        if np.array_equal(spread, labels):
+            return labels
+        labels = spread
+
+def shelf_pack(widths: np.ndarray, heights: np.ndarray, bin_width: int) -> Tuple[np.ndarray, int]:
+    """Shelf-pack rectangles into a bin of the given width; returns (x, y) positions and used height"""
+    positions = np.zeros((len(widths), 2), dtype=np.int64)
+    x = y = shelf_height = 0
+    for index in np.argsort(-heights, kind='stable'):
+        if x + widths[index] > bin_width:
+            y += shelf_height
+            x = shelf_height = 0
+        positions[index] = (x, y)
+        x += widths[index]
+        shelf_height = max(shelf_height, heights[index])
+    return positions, y + shelf_height
+
+class AtlasLayout:
+    """Regions of an atlas used by a set of polygon footprints and where they go in the compacted texture"""
+
+    def __init__(self, width: int, height: int, cell: int, source_rects: np.ndarray,
+                 target_origins: np.ndarray, size: Tuple[int, int], polygon_regions: np.ndarray):
+        self.width = width
+        self.height = height
+        self.cell = cell
+        self.source_rects = source_rects  # (x0, y0, x1, y1) in cells, inclusive
+        self.target_origins = target_origins  # (x, y) in cells
+        self.size = size  # Compacted texture size in texels
+        self.polygon_regions = polygon_regions
+
+    @classmethod
+    def build(cls, width: int, height: int, bounds: np.ndarray) -> Optional['AtlasLayout']:
+        """Layout for polygon UV bounds (n, 4: u0, v0, u1, v1), or None if compaction doesn't pay off"""
+        cell = max(MIN_CELL_SIZE, _next_pow2(-(-max(width, height) // GRID_CELLS)))
+        grid_w, grid_h = -(-width // cell), -(-height // cell)
+        texels = bounds * np.array([width, height, width, height], dtype=np.float64)
+        cells = np.floor(texels / cell).astype(np.int64)
+        corner_x = np.clip(cells[:, 0], 0, grid_w - 1)
+        corner_y = np.clip(cells[:, 1], 0, grid_h - 1)
+        x0 = np.clip(cells[:, 0] - PADDING_CELLS, 0, grid_w - 1)
+        y0 = np.clip(cells[:, 1] - PADDING_CELLS, 0, grid_h - 1)
+        x1 = np.clip(cells[:, 2] + PADDING_CELLS, 0, grid_w - 1)
+        y1 = np.clip(cells[:, 3] + PADDING_CELLS, 0, grid_h - 1)
+
+        # Rasterize all footprints at once with a 2D difference array
+        diff = np.zeros((grid_h + 1, grid_w + 1), dtype=np.int32)
+        np.add.at(diff, (y0, x0), 1)
+        np.add.at(diff, (y0, x1 + 1), -1)
+        np.add.at(diff, (y1 + 1, x0), -1)
+        np.add.at(diff, (y1 + 1, x1 + 1), 1)
+        mask = diff.cumsum(axis=0).cumsum(axis=1)[:grid_h, :grid_w] > 0
+
+        labels = label_regions(mask)
+        ys, xs = np.nonzero(mask)
+        region_ids, region_of_cell = np.unique(labels[ys, xs], return_inverse=True)
+        count = len(region_ids)
+        rects = np.empty((count, 4), dtype=np.int64)
+        rects[:, :2] = np.iinfo(np.int64).max
+        rects[:, 2:] = -1
+        np.minimum.at(rects[:, 0], region_of_cell, xs)
+        np.minimum.at(rects[:, 1], region_of_cell, ys)
+        np.maximum.at(rects[:, 2], region_of_cell, xs)
+        np.maximum.at(rects[:, 3], region_of_cell, ys)
+        polygon_regions = np.searchsorted(region_ids, labels[corner_y, corner_x])
+
+        widths = rects[:, 2] - rects[:, 0] + 1
+        heights = rects[:, 3] - rects[:, 1] + 1
+        best = None
+        bin_width = _next_pow2(max(widths.max(), int(np.ceil(np.sqrt((widths * heights).sum())))))
+        while bin_width <= _next_pow2(grid_w):
+            positions, used_height = shelf_pack(widths, heights, bin_width)
+            size = (bin_width * cell, _next_pow2(used_height) * cell)
+            if best is None or size[0] * size[1] < best[1][0] * best[1][1]:
+                best = (positions, size)
+            bin_width *= 2
+
+        if best is None or best[1][0] * best[1][1] > width * height * MAX_AREA_RATIO:
+            return None
+        return cls(width, height, cell, rects, best[0], best[1], polygon_regions)
+
+    @property
+    def key(self) -> str:
+        """Stable digest of the layout, for caching the compacted texture"""
+        digest = hashlib.sha1()
+        digest.update(np.array([self.width, self.height, self.cell, *self.size], dtype=np.int64).tobytes())
+        digest.update(self.source_rects.tobytes())
+        digest.update(self.target_origins.tobytes())
+        return digest.hexdigest()[:12]
+
+    def offsets(self) -> np.ndarray:
+        """Per-region texel offset (x, y) from the atlas to the compacted texture"""
+        return (self.target_origins - self.source_rects[:, :2]) * self.cell
+
+    def compact_pixels(self, pixels: np.ndarray) -> np.ndarray:
+        """Copy the used regions of (height, width, channels) atlas pixels into the compacted texture"""
+        out_w, out_h = self.size
+        out = np.zeros((out_h, out_w, pixels.shape[2]), dtype=np.float32)
+        for (x0, y0, x1, y1), (tx, ty) in zip(self.source_rects * self.cell, self.target_origins * self.cell):
+            x1 = min(x1 + self.cell, self.width)
+            y1 = min(y1 + self.cell, self.height)
+            out[ty:ty + y1 - y0, tx:tx + x1 - x0] = pixels[y0:y1, x0:x1]
+        return out
+
+    def remap_uvs(self, uvs: np.ndarray, regions: np.ndarray) -> np.ndarray:
+        """Atlas UVs of loops in the given regions -> compacted texture UVs"""
+        texels = uvs * np.array([self.width, self.height], dtype=np.float64) + self.offsets()[regions]
+        return (texels / np.array(self.size, dtype=np.float64)).astype(np.float32)
+
+class AtlasCompactStage(TextureStage):
+    """Crop shared palette atlases to the texels the current asset samples"""
+    name = "atlas_compact"
+
+    def __init__(self):
+        self.results = []
+
+    def begin_run(self):
+        self.results = []
+
+    def report(self) -> Optional[Dict]:
+        if not self.results:
+            return None
+        return {'images': self.results,
+                'bytes_saved': sum(result['source_bytes'] - result['bytes'] for result in self.results)}
+
+    def process_image(self, image, content_hash: str, usage: ImageUsage) -> Optional[str]:
+        materials = _atlas_materials(usage)
+        targets = _collect_uv_targets(materials) if materials else None
+        if not targets:
+            return None
+
+        bounds = []
+        for target in targets:
+            uvs = target.uvs
+            if uvs.min() < -UV_TOLERANCE or uvs.max() > 1 + UV_TOLERANCE:
+                return None  # Tiling UVs sample the whole atlas
+            bounds.append(np.concatenate([np.minimum.reduceat(uvs, target.polygon_starts),
+                                          np.maximum.reduceat(uvs, target.polygon_starts)], axis=1))
+        width, height = image.size
+        layout = AtlasLayout.build(width, height, np.clip(np.concatenate(bounds), 0.0, 1.0))
+        if layout is None:
+            return None
+
+        def build(path):
+            write_image(layout.compact_pixels(read_pixels(image)), path, image.file_format, image.is_float)
+
+        path = self.derive(image, content_hash, f"crop{layout.key}", build)
+        if texture_cache.get_texture(path) is None:
+            return None
+
+        first = 0
+        for target in targets:
+            count = len(target.polygon_starts)
+            regions = layout.polygon_regions[first:first + count][target.loop_polygons]
+            target.write(layout.remap_uvs(target.uvs, regions))
+            first += count
+
+        source_path = image_source_path(image)
+        source_bytes = os.path.getsize(source_path) if source_path else 0
+        compact_bytes = os.path.getsize(path)
+        self.results.append({'image': image.name, 'source_size': [width, height], 'size': list(layout.size),
+                             'source_bytes': source_bytes, 'bytes': compact_bytes})
+        print(f"[INFO] Compacted atlas {image.name} {width}x{height} -> {layout.size[0]}x{layout.size[1]} "
+              f"({(source_bytes - compact_bytes) / 1024:.0f} KB saved)")
+        return path
@@ -0,0 +1,102 @@
+import numpy as np
+from typing import Optional
+from .pipeline import (ImageUsage, NORMAL_MAP_PROPERTY, TextureStage, add_combine_color_node,
+                       add_separate_color_node, read_pixels, write_image)
+
+# Two-channel normal maps.
+#
+# Tangent-space normals are unit vectors with Z >= 0, so X and Y determine
+# Z. Normal maps are rewritten with the (renormalized, OpenGL-convention)
+# X/Y in red and green and a constant blue, which is what BC5/EAC RG
+# compression keeps, and compresses much better as PNG. The generated
+# material reconstructs Z = sqrt(1 - X^2 - Y^2) with math nodes, so the
+# model renders the same in Blender; engines using a two-channel normal
+# path do the same reconstruction.
+
+# Blue written to two-channel maps: Z = 1, so viewers that read RGB as-is see a valid (if flatter) normal
+CONSTANT_BLUE = 1.0
+
+def convert_normal_pixels(pixels: np.ndarray, flip_green: bool = False) -> np.ndarray:
+    """(height, width, channels) normal map -> (height, width, 3) two-channel normal map"""
+    vectors = pixels[..., :3] * 2.0 - 1.0
+    if flip_green:
+        vectors[..., 1] = -vectors[..., 1]  # DirectX (Y down) -> OpenGL (Y up)
+    vectors[..., 2] = np.maximum(vectors[..., 2], 0.0)
+    length = np.linalg.norm(vectors, axis=2, keepdims=True)
+    vectors = np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 1e-6)
+    vectors[length[..., 0] <= 1e-6] = (0.0, 0.0, 1.0)
+    result = np.empty(pixels.shape[:2] + (3,), dtype=np.float32)
+    result[..., :2] = vectors[..., :2] * 0.5 + 0.5
+    result[..., 2] = CONSTANT_BLUE
+    return np.clip(result, 0.0, 1.0)
+
+def _math(tree, operation: str, location, *inputs):
+    """Math node with the given inputs (sockets are linked, numbers set as defaults)"""
+    node = tree.nodes.new("ShaderNodeMath")
+    node.operation = operation
+    node.location = location
+    for index, value in enumerate(inputs):
+        if isinstance(value, (int, float)):
+            node.inputs[index].default_value = value
+        else:
+            tree.links.new(value, node.inputs[index])
+    return node.outputs[0]
+
+def add_z_reconstruction(tree, image_node, normal_map_node):
+    """Rebuild the blue channel from red/green between an image node and a Normal Map node"""
+    x, y = image_node.location
+    separate, outputs = add_separate_color_node(tree)
+    separate.location = (x + 250, y - 200)
+    tree.links.new(image_node.outputs["Color"], separate.inputs[0])
+    red, green = separate.outputs[outputs[0]], separate.outputs[outputs[1]]
+
+    # X, Y in [-1, 1]; Z = sqrt(max(0, 1 - X^2 - Y^2)) remapped to [0, 1]
+    nx = _math(tree, 'MULTIPLY_ADD', (x + 450, y - 150), red, 2.0, -1.0)
+    ny = _math(tree, 'MULTIPLY_ADD', (x + 450, y - 300), green, 2.0, -1.0)
+    xx = _math(tree, 'MULTIPLY', (x + 650, y - 150), nx, nx)
+    length_sq = _math(tree, 'MULTIPLY_ADD', (x + 650, y - 300), ny, ny, xx)
+    remainder = _math(tree, 'SUBTRACT', (x + 850, y - 200), 1.0, length_sq)
+    remainder.node.use_clamp = True
+    nz = _math(tree, 'SQRT', (x + 1050, y - 200), remainder)
+    blue = _math(tree, 'MULTIPLY_ADD', (x + 1250, y - 200), nz, 0.5, 0.5)
+
+    combine, inputs = add_combine_color_node(tree)
+    combine.location = (x + 1450, y - 100)
+    tree.links.new(red, combine.inputs[inputs[0]])
+    tree.links.new(green, combine.inputs[inputs[1]])
+    tree.links.new(blue, combine.inputs[inputs[2]])
+    tree.links.new(combine.outputs[0], normal_map_node.inputs["Color"])
+    normal_map_node.location = (x + 1650, normal_map_node.location[1])
+
+class NormalMapStage(TextureStage):
+    """Convert normal maps to renormalized two-channel OpenGL maps with Z rebuilt in the material"""
+    name = "normal_two_channel"
+
+    def __init__(self, convention: str = 'OPENGL'):
+        self.flip_green = convention == 'DIRECTX'
+
+    def process_material(self, material) -> bool:
+        tree = material.node_tree
+        changed = False
+        for link in list(tree.links):
+            if (link.to_node.type == 'NORMAL_MAP' and link.to_socket.name == 'Color' and
+                    link.from_node.type == 'TEX_IMAGE' and link.from_node.image is not None and
+                    link.from_socket.name == 'Color'):
+                image_node, normal_map_node = link.from_node, link.to_node
+                tree.links.remove(link)
+                add_z_reconstruction(tree, image_node, normal_map_node)
+                image_node.image[NORMAL_MAP_PROPERTY] = True
+                changed = True
+        return changed
+
+    def process_image(self, image, content_hash: str, usage: ImageUsage) -> Optional[str]:
+        if not usage.is_normal_map:
+            return None
+        tag = "rg_dx" if self.flip_green else "rg"
+
+        def build(path):
+            converted = convert_normal_pixels(read_pixels(image), self.flip_green)
+            write_image(converted, path, 'PNG')
+            print(f"[INFO] Converted {image.name} to a two-channel normal map")
+
+        return self.derive(image, content_hash, tag, build, '.png')
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import numpy as np
+from typing import Dict, Optional
+from ...utils.texture_cache import texture_cache
+from ..materials.base_material import GLTF_OUTPUT_GROUP_NAME
+from .pipeline import (TextureStage, add_separate_color_node, derived_texture_path, image_content_hash,
+                       read_pixels, write_image)
+from .resample import resample_area
+
+# ORM channel packing.
+#
+# glTF stores roughness and metallic in the G and B channels of one
+# metallicRoughness texture, and occlusion in R of a texture that may be the
+# same image. Separate grayscale maps are packed into a single ORM image
+# (R = occlusion, G = roughness, B = metallic), so the exported model binds
+# and samples one texture instead of up to three. Packed images are cached
+# by the combined content hashes of their sources (and the constants used
+# for missing channels).
+
+ORM_TAG = "orm"
+# Channel of the packed image per material input
+ORM_CHANNELS = {'occlusion': 0, 'roughness': 1, 'metallic': 2}
+
+def _linked_image_node(tree, socket):
+    """Image node whose Color output feeds a socket directly, if any"""
+    for link in tree.links:
+        if link.to_socket == socket and link.from_node.type == 'TEX_IMAGE' and link.from_socket.name == 'Color':
+            return link.from_node if link.from_node.image is not None else None
+    return None
+
+def _find_gltf_output(tree):
+    for node in tree.nodes:
+        if node.type == 'GROUP' and node.node_tree is not None and node.node_tree.name == GLTF_OUTPUT_GROUP_NAME:
+            return node
+    return None
+
+def pack_orm(sources: Dict[str, Optional[np.ndarray]], defaults: Dict[str, float]) -> np.ndarray:
+    """
+    Pack grayscale maps into an (height, width, 3) ORM array.
+
+    Sources are (height, width, channels) arrays; the first channel is used.
+    All are resized to the largest source, and missing channels are filled
+    with their default value.
+    """
+    present = [pixels for pixels in sources.values() if pixels is not None]
+    height = max(pixels.shape[0] for pixels in present)
+    width = max(pixels.shape[1] for pixels in present)
+    packed = np.empty((height, width, 3), dtype=np.float32)
+    for key, channel in ORM_CHANNELS.items():
+        pixels = sources.get(key)
+        if pixels is None:
+            packed[..., channel] = defaults[key]
+            continue
+        pixels = pixels[..., :1]
+        if pixels.shape[:2] != (height, width):
+            pixels = resample_area(pixels, width, height)
+        packed[..., channel] = pixels[..., 0]
+    return np.clip(packed, 0.0, 1.0)
+
+class ORMPackStage(TextureStage):
+    """Replace separate occlusion/roughness/metallic image nodes with one packed ORM image"""
+    name = "orm_pack"
+
+    def process_material(self, material) -> bool:
+        tree = material.node_tree
+        bsdf = next((node for node in tree.nodes if node.type == 'BSDF_PRINCIPLED'), None)
+        if bsdf is None:
+            return False
+
+        gltf_output = _find_gltf_output(tree)
+        sockets = {'roughness': bsdf.inputs["Roughness"], 'metallic': bsdf.inputs["Metallic"]}
+        if gltf_output is not None and "Occlusion" in gltf_output.inputs:
+            sockets['occlusion'] = gltf_output.inputs["Occlusion"]
+        nodes = {key: _linked_image_node(tree, socket) for key, socket in sockets.items()}
+        if nodes.get('roughness') is None and nodes.get('metallic') is None:
+            return False
+
+        hashes = {}
+        for key, node in nodes.items():
+            if node is None:
+                continue
+            content_hash = image_content_hash(node.image)
+            if content_hash is None:
+                return False  # Generated or packed image: leave the material as it is
+            hashes[key] = content_hash
+
+        defaults = {
+            'occlusion': 1.0,
+            'roughness': float(bsdf.inputs["Roughness"].default_value),
+            'metallic': float(bsdf.inputs["Metallic"].default_value),
+        }
+        packed_path = self._packed_path(hashes, defaults)
+        if not os.path.exists(packed_path):
+            sources = {key: read_pixels(node.image) if node is not None else None for key, node in nodes.items()}
+            write_image(pack_orm(sources, defaults), packed_path, 'PNG')
+            print(f"[INFO] Packed ORM texture for {material.name}: {', '.join(sorted(hashes))}")
+
+        image = texture_cache.get_texture(packed_path)
+        if image is None:
+            return False
+        image.colorspace_settings.name = 'Non-Color'
+        self._wire(material, bsdf, gltf_output, nodes, image)
+        return True
+
+    def _packed_path(self, hashes: Dict[str, str], defaults: Dict[str, float]) -> str:
+        key = "|".join(f"{name}={hashes[name]}" if name in hashes else f"{name}:{defaults[name]:.4f}"
+                       for name in ORM_CHANNELS)
+        combined_hash = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return derived_texture_path("ORM", combined_hash, ORM_TAG, ".png")
+
+    def _wire(self, material, bsdf, gltf_output, nodes, image):
+        tree = material.node_tree
+        existing = list({node.name: node for node in nodes.values() if node is not None}.values())
+        x = min(node.location[0] for node in existing)
+        y = max(node.location[1] for node in existing)
+
+        image_node = tree.nodes.new("ShaderNodeTexImage")
+        image_node.name = image_node.label = "ORM"
+        image_node.image = image
+        image_node.location = (x, y)
+        separate, outputs = add_separate_color_node(tree)
+        separate.location = (x + 300, y)
+        tree.links.new(image_node.outputs["Color"], separate.inputs[0])
+
+        channel_outputs = {key: separate.outputs[outputs[channel]] for key, channel in ORM_CHANNELS.items()}
+        tree.links.new(channel_outputs['roughness'], bsdf.inputs["Roughness"])
+        tree.links.new(channel_outputs['metallic'], bsdf.inputs["Metallic"])
+        if nodes.get('occlusion') is not None:
+            tree.links.new(channel_outputs['occlusion'], gltf_output.inputs["Occlusion"])
+
+        # The source nodes are now unlinked unless something else still uses them
+        for node in existing:
+            if not any(link.from_node == node for link in tree.links):
+                tree.nodes.remove(node)
@@ -0,0 +1,210 @@
+import os
+import bpy
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from ...utils.cache_paths import get_cache_dir
+from ...utils.texture_cache import texture_cache
+from ...utils.texture_index import texture_index
+
+# Texture pipeline: optional stages that rewrite the images used by the
+# current scene's materials between material setup and export.
+#
+# Each stage turns a source image into a derived image file. Derived files
+# live in the cache directory, named by the source content hash and the
+# stage's settings, so a texture shared by a whole folder (or pack) is
+# processed once and every later model just loads the cached result.
+
+DERIVED_TEXTURE_CACHE = "derived_textures"
+# Image custom property for normal maps whose material no longer feeds a Normal Map node directly
+NORMAL_MAP_PROPERTY = "_sstool_normal_map"
+
+def derived_texture_path(source_name: str, content_hash: str, tag: str, extension: str) -> str:
+    """Cache path of a derived texture: <source stem>_<hash>_<tag><extension>"""
+    return os.path.join(get_cache_dir(DERIVED_TEXTURE_CACHE),
+                        f"{Path(source_name).stem}_{content_hash[:16]}_{tag}{extension}")
+
+def image_source_path(image) -> Optional[str]:
+    """Absolute path of a file-backed, unmodified image, or None"""
+    if image is None or image.packed_file or image.source != 'FILE' or image.is_dirty or not image.filepath:
+        return None
+    return os.path.normpath(bpy.path.abspath(image.filepath))
+
+def image_content_hash(image) -> Optional[str]:
+    """Content hash of the file behind an image (from the texture index)"""
+    path = image_source_path(image)
+    return texture_index.get_content_hash(path) if path else None
+
+def read_pixels(image) -> np.ndarray:
+    """Image pixels as a float32 (height, width, channels) array, bottom row first"""
+    width, height = image.size
+    channels = image.channels
+    pixels = np.empty(width * height * channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, channels)
+
+def write_image(pixels: np.ndarray, path: str, file_format: str = 'PNG', is_float: bool = False,
+                quality: Optional[int] = None):
+    """Save a (height, width, channels) array to an image file through bpy"""
+    height, width, channels = pixels.shape
+    has_alpha = channels in (2, 4)
+    if channels != 4:
+        # Blender images are RGBA in memory
+        color = pixels[..., :1].repeat(3, axis=2) if channels <= 2 else pixels[..., :3]
+        alpha = pixels[..., -1:] if has_alpha else np.ones((height, width, 1), dtype=np.float32)
+        pixels = np.concatenate([color, alpha], axis=2)
+    image = bpy.data.images.new(f"sstool_derived_{Path(path).stem}", width, height,
+                                alpha=has_alpha, float_buffer=is_float)
+    try:
+        image.pixels.foreach_set(np.ascontiguousarray(pixels, dtype=np.float32).ravel())
+        image.file_format = file_format
+        temp_path = path + ".tmp" + os.path.splitext(path)[1]
+        image.filepath_raw = temp_path
+        if quality is not None:
+            try:
+                image.save(quality=quality)
+            except TypeError:
+                image.save()  # Blender < 3.4 has no quality argument
+        else:
+            image.save()
+        os.replace(temp_path, path)
+    finally:
+        bpy.data.images.remove(image)
+
+def add_separate_color_node(tree):
+    """Separate Color node (Separate RGB before Blender 3.3) and its R/G/B output names"""
+    if bpy.app.version >= (3, 3, 0):
+        return tree.nodes.new("ShaderNodeSeparateColor"), ("Red", "Green", "Blue")
+    return tree.nodes.new("ShaderNodeSeparateRGB"), ("R", "G", "B")
+
+def add_combine_color_node(tree):
+    """Combine Color node (Combine RGB before Blender 3.3) and its R/G/B input names"""
+    if bpy.app.version >= (3, 3, 0):
+        return tree.nodes.new("ShaderNodeCombineColor"), ("Red", "Green", "Blue")
+    return tree.nodes.new("ShaderNodeCombineRGB"), ("R", "G", "B")
+
+class ImageUsage:
+    """How the current materials use an image: (node type, input name) of every link from it"""
+    def __init__(self, normal_map_hint: bool = False):
+        self.nodes = []
+        self.targets: Set[Tuple[str, str]] = set()
+        self.normal_map_hint = normal_map_hint
+
+    @property
+    def is_normal_map(self) -> bool:
+        return self.normal_map_hint or any(node_type == 'NORMAL_MAP' for node_type, _ in self.targets)
+
+    @property
+    def is_color(self) -> bool:
+        return any(name in ('Base Color', 'Emission', 'Emission Color', 'Color') and node_type != 'NORMAL_MAP'
+                   for node_type, name in self.targets)
+
+def scene_materials() -> List:
+    """Node materials the current asset can use; the material factory's batch cache is left alone"""
+    return [material for material in bpy.data.materials
+            if material.use_nodes and material.node_tree and not material.get('_synty_cached', False)]
+
+def collect_image_usage() -> Dict[object, ImageUsage]:
+    """Image node usage across all materials, grouped by image"""
+    usage: Dict[object, ImageUsage] = {}
+    for material in scene_materials():
+        tree = material.node_tree
+        for node in tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image is not None:
+                if node.image not in usage:
+                    usage[node.image] = ImageUsage(bool(node.image.get(NORMAL_MAP_PROPERTY)))
+                usage[node.image].nodes.append(node)
+        for link in tree.links:
+            if link.from_node.type == 'TEX_IMAGE' and link.from_node.image in usage:
+                usage[link.from_node.image].targets.add((link.to_node.type, link.to_socket.name))
+    return usage
+
+class TextureStage:
+    """One step of the texture pipeline"""
+    name = "stage"
+
+    def begin_run(self):
+        """Called at the start of every pipeline run (one run per exported asset)"""
+
+    def report(self) -> Optional[Dict]:
+        """Statistics of the current run, or None if the stage did nothing worth reporting"""
+        return None
+
+    def process_scene(self) -> bool:
+        """Rewrite scene data (meshes and the materials they use) before any material work; True if it changed"""
+        return False
+
+    def process_material(self, material) -> bool:
+        """Rewire a material's nodes (runs before any per-image work); True if it changed"""
+        return False
+
+    def process_image(self, image, content_hash: str, usage: ImageUsage) -> Optional[str]:
+        """Return the path of a derived image to use instead of `image`, or None to keep it"""
+        return None
+
+    def derive(self, image, content_hash: str, tag: str, build: Callable[[str], None],
+               extension: Optional[str] = None) -> Optional[str]:
+        """Path of the cached derived image for (content hash, tag), building it if missing"""
+        source_path = image_source_path(image)
+        extension = extension or (Path(source_path).suffix.lower() if source_path else '.png')
+        path = derived_texture_path(source_path or image.name, content_hash, tag, extension)
+        if not os.path.exists(path):
+            build(path)
+        return path
+
+class TexturePipeline:
+    """Runs texture stages over the images of the current scene"""
+
+    def __init__(self, stages: List[TextureStage]):
+        self.stages = stages
+
+    def run(self) -> int:
+        """Apply every stage to every material image; returns the number of images replaced"""
+        replaced = 0
+        for stage in self.stages:
+            stage.begin_run()
+            try:
+                stage.process_scene()
+            except Exception as e:
+                print(f"[WARNING] Texture stage '{stage.name}' failed for the scene: {e}")
+        for material in scene_materials():
+            for stage in self.stages:
+                try:
+                    stage.process_material(material)
+                except Exception as e:
+                    print(f"[WARNING] Texture stage '{stage.name}' failed for material {material.name}: {e}")
+
+        for image, usage in collect_image_usage().items():
+            current = image
+            for stage in self.stages:
+                content_hash = image_content_hash(current)
+                if content_hash is None:
+                    break
+                try:
+                    derived_path = stage.process_image(current, content_hash, usage)
+                except Exception as e:
+                    print(f"[WARNING] Texture stage '{stage.name}' failed for {current.name}: {e}")
+                    continue
+                if not derived_path:
+                    continue
+                derived = texture_cache.get_texture(derived_path)
+                if derived is None:
+                    continue
+                derived.colorspace_settings.name = current.colorspace_settings.name
+                derived.alpha_mode = current.alpha_mode
+                current = derived
+
+            if current is not image:
+                for node in usage.nodes:
+                    node.image = current
+                replaced += 1
+        return replaced
+
+    def report(self) -> Dict[str, Dict]:
+        """Reports of the stages that did something in the last run, by stage name"""
+        reports = {}
+        for stage in self.stages:
+            stage_report = stage.report()
+            if stage_report:
+                reports[stage.name] = stage_report
+        return reports
@@ -0,0 +1,134 @@
+import numpy as np
+from typing import Optional, Tuple
+from .pipeline import ImageUsage, TextureStage, image_source_path, read_pixels, write_image
+from .transcode import TRANSCODE_FORMATS, needs_transcode
+
+# Texture resolution budget.
+#
+# Textures larger than the target size are downscaled mip-style: whole
+# factors of two are taken with exact 2x2 box averages (the same result a
+# GPU mip chain would give), and any remaining non-power-of-two factor uses
+# an area filter. Colour is filtered in linear light with premultiplied
+# alpha so transparent texels don't bleed, and normal maps are
+# renormalized afterwards.
+
+def fit_size(width: int, height: int, max_size: int) -> Tuple[int, int]:
+    """Largest size within max_size on both axes that keeps the aspect ratio"""
+    if max(width, height) <= max_size:
+        return width, height
+    scale = max_size / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def srgb_to_linear(values: np.ndarray) -> np.ndarray:
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+def linear_to_srgb(values: np.ndarray) -> np.ndarray:
+    values = np.clip(values, 0.0, 1.0)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * values ** (1 / 2.4) - 0.055)
+
+def downsample_half(pixels: np.ndarray, halve_x: bool = True, halve_y: bool = True) -> np.ndarray:
+    """2x2 (or 2x1) box average, repeating the last row/column of odd sizes"""
+    height, width, channels = pixels.shape
+    fy = 2 if halve_y and height > 1 else 1
+    fx = 2 if halve_x and width > 1 else 1
+    if fy == 2 and height % 2:
+        pixels = np.concatenate([pixels, pixels[-1:]], axis=0)
+    if fx == 2 and width % 2:
+        pixels = np.concatenate([pixels, pixels[:, -1:]], axis=1)
+    height, width = pixels.shape[:2]
+    return pixels.reshape(height // fy, fy, width // fx, fx, channels).mean(axis=(1, 3), dtype=np.float32)
+
+def _area_weights(source: int, target: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Source indices and weights (target x taps) of an area filter from source to target samples"""
+    scale = source / target
+    taps = int(np.ceil(scale)) + 1
+    starts = np.arange(target) * scale
+    first = np.floor(starts).astype(np.int64)
+    indices = first[:, None] + np.arange(taps)[None, :]
+    # Overlap of source texel [j, j + 1) with the output footprint [start, start + scale)
+    overlap = (np.minimum(indices + 1, (starts + scale)[:, None]) -
+               np.maximum(indices, starts[:, None]))
+    weights = np.clip(overlap, 0.0, None) / scale
+    return np.minimum(indices, source - 1), weights.astype(np.float32)
+
+def resample_area(pixels: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Area-filtered resize to (width, height); separable, one axis at a time"""
+    if pixels.shape[0] != height:
+        indices, weights = _area_weights(pixels.shape[0], height)
+        pixels = np.einsum('ik,ikwc->iwc', weights, pixels[indices])
+    if pixels.shape[1] != width:
+        indices, weights = _area_weights(pixels.shape[1], width)
+        pixels = np.einsum('jk,hjkc->hjc', weights, pixels[:, indices])
+    return pixels.astype(np.float32, copy=False)
+
+def downscale(pixels: np.ndarray, width: int, height: int,
+              is_srgb: bool = True, is_normal_map: bool = False) -> np.ndarray:
+    """Mip-style downscale of a (height, width, channels) float array"""
+    channels = pixels.shape[2]
+    color = slice(0, min(channels, 3)) if channels != 2 else slice(0, 1)
+    has_alpha = channels in (2, 4)
+
+    if is_srgb and not is_normal_map:
+        pixels[..., color] = srgb_to_linear(pixels[..., color])
+    if has_alpha and not is_normal_map:
+        pixels[..., color] *= pixels[..., -1:]
+
+    while True:
+        halve_y = pixels.shape[0] >= height * 2
+        halve_x = pixels.shape[1] >= width * 2
+        if not (halve_x or halve_y):
+            break
+        pixels = downsample_half(pixels, halve_x, halve_y)
+    pixels = resample_area(pixels, width, height)
+
+    if has_alpha and not is_normal_map:
+        alpha = pixels[..., -1:]
+        pixels[..., color] = np.divide(pixels[..., color], alpha, out=np.zeros_like(pixels[..., color]),
+                                       where=alpha > 0)
+    if is_srgb and not is_normal_map:
+        pixels[..., color] = linear_to_srgb(pixels[..., color])
+    if is_normal_map and channels >= 3:
+        vectors = pixels[..., :3] * 2.0 - 1.0
+        length = np.linalg.norm(vectors, axis=2, keepdims=True)
+        pixels[..., :3] = np.divide(vectors, length, out=vectors, where=length > 0) * 0.5 + 0.5
+    return np.clip(pixels, 0.0, None)
+
+class ResampleStage(TextureStage):
+    """
+    Downscale textures larger than a maximum size.
+
+    With an output format set, resized textures are written straight in that
+    format so a later transcode stage has nothing left to do.
+    """
+    name = "resample"
+
+    def __init__(self, max_size: int, output_format: Optional[str] = None, quality: Optional[int] = None):
+        self.max_size = max_size
+        self.output_format = output_format
+        self.quality = quality
+
+    def process_image(self, image, content_hash: str, usage: ImageUsage) -> Optional[str]:
+        width, height = image.size
+        target = fit_size(width, height, self.max_size)
+        if target == (width, height):
+            return None
+
+        file_format = image.file_format
+        extension = None
+        tag = f"max{self.max_size}"
+        has_alpha = image.channels in (2, 4) and image.alpha_mode != 'NONE'
+        if self.output_format and needs_transcode(image_source_path(image) or image.name, self.output_format, has_alpha):
+            file_format = self.output_format
+            extension = TRANSCODE_FORMATS[self.output_format]
+            tag += f"_{self.output_format.lower()}{self.quality}"
+
+        def build(path):
+            pixels = read_pixels(image)
+            is_srgb = image.colorspace_settings.name == 'sRGB'
+            result = downscale(pixels, target[0], target[1], is_srgb, usage.is_normal_map)
+            if file_format == 'JPEG':
+                result = result[..., :3]
+            write_image(result, path, file_format, image.is_float, self.quality if extension else None)
+            print(f"[INFO] Resampled {image.name} from {width}x{height} to {target[0]}x{target[1]}")
+
+        return self.derive(image, content_hash, tag, build, extension)
@@ -0,0 +1,27 @@
+from typing import Optional
+from .compaction import AtlasCompactStage
+from .normal_maps import NormalMapStage
+from .orm import ORMPackStage
+from .pipeline import TexturePipeline
+from .resample import ResampleStage
+from .transcode import TranscodeStage
+from .vertex_colors import VertexColorBakeStage
+
+def build_texture_pipeline(settings) -> Optional[TexturePipeline]:
+    """Texture pipeline for the given processing settings, or None if no stage is enabled"""
+    stages = []
+    if getattr(settings, 'bake_vertex_colors', False):
+        stages.append(VertexColorBakeStage(settings.vertex_color_tolerance))
+    if getattr(settings, 'pack_orm_textures', False):
+        stages.append(ORMPackStage())
+    if getattr(settings, 'optimize_normal_maps', False):
+        stages.append(NormalMapStage(settings.normal_map_convention))
+    if getattr(settings, 'compact_atlases', False):
+        stages.append(AtlasCompactStage())
+    texture_format = getattr(settings, 'texture_format', 'KEEP')
+    output_format = texture_format if texture_format != 'KEEP' else None
+    if getattr(settings, 'texture_max_size', 0):
+        stages.append(ResampleStage(settings.texture_max_size, output_format, settings.texture_quality))
+    if output_format:
+        stages.append(TranscodeStage(output_format, settings.texture_quality))
+    return TexturePipeline(stages) if stages else None
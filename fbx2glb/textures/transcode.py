@@ -0,0 +1,177 @@
+import json
+import os
+import subprocess
+import tempfile
+import bpy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from ...utils.texture_index import texture_index
+from .pipeline import ImageUsage, TextureStage, derived_texture_path, image_source_path
+
+# Texture transcoding (PNG/TGA -> JPEG/WebP).
+#
+# All unique textures of a batch are transcoded up front by background
+# Blender processes running in parallel, so encoding scales across cores and
+# the main Blender instance only does mesh work. The exporter then embeds or
+# references the transcoded files as they are. Textures the up-front pass
+# didn't cover (e.g. resampled ones) are transcoded in-process by the stage.
+
+TRANSCODE_FORMATS = {'JPEG': '.jpg', 'WEBP': '.webp'}
+DEFAULT_QUALITY = 90
+WORKER_TIMEOUT = 600
+
+# Runs both inside worker processes (via --python-expr) and in-process
+_TRANSCODE_SOURCE = '''
+def transcode_jobs(jobs):
+    import os
+    import bpy
+    scene = bpy.context.scene
+    settings = scene.render.image_settings
+    view = scene.view_settings
+    previous = (settings.file_format, settings.color_mode, settings.color_depth, settings.quality)
+    previous_view = (view.view_transform, view.look, view.exposure, view.gamma)
+    done = []
+    try:
+        # save_render applies the scene's view transform (AgX/Filmic by default); textures must pass through as-is
+        view.view_transform = 'Standard'
+        view.look = 'None'
+        view.exposure = 0.0
+        view.gamma = 1.0
+        for source, target, file_format, quality in jobs:
+            image = None
+            try:
+                image = bpy.data.images.load(source, check_existing=False)
+                settings.file_format = file_format
+                settings.quality = quality
+                settings.color_mode = 'RGB' if file_format == 'JPEG' else 'RGBA'
+                settings.color_depth = '8'
+                temp_path = target + ".tmp" + os.path.splitext(target)[1]
+                image.save_render(temp_path, scene=scene)
+                os.replace(temp_path, target)
+                done.append(source)
+            except Exception as e:
+                print("[ERROR] Could not transcode %s: %s" % (source, e))
+            finally:
+                if image is not None:
+                    bpy.data.images.remove(image)
+    finally:
+        settings.file_format = previous[0]
+        settings.color_mode, settings.color_depth, settings.quality = previous[1:]
+        view.view_transform, view.look, view.exposure, view.gamma = previous_view
+    return done
+'''
+
+_WORKER_SCRIPT = _TRANSCODE_SOURCE + '''
+import json, sys
+with open(sys.argv[sys.argv.index("--") + 1]) as f:
+    print("SSTOOL_TRANSCODED " + json.dumps(transcode_jobs(json.load(f))))
+'''
+
+def _in_process_transcode(jobs: List[List]) -> List[str]:
+    namespace = {}
+    exec(_TRANSCODE_SOURCE, namespace)
+    return namespace['transcode_jobs'](jobs)
+
+def _run_worker(jobs: List[List]) -> List[str]:
+    """Transcode a chunk of jobs in a background Blender process"""
+    job_file = None
+    try:
+        with tempfile.NamedTemporaryFile('w', suffix=".json", delete=False) as f:
+            json.dump(jobs, f)
+            job_file = f.name
+        completed = subprocess.run(
+            [bpy.app.binary_path, "--background", "--factory-startup",
+             "--python-expr", _WORKER_SCRIPT, "--", job_file],
+            capture_output=True, text=True, timeout=WORKER_TIMEOUT)
+        for line in completed.stdout.splitlines():
+            if line.startswith("SSTOOL_TRANSCODED "):
+                return json.loads(line[len("SSTOOL_TRANSCODED "):])
+        print(f"[WARNING] Transcode worker failed (exit code {completed.returncode})")
+        return []
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"[WARNING] Could not run transcode worker: {e}")
+        return []
+    finally:
+        if job_file:
+            os.remove(job_file)
+
+def transcoded_path(source_path: str, content_hash: str, file_format: str, quality: int) -> str:
+    return derived_texture_path(source_path, content_hash, f"{file_format.lower()}{quality}",
+                                TRANSCODE_FORMATS[file_format])
+
+def needs_transcode(source_path: str, file_format: str, has_alpha: bool) -> bool:
+    """Whether a texture should be transcoded to file_format"""
+    if os.path.splitext(source_path)[1].lower() in (TRANSCODE_FORMATS[file_format], '.jpeg'):
+        return False
+    # JPEG has no alpha channel
+    return not (file_format == 'JPEG' and has_alpha)
+
+def transcode_textures(paths: Iterable[str], file_format: str, quality: int = DEFAULT_QUALITY,
+                       workers: int = 4) -> Dict[str, str]:
+    """
+    Transcode textures in parallel worker processes.
+
+    Returns {source path: transcoded path} for every texture that has a
+    transcoded file (already cached or produced now).
+    """
+    results = {}
+    pending = []
+    duplicates = {}  # Same content under another path: transcoded once
+    pending_targets = set()
+    for path in sorted(set(os.path.normpath(p) for p in paths)):
+        record = texture_index.ensure(path)
+        # Unknown alpha (header not probed) counts as alpha until the analysis says otherwise
+        has_alpha = record is not None and record.has_alpha is not False and record.alpha_mode != 'OPAQUE'
+        if record is None or not needs_transcode(path, file_format, has_alpha):
+            continue
+        target = transcoded_path(record.canonical_path, record.content_hash, file_format, quality)
+        if os.path.exists(target):
+            results[path] = target
+        elif target in pending_targets:
+            duplicates[path] = target
+        else:
+            pending_targets.add(target)
+            pending.append([path, target, file_format, quality])
+
+    if not pending:
+        return results
+
+    workers = max(1, min(workers, len(pending)))
+    if not bpy.app.binary_path or workers == 1:
+        done = _in_process_transcode(pending)
+    else:
+        chunks = [pending[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sstool_transcode") as pool:
+            done = [source for chunk_done in pool.map(_run_worker, chunks) for source in chunk_done]
+
+    targets = {job[0]: job[1] for job in pending}
+    for source in done:
+        results[source] = targets[source]
+    for source, target in duplicates.items():
+        if os.path.exists(target):
+            results[source] = target
+    print(f"[INFO] Transcoded {len(done)}/{len(pending)} textures to {file_format} using {workers} workers")
+    return results
+
+class TranscodeStage(TextureStage):
+    """Swap images for their transcoded version"""
+    name = "transcode"
+
+    def __init__(self, file_format: str, quality: int = DEFAULT_QUALITY):
+        self.file_format = file_format
+        self.quality = quality
+
+    def process_image(self, image, content_hash: str, usage: ImageUsage) -> Optional[str]:
+        source_path = image_source_path(image)
+        has_alpha = image.channels in (2, 4) and image.alpha_mode != 'NONE'
+        record = texture_index.find(content_hash)
+        if record is not None and record.has_alpha is not None:
+            # RGBA textures the alpha analysis found fully opaque can still become JPEG
+            has_alpha = record.has_alpha and record.alpha_mode != 'OPAQUE'
+        if not source_path or not needs_transcode(source_path, self.file_format, has_alpha):
+            return None
+        record_path = record.canonical_path if record is not None else source_path
+        target = transcoded_path(record_path, content_hash, self.file_format, self.quality)
+        if not os.path.exists(target):
+            _in_process_transcode([[source_path, target, self.file_format, self.quality]])
+        return target if os.path.exists(target) else None
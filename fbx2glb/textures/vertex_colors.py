@@ -0,0 +1,178 @@
+import bpy
+import numpy as np
+from typing import Dict, Optional
+from .pipeline import TextureStage, read_pixels
+from .resample import srgb_to_linear
+
+# Texture-free output: palette atlas colours baked into vertex colours.
+#
+# Flat-shaded props only ever sample a single swatch per face, so the colour
+# under each face corner's UV can be stored as a corner colour attribute and
+# the atlas dropped from the material. Every polygon is checked first: the
+# colours at its corners and at its UV centroid must agree within the
+# tolerance, otherwise its UVs span a gradient and the whole mesh keeps the
+# textured material.
+
+COLOR_ATTRIBUTE_NAME = "PaletteColor"
+VARIANT_SUFFIX = "_VertexColor"
+DEFAULT_TOLERANCE = 0.02
+
+def _palette_image_node(material):
+    """The image node feeding Base Color, if it is the material's only image and the colour is all it provides"""
+    if not material or not material.use_nodes or not material.node_tree:
+        return None
+    tree = material.node_tree
+    bsdf = next((node for node in tree.nodes if node.type == 'BSDF_PRINCIPLED'), None)
+    if bsdf is None or bsdf.inputs["Alpha"].is_linked:
+        return None
+    images = [node for node in tree.nodes if node.type == 'TEX_IMAGE' and node.image is not None]
+    if len(images) != 1 or images[0].inputs["Vector"].is_linked:
+        return None
+    linked = any(link.from_node == images[0] and link.to_socket == bsdf.inputs["Base Color"] for link in tree.links)
+    return images[0] if linked else None
+
+def sample_nearest(pixels: np.ndarray, uvs: np.ndarray) -> np.ndarray:
+    """Nearest texel of (height, width, channels) pixels at each UV, with repeat wrapping"""
+    height, width = pixels.shape[:2]
+    x = np.floor(np.mod(uvs[:, 0], 1.0) * width).astype(np.int64) % width
+    y = np.floor(np.mod(uvs[:, 1], 1.0) * height).astype(np.int64) % height
+    return pixels[y, x]
+
+def flat_polygons(pixels: np.ndarray, uvs: np.ndarray, starts: np.ndarray, totals: np.ndarray,
+                  tolerance: float) -> np.ndarray:
+    """Per polygon: whether its corner and centroid colours agree within the tolerance"""
+    corner_colors = sample_nearest(pixels, uvs)[:, :3]
+    centroids = np.add.reduceat(uvs.astype(np.float64), starts) / totals[:, None]
+    centre_colors = sample_nearest(pixels, centroids)[:, :3]
+    deviation = np.abs(corner_colors - np.repeat(centre_colors, totals, axis=0)).max(axis=1)
+    return np.maximum.reduceat(deviation, starts) <= tolerance
+
+def _write_corner_colors(mesh, colors: np.ndarray):
+    """Store linear RGBA corner colours as the mesh's active colour attribute"""
+    if hasattr(mesh, 'color_attributes'):
+        # Blender 3.2+: byte colour attributes take linear values
+        attribute = mesh.color_attributes.get(COLOR_ATTRIBUTE_NAME)
+        if attribute is None:
+            attribute = mesh.color_attributes.new(COLOR_ATTRIBUTE_NAME, 'BYTE_COLOR', 'CORNER')
+        attribute.data.foreach_set("color", colors.astype(np.float32).ravel())
+        mesh.color_attributes.active_color = attribute
+        mesh.color_attributes.render_color_index = mesh.color_attributes.find(COLOR_ATTRIBUTE_NAME)
+    else:
+        layer = mesh.vertex_colors.get(COLOR_ATTRIBUTE_NAME) or mesh.vertex_colors.new(name=COLOR_ATTRIBUTE_NAME)
+        colors = colors.copy()
+        # Loop colours were stored as display (sRGB) values before colour attributes
+        colors[:, :3] = np.where(colors[:, :3] <= 0.0031308, colors[:, :3] * 12.92,
+                                 1.055 * np.clip(colors[:, :3], 0.0, 1.0) ** (1 / 2.4) - 0.055)
+        layer.data.foreach_set("color", colors.astype(np.float32).ravel())
+        layer.active = True
+        layer.active_render = True
+
+def vertex_color_variant(material, image_node):
+    """Copy of a material with its palette image replaced by the colour attribute"""
+    variant = material.copy()
+    variant.name = material.name + VARIANT_SUFFIX
+    tree = variant.node_tree
+    old_node = tree.nodes[image_node.name]
+    bsdf = next(node for node in tree.nodes if node.type == 'BSDF_PRINCIPLED')
+    color_node = tree.nodes.new("ShaderNodeVertexColor")
+    color_node.layer_name = COLOR_ATTRIBUTE_NAME
+    color_node.location = old_node.location
+    tree.nodes.remove(old_node)
+    tree.links.new(color_node.outputs["Color"], bsdf.inputs["Base Color"])
+    return variant
+
+class VertexColorBakeStage(TextureStage):
+    """Replace palette atlas textures with baked vertex colours where the UVs allow it"""
+    name = "vertex_color_bake"
+
+    def __init__(self, tolerance: float = DEFAULT_TOLERANCE):
+        self.tolerance = tolerance
+        self.baked = []
+        self.textured = []
+
+    def begin_run(self):
+        self.baked = []
+        self.textured = []
+
+    def report(self) -> Optional[Dict]:
+        if not self.baked and not self.textured:
+            return None
+        return {'baked_meshes': self.baked, 'textured_meshes': self.textured}
+
+    def process_scene(self) -> bool:
+        meshes = {}
+        for obj in bpy.context.scene.objects:
+            if obj.type == 'MESH' and obj.data is not None:
+                if any(slot.link == 'OBJECT' for slot in obj.material_slots):
+                    meshes[obj.data] = False  # Per-object materials: the mesh's colours can't serve all users
+                else:
+                    meshes.setdefault(obj.data, True)
+
+        pixel_cache = {}
+        variants = {}
+        for mesh, bakeable in meshes.items():
+            palette_nodes = [_palette_image_node(material) for material in mesh.materials]
+            if not bakeable or not any(palette_nodes):
+                continue
+            colors = self._bake_mesh(mesh, palette_nodes, pixel_cache)
+            if colors is None:
+                self.textured.append(mesh.name)
+                print(f"[INFO] {mesh.name} keeps its textures: its UVs span colour gradients")
+                continue
+
+            _write_corner_colors(mesh, colors)
+            for index, (material, image_node) in enumerate(zip(list(mesh.materials), palette_nodes)):
+                if image_node is None:
+                    continue
+                if material not in variants:
+                    variants[material] = vertex_color_variant(material, image_node)
+                mesh.materials[index] = variants[material]
+            self.baked.append(mesh.name)
+
+        # Originals that every mesh stopped using would still be visited by later stages
+        for material in variants:
+            if material.users == 0:
+                bpy.data.materials.remove(material)
+        if self.baked:
+            print(f"[INFO] Baked palette colours into vertex colours for {len(self.baked)} meshes")
+        return bool(self.baked)
+
+    def _bake_mesh(self, mesh, palette_nodes, pixel_cache) -> Optional[np.ndarray]:
+        """Linear RGBA corner colours for the mesh, or None if a palette polygon isn't flat"""
+        layer = next((layer for layer in mesh.uv_layers if layer.active_render), None)
+        if layer is None:
+            return None
+        count = len(mesh.polygons)
+        material_index = np.empty(count, dtype=np.int32)
+        loop_start = np.empty(count, dtype=np.int64)
+        loop_total = np.empty(count, dtype=np.int64)
+        mesh.polygons.foreach_get("material_index", material_index)
+        mesh.polygons.foreach_get("loop_start", loop_start)
+        mesh.polygons.foreach_get("loop_total", loop_total)
+        all_uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        layer.data.foreach_get("uv", all_uvs)
+        all_uvs = all_uvs.reshape(-1, 2)
+
+        colors = np.ones((len(mesh.loops), 4), dtype=np.float32)
+        material_index = np.clip(material_index, 0, len(palette_nodes) - 1)
+        for index, image_node in enumerate(palette_nodes):
+            polygons = np.flatnonzero(material_index == index)
+            if image_node is None or not len(polygons):
+                continue
+            image = image_node.image
+            if image not in pixel_cache:
+                pixel_cache[image] = read_pixels(image)
+            pixels = pixel_cache[image]
+
+            totals = loop_total[polygons]
+            starts = np.cumsum(totals) - totals
+            loops = np.repeat(loop_start[polygons] - starts, totals) + np.arange(totals.sum())
+            uvs = all_uvs[loops]
+            if not flat_polygons(pixels, uvs, starts, totals, self.tolerance).all():
+                return None
+            sampled = sample_nearest(pixels, uvs)
+            rgb = sampled[:, :3] if pixels.shape[2] >= 3 else sampled[:, :1].repeat(3, axis=1)
+            if image.colorspace_settings.name == 'sRGB':
+                rgb = srgb_to_linear(rgb)
+            colors[loops, :3] = rgb
+        return colors
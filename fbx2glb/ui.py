@@ -2,6 +2,7 @@
 
 import bpy
 from bpy.props import BoolProperty, StringProperty
+from .watch import is_watching
 
 class SSTOOL_OT_FBX2BlendPopup(bpy.types.Operator):
 	bl_idname = "sstool.fbx2glb_popup"
@@ -77,6 +78,7 @@ class SSTOOL_OT_FBX2BlendPopup(bpy.types.Operator):
 		box = left_col.box()
 		box.prop(props, "character_rotate_fix", text="Rotate armatures 90°")
 		box.prop(props, "auto_normalize_scale", text="Auto normalize scale")
+		box.prop(props, "adaptive_import", text="Adaptive import options")
 		box.prop(props, "reset_object_scale", text="Reset scale to 1.0")
 
 		# --- Export Options ---
@@ -86,6 +88,22 @@ class SSTOOL_OT_FBX2BlendPopup(bpy.types.Operator):
 		box.prop(props, "export_format", text="Format")
 		if props.export_format == 'GLB':
 			box.prop(props, "embed_textures", text="Embed Textures")
+		if props.export_format == 'GLTF_SEPARATE' or not props.embed_textures:
+			box.prop(props, "share_textures", text="Shared Texture Folder")
+		box.prop(props, "bake_vertex_colors", text="Vertex Colours Only")
+		if props.bake_vertex_colors:
+			box.prop(props, "vertex_color_tolerance", text="Colour Tolerance")
+		box.prop(props, "pack_orm_textures", text="Pack ORM Textures")
+		box.prop(props, "optimize_normal_maps", text="Two-Channel Normal Maps")
+		if props.optimize_normal_maps:
+			box.prop(props, "normal_map_convention", text="Source")
+		box.prop(props, "compact_atlases", text="Compact Palette Atlases")
+		box.prop(props, "texture_max_size", text="Max Texture Size")
+		box.prop(props, "texture_format", text="Texture Format")
+		if props.texture_format != 'KEEP':
+			row = box.row()
+			row.prop(props, "texture_quality", text="Quality")
+			row.prop(props, "transcode_workers", text="Processes")
 
 		# RIGHT COLUMN
 		# --- Processing Options ---
@@ -99,6 +117,9 @@ class SSTOOL_OT_FBX2BlendPopup(bpy.types.Operator):
 			row.prop(props, "max_retries", text="Max")
 
 		box.prop(props, "clear_cache_between_folders", text="Clear Cache")
+		box.prop(props, "texture_cache_budget_mb", text="Cache Budget (MB)")
+		box.prop(props, "preflight_workers", text="Pre-flight Threads")
+		box.prop(props, "watch_debounce_seconds", text="Watch Debounce (s)")
 		box.prop(props, "validate_textures", text="Validate Textures")
 
 		# --- Material Options ---
@@ -114,6 +135,8 @@ class SSTOOL_OT_FBX2BlendPopup(bpy.types.Operator):
 
 		box.prop(props, "inherit_material_values", text="Inherit Values")
 		box.prop(props, "force_texture", text="Force Texture")
+		box.prop(props, "build_folder_atlas", text="Atlas Folder Textures")
+		box.prop(props, "texture_library_path", text="Texture Library")
 
 		# --- Cleanup & Debugging ---
 		right_col.separator()
@@ -131,3 +154,7 @@ class SSTOOL_OT_FBX2BlendPopup(bpy.types.Operator):
 		row.scale_y = 1.2
 		row.operator("sstool.preview_batch", text="Preview Batch", icon='VIEWZOOM')
 		row.operator("sstool.test_fbx2glb_converter", text="Test Single File", icon='PLAY')
+		if is_watching():
+			row.operator("sstool.watch_fbx_folder", text="Stop Watching", icon='PAUSE')
+		else:
+			row.operator("sstool.watch_fbx_folder", text="Watch Folder", icon='HIDE_OFF')
@@ -2,7 +2,7 @@ import bpy
 
 class SSTOOL_OT_ShowFbxAsciiDialog(bpy.types.Operator):
     bl_idname = "sfc.fbx_ascii_dialog"
-    bl_label = "ASCII FBX Not Supported"
+    bl_label = "ASCII FBX Conversion Failed"
 
     message: bpy.props.StringProperty(default="")
 
@@ -11,12 +11,13 @@ class SSTOOL_OT_ShowFbxAsciiDialog(bpy.types.Operator):
 
     def draw(self, context):
         col = self.layout.column()
-        col.label(text="❌ ASCII FBX file detected", icon='ERROR')
-        col.label(text="This FBX file is not supported:")
+        col.label(text="❌ ASCII FBX file could not be converted", icon='ERROR')
+        col.label(text="ASCII FBX files are converted to binary automatically,")
+        col.label(text="but this one failed:")
         col.label(text=self.message)
         col.separator()
-        col.label(text="Use Autodesk FBX Converter to convert it to binary.")
-        col.label(text="Google it.")
+        col.label(text="Only FBX 7.x ASCII files are supported. Older files need")
+        col.label(text="re-exporting as binary FBX from a DCC tool.")
 
     def execute(self, context):
         return {'FINISHED'}
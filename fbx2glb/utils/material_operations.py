@@ -3,6 +3,7 @@ from ...state import generated_material_counter
 from .detection import has_image_texture
 # Removed logger import to avoid conflicts
 from ..materials.material_factory import material_factory
+from ..textures.alpha import ALPHA_BLEND, ALPHA_OPAQUE, apply_alpha_mode, set_material_alpha_mode
 
 def create_new_generated_material():
 	"""
@@ -51,10 +52,8 @@ def add_bsdf_node(material, original_material, inherit_values=True):
 	bsdf.inputs["Metallic"].default_value = metallic
 	bsdf.inputs["Alpha"].default_value = alpha
 
-	# Optional: ensure material is set up for transparency
-	material.blend_method = 'BLEND'
-	if hasattr(material, 'shadow_method'):
-		material.shadow_method = 'HASHED'
+	# Only blend when the inherited alpha is translucent; textures refine this in add_texture_node
+	set_material_alpha_mode(material, ALPHA_BLEND if alpha < 1.0 else ALPHA_OPAQUE)
 	material.use_backface_culling = False 
 
 	return bsdf
@@ -75,6 +74,7 @@ def add_texture_node(material, bsdf_node, texture_path):
 	tex_image.location = (-300, 0)
 
 	links.new(tex_image.outputs["Color"], bsdf_node.inputs["Base Color"])
+	apply_alpha_mode(material)
 
 	return tex_image  # <-- RETURN IT!
 
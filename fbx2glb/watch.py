@@ -0,0 +1,76 @@
+import bpy
+import os
+from bpy.types import Operator
+from .services.processing_service import FBXProcessingService, ProcessingSettings
+from .services.watcher import FolderWatcher
+from ..utils.logging import logger
+
+# How often the main thread checks the watcher for settled files
+WATCH_TIMER_INTERVAL = 1.0
+
+_active_watcher = None
+
+def is_watching() -> bool:
+    return _active_watcher is not None and _active_watcher.is_running
+
+def _process_watched_files():
+    """Timer callback: convert files the watcher reported, on Blender's main thread"""
+    if _active_watcher is None:
+        return None  # Unregisters the timer
+
+    file_paths = _active_watcher.pop_ready()
+    if file_paths:
+        props = bpy.context.scene.fbx2glb_props
+        names = ", ".join(os.path.basename(path) for path in file_paths)
+        logger.info(f"Converting changed files: {names}", "WATCH")
+        try:
+            service = FBXProcessingService(ProcessingSettings(props))
+            summary = service.process_files(file_paths)
+            logger.info(f"Watch batch done: {summary['successful']}/{summary['total_processed']} successful", "WATCH")
+        except Exception as e:
+            logger.error(f"Watch batch failed: {e}", "WATCH")
+
+    return WATCH_TIMER_INTERVAL
+
+def start_folder_watch(folder: str, debounce_seconds: float):
+    global _active_watcher
+    stop_folder_watch()
+    _active_watcher = FolderWatcher(folder, debounce_seconds=debounce_seconds)
+    _active_watcher.start()
+    if not bpy.app.timers.is_registered(_process_watched_files):
+        bpy.app.timers.register(_process_watched_files, first_interval=WATCH_TIMER_INTERVAL, persistent=True)
+
+def stop_folder_watch():
+    global _active_watcher
+    if _active_watcher is not None:
+        _active_watcher.stop()
+        _active_watcher = None
+    if bpy.app.timers.is_registered(_process_watched_files):
+        bpy.app.timers.unregister(_process_watched_files)
+
+class SSTOOL_OT_WatchFolderOperator(Operator):
+    bl_idname = "sstool.watch_fbx_folder"
+    bl_label = "Watch Folder"
+    bl_description = "Start or stop converting new and changed FBX files in the input folder automatically"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        """Toggle watch mode for the input folder"""
+        if is_watching():
+            stop_folder_watch()
+            self.report({'INFO'}, "Stopped watching input folder")
+            return {'FINISHED'}
+
+        props = context.scene.fbx2glb_props
+        if not props.fbx_folder or not os.path.isdir(props.fbx_folder):
+            self.report({'ERROR'}, "No valid input folder specified")
+            return {'CANCELLED'}
+
+        try:
+            start_folder_watch(props.fbx_folder, props.watch_debounce_seconds)
+        except Exception as e:
+            self.report({'ERROR'}, f"Could not start watching: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Watching {props.fbx_folder} ({_active_watcher.backend})")
+        return {'FINISHED'}
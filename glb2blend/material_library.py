@@ -0,0 +1,221 @@
+import hashlib
+import os
+import re
+import bpy
+from typing import Dict, List, Optional, Set, Tuple
+from ..utils.image_dedup import image_pixel_hash
+
+# Shared material library.
+#
+# Instead of every output .blend embedding its own copy of the same
+# materials and atlas images, each unique material is stored once in a
+# library .blend next to the outputs and linked into every file that uses
+# it. Materials are unique by node content, with images compared by their
+# data, and images the library already holds are reused, so an atlas shared
+# by many materials is stored once too. Editing a library material updates
+# every file that links it.
+
+DEFAULT_LIBRARY_NAME = "material_library.blend"
+
+# Node settings that change how a node renders, where present
+NODE_SETTINGS = ('blend_type', 'operation', 'data_type', 'space', 'interpolation',
+				 'extension', 'projection', 'uv_map', 'layer_name', 'use_clamp')
+
+# Suffix Blender adds to duplicate datablock names ("Material.001")
+_DUPLICATE_SUFFIX = re.compile(r'\.\d{3}$')
+
+def _rounded(value):
+	if value is None or isinstance(value, (bool, str)):
+		return value
+	if isinstance(value, (int, float)):
+		return round(value, 5)
+	try:
+		return tuple(round(component, 5) for component in value)
+	except TypeError:
+		return repr(value)
+
+def image_key(image) -> Tuple:
+	"""Image identity by data: packed bytes when packed (no decode), decoded pixels otherwise"""
+	if image.packed_file:
+		data_hash = hashlib.sha1(bytes(image.packed_file.data)).hexdigest()
+	else:
+		data_hash = image_pixel_hash(image) or bpy.path.abspath(image.filepath)
+	return (data_hash, image.colorspace_settings.name, image.alpha_mode)
+
+def material_content_key(material) -> Tuple:
+	"""Hashable description of everything a material renders with; equal for identical materials"""
+	settings = (getattr(material, 'blend_method', None), material.use_backface_culling)
+	if not material.use_nodes or not material.node_tree:
+		return ('flat', _rounded(material.diffuse_color), _rounded(material.roughness),
+				_rounded(material.metallic)) + settings
+
+	nodes = []
+	for node in sorted(material.node_tree.nodes, key=lambda node: node.name):
+		node_settings = tuple((name, _rounded(getattr(node, name))) for name in NODE_SETTINGS if hasattr(node, name))
+		image = image_key(node.image) if node.type == 'TEX_IMAGE' and node.image else None
+		group = node.node_tree.name if node.type == 'GROUP' and node.node_tree else None
+		inputs = tuple((socket.identifier, _rounded(getattr(socket, 'default_value', None)))
+					   for socket in node.inputs if not socket.is_linked)
+		nodes.append((node.name, node.bl_idname, node_settings, image, group, inputs))
+	links = tuple(sorted((link.from_node.name, link.from_socket.identifier,
+						  link.to_node.name, link.to_socket.identifier)
+						 for link in material.node_tree.links))
+	return ('nodes', tuple(nodes), links) + settings
+
+def _material_images(material) -> List:
+	if not material.use_nodes or not material.node_tree:
+		return []
+	return [node.image for node in material.node_tree.nodes if node.type == 'TEX_IMAGE' and node.image]
+
+class MaterialLibrary:
+	"""Library .blend of unique materials, linked into output files instead of embedding copies"""
+
+	def __init__(self, path: str):
+		self.path = os.path.abspath(path)
+		self.entries: Dict[Tuple, str] = {}  # Material content key -> library material name
+		self.material_names: Set[str] = set()
+		self.image_names: Set[str] = set()
+		self.images: Dict[Tuple, str] = {}  # Image key -> library image name
+		self._indexed = False
+
+	def link_materials(self) -> int:
+		"""
+		Replace the local materials of the current file with linked library materials.
+
+		Materials the library doesn't have yet are written to it first.
+		Returns the number of local materials replaced.
+		"""
+		materials = {slot.material for obj in bpy.data.objects for slot in obj.material_slots
+					 if slot.material is not None and slot.material.library is None}
+		if not materials:
+			return 0
+		self._index()
+
+		keys = {material: material_content_key(material) for material in materials}
+		new = {}
+		for material, key in keys.items():
+			if key not in self.entries and key not in new:
+				new[key] = material
+		if new:
+			self._add(new)
+
+		linked = self._link(sorted({self.entries[key] for key in keys.values()}))
+		replacements = {material: linked[self.entries[key]] for material, key in keys.items()
+						if self.entries[key] in linked}
+		if hasattr(bpy.data, 'batch_remap'):
+			bpy.data.batch_remap(replacements)
+		else:
+			for material, replacement in replacements.items():
+				material.user_remap(replacement)
+
+		# The local copies aren't saved; free them (and images only they used) right away
+		images = {image for material in replacements for image in _material_images(material)}
+		for material in replacements:
+			if material.users == 0:
+				bpy.data.materials.remove(material)
+		for image in images:
+			if image.users == 0:
+				bpy.data.images.remove(image)
+		return len(replacements)
+
+	def make_paths_relative(self, blend_path: str):
+		"""Point linked copies of the library at it relative to the .blend about to be saved"""
+		relative = "//" + os.path.relpath(self.path, os.path.dirname(os.path.abspath(blend_path))).replace(os.sep, '/')
+		for library in bpy.data.libraries:
+			if os.path.normcase(os.path.abspath(bpy.path.abspath(library.filepath))) == os.path.normcase(self.path):
+				library.filepath = relative
+
+	def _index(self):
+		"""Learn what an existing library (e.g. from an earlier run) holds"""
+		if self._indexed:
+			return
+		self._indexed = True
+		if not os.path.exists(self.path):
+			return
+		self._read_names()
+		materials, images = self._append()
+		for material in materials:
+			self.entries.setdefault(material_content_key(material), material.name)
+		for image in images:
+			self.images.setdefault(image_key(image), image.name)
+		self._remove(materials, images)
+		print(f"[INFO] Material library {os.path.basename(self.path)}: {len(self.entries)} materials")
+
+	def _read_names(self):
+		with bpy.data.libraries.load(self.path) as (data_from, data_to):
+			self.material_names = set(data_from.materials)
+			self.image_names = set(data_from.images)
+
+	def _append(self) -> Tuple[List, List]:
+		"""Local copies of every library material and the images they use"""
+		# Local datablocks holding library names would make Blender rename the appended ones
+		for collection, names in ((bpy.data.materials, self.material_names), (bpy.data.images, self.image_names)):
+			for datablock in list(collection):
+				if datablock.library is None and datablock.name in names:
+					datablock.name = _DUPLICATE_SUFFIX.sub('', datablock.name) + "_local"
+
+		images_before = set(bpy.data.images)
+		with bpy.data.libraries.load(self.path, link=False) as (data_from, data_to):
+			data_to.materials = list(data_from.materials)
+		materials = [material for material in data_to.materials if material is not None]
+		images = [image for image in bpy.data.images if image not in images_before]
+		return materials, images
+
+	def _remove(self, materials, images):
+		for material in materials:
+			bpy.data.materials.remove(material)
+		for image in images:
+			if image.users == 0:
+				bpy.data.images.remove(image)
+
+	def _unique_name(self, base: str, material) -> str:
+		name = base
+		counter = 1
+		while name in self.material_names or (name in bpy.data.materials and bpy.data.materials[name] != material):
+			name = f"{base}_{counter:03d}"
+			counter += 1
+		return name
+
+	def _add(self, new: Dict[Tuple, object]):
+		"""Write the library again with the new materials added"""
+		base_names = {key: _DUPLICATE_SUFFIX.sub('', material.name) for key, material in new.items()}
+		appended_materials, appended_images = self._append() if os.path.exists(self.path) else ([], [])
+		library_images = {image.name: image for image in appended_images}
+
+		for key, material in new.items():
+			# Reuse images the library already holds
+			for node in material.node_tree.nodes if material.use_nodes and material.node_tree else ():
+				if node.type == 'TEX_IMAGE' and node.image and node.image not in appended_images:
+					existing = library_images.get(self.images.get(image_key(node.image)))
+					if existing is not None:
+						node.image = existing
+			material.name = self._unique_name(base_names[key], material)
+			self.entries[key] = material.name
+			self.material_names.add(material.name)
+			for image in _material_images(material):
+				self.images.setdefault(image_key(image), image.name)
+				self.image_names.add(image.name)
+
+		os.makedirs(os.path.dirname(self.path), exist_ok=True)
+		bpy.data.libraries.write(self.path, set(appended_materials) | set(new.values()),
+								 path_remap='ABSOLUTE', fake_user=True, compress=True)
+		print(f"[INFO] Added {len(new)} materials to {os.path.basename(self.path)}")
+		self._remove(appended_materials, appended_images)
+
+		# Already linked into this session: pick up the new contents
+		for library in bpy.data.libraries:
+			if os.path.normcase(os.path.abspath(bpy.path.abspath(library.filepath))) == os.path.normcase(self.path):
+				library.reload()
+
+	def _link(self, names: List[str]) -> Dict[str, object]:
+		with bpy.data.libraries.load(self.path, link=True) as (data_from, data_to):
+			data_to.materials = [name for name in names if name in data_from.materials]
+		return {material.name: material for material in data_to.materials if material is not None}
+
+def get_material_library(output_dir: str, library_name: str = DEFAULT_LIBRARY_NAME) -> Optional[MaterialLibrary]:
+	"""Library in the output folder (None without a name)"""
+	if not library_name:
+		return None
+	if not library_name.lower().endswith('.blend'):
+		library_name += '.blend'
+	return MaterialLibrary(os.path.join(output_dir, library_name))
@@ -7,6 +7,8 @@ import gc
 import time
 from ..utils.blender import clear_scene
 from ..utils.memory import purge_unused_data
+from ..utils.discovery import discover_files, discover_folders
+from .material_library import get_material_library
 
 
 def validate_glb_file(filepath):
@@ -197,21 +199,25 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 					self.report({'ERROR'}, f"Cannot create output directory: {e}")
 					return {'CANCELLED'}
 
-			# Find all GLB files
-			glb_files = list(input_dir.rglob("*.glb"))
-			if not glb_files:
-				self.report({'WARNING'}, "No GLB files found in input directory")
-				return {'CANCELLED'}
+			# Unique materials go to one library .blend that every output links
+			self.material_library = None
+			if props.import_materials == 'LIBRARY':
+				self.material_library = get_material_library(str(output_dir), props.material_library_name)
 
-			print(f"[INFO] Found {len(glb_files)} GLB files")
+			# Discover GLB files lazily: processing starts on the first file
+			# while the walk (and validation) continues on a worker thread
+			validator = validate_glb_file if props.validate_glb_files else None
 
 			# Process files based on output mode
 			if props.output_mode == 'INDIVIDUAL':
-				return self._process_individual_files(glb_files, input_dir, output_dir, props)
+				discovery = discover_files(str(input_dir), ".glb", validator=validator)
+				return self._process_individual_files(discovery, input_dir, output_dir, props)
 			elif props.output_mode == 'MERGE_FOLDER':
-				return self._process_merged_by_folder(glb_files, input_dir, output_dir, props)
+				discovery = discover_folders(str(input_dir), ".glb", validator=validator)
+				return self._process_merged_by_folder(discovery, input_dir, output_dir, props)
 			elif props.output_mode == 'MERGE_ALL':
-				return self._process_single_file(glb_files, input_dir, output_dir, props)
+				discovery = discover_files(str(input_dir), ".glb", validator=validator)
+				return self._process_single_file(discovery, input_dir, output_dir, props)
 
 		except Exception as e:
 			error_msg = f"Processing failed: {e}"
@@ -221,28 +227,30 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 			self.report({'ERROR'}, error_msg)
 			return {'CANCELLED'}
 
-	def _process_individual_files(self, glb_files, input_dir, output_dir, props):
+	def _no_files_found(self):
+		self.report({'WARNING'}, "No GLB files found in input directory")
+		return {'CANCELLED'}
+
+	def _process_individual_files(self, discovery, input_dir, output_dir, props):
 		"""Process each GLB file into individual blend files"""
 		total_processed = 0
 		total_failed = 0
 		processed_count = 0
 
-		for glb_path in glb_files:
+		for discovered in discovery:
+			glb_path = pathlib.Path(discovered.path)
 			try:
-				print(f"[DEBUG] Starting processing: {glb_path}")
-
-				# Validate GLB file
-				if props.validate_glb_files:
-					print(f"[DEBUG] Validating {glb_path.name}")
-					valid, msg = validate_glb_file(str(glb_path))
-					if not valid:
-						print(f"[ERROR] Invalid GLB file {glb_path.name}: {msg}")
-						if props.continue_on_error:
-							total_failed += 1
-							continue
-						else:
-							self.report({'ERROR'}, f"Invalid GLB file: {msg}")
-							return {'CANCELLED'}
+				print(f"[DEBUG] Starting processing ({discovery.progress(total_processed + total_failed + 1)}): {glb_path}")
+
+				# Validation already ran on the discovery thread
+				if not discovered.is_valid:
+					print(f"[ERROR] Invalid GLB file {glb_path.name}: {discovered.message}")
+					if props.continue_on_error:
+						total_failed += 1
+						continue
+					else:
+						self.report({'ERROR'}, f"Invalid GLB file: {discovered.message}")
+						return {'CANCELLED'}
 
 				# Clear scene if requested
 				if props.clear_scene_between:
@@ -282,7 +290,7 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 					backup_existing_file(str(output_blend_path))
 
 				# Save blend file
-				bpy.ops.wm.save_as_mainfile(filepath=str(output_blend_path))
+				self._save_blend(output_blend_path)
 				total_processed += 1
 
 				if props.show_processing_log:
@@ -303,6 +311,9 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 					self.report({'ERROR'}, f"Processing failed: {e}")
 					return {'CANCELLED'}
 
+		if discovery.discovered == 0:
+			return self._no_files_found()
+
 		# Final cleanup
 		clear_scene()
 		purge_unused_data()
@@ -318,23 +329,19 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 			self.report({'ERROR'}, f"All {total_failed} files failed to process")
 			return {'CANCELLED'}
 
-	def _process_merged_by_folder(self, glb_files, input_dir, output_dir, props):
+	def _process_merged_by_folder(self, discovery, input_dir, output_dir, props):
 		"""Process GLB files merged by folder"""
-		# Group files by folder
-		folders = {}
-		for glb_path in glb_files:
-			folder_key = glb_path.parent
-			if folder_key not in folders:
-				folders[folder_key] = []
-			folders[folder_key].append(glb_path)
-
 		total_processed = 0
 		total_failed = 0
 
-		for folder, files in folders.items():
+		# Folders arrive already grouped, each one as soon as it has been scanned
+		for folder_path, discovered_files in discovery:
+			folder = pathlib.Path(folder_path)
+			files = [pathlib.Path(discovered.path) for discovered in discovered_files]
+			invalid = {discovered.path: discovered.message for discovered in discovered_files if not discovered.is_valid}
 			try:
 				if props.show_processing_log:
-					print(f"[INFO] Processing folder: {folder.name} ({len(files)} files)")
+					print(f"[INFO] Processing folder: {folder.name} ({len(files)} files, {discovery.progress(total_processed + total_failed)} so far)")
 
 				if props.clear_scene_between:
 					clear_scene()
@@ -343,11 +350,9 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 				all_imported_objects = []
 				for glb_path in files:
 					try:
-						if props.validate_glb_files:
-							valid, msg = validate_glb_file(str(glb_path))
-							if not valid:
-								print(f"[ERROR] Invalid GLB file {glb_path.name}: {msg}")
-								continue
+						if str(glb_path) in invalid:
+							print(f"[ERROR] Invalid GLB file {glb_path.name}: {invalid[str(glb_path)]}")
+							continue
 
 						objects_before = set(bpy.data.objects)
 						self._import_glb_with_settings(str(glb_path), props)
@@ -382,7 +387,7 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 					if props.backup_existing:
 						backup_existing_file(str(output_blend_path))
 
-					bpy.ops.wm.save_as_mainfile(filepath=str(output_blend_path))
+					self._save_blend(output_blend_path)
 					total_processed += len(files)
 
 					if props.show_processing_log:
@@ -395,6 +400,9 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 					self.report({'ERROR'}, f"Processing failed: {e}")
 					return {'CANCELLED'}
 
+		if discovery.discovered == 0:
+			return self._no_files_found()
+
 		# Final cleanup
 		clear_scene()
 		purge_unused_data()
@@ -410,27 +418,26 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 			self.report({'ERROR'}, f"All {total_failed} files failed to process")
 			return {'CANCELLED'}
 
-	def _process_single_file(self, glb_files, input_dir, output_dir, props):
+	def _process_single_file(self, discovery, input_dir, output_dir, props):
 		"""Process all GLB files into a single blend file"""
 		try:
 			if props.show_processing_log:
-				print(f"[INFO] Processing all {len(glb_files)} files into single blend")
+				print("[INFO] Processing all files into single blend")
 
 			clear_scene()
 			total_processed = 0
 			total_failed = 0
 
-			for glb_path in glb_files:
+			for discovered in discovery:
+				glb_path = pathlib.Path(discovered.path)
 				try:
-					if props.validate_glb_files:
-						valid, msg = validate_glb_file(str(glb_path))
-						if not valid:
-							print(f"[ERROR] Invalid GLB file {glb_path.name}: {msg}")
-							if props.continue_on_error:
-								total_failed += 1
-								continue
-							else:
-								raise Exception(msg)
+					if not discovered.is_valid:
+						print(f"[ERROR] Invalid GLB file {glb_path.name}: {discovered.message}")
+						if props.continue_on_error:
+							total_failed += 1
+							continue
+						else:
+							raise Exception(discovered.message)
 
 					objects_before = set(bpy.data.objects)
 					self._import_glb_with_settings(str(glb_path), props)
@@ -446,7 +453,7 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 						total_processed += 1
 
 						if props.show_processing_log:
-							print(f"[INFO] Imported: {glb_path.name}")
+							print(f"[INFO] Imported ({discovery.progress(total_processed + total_failed)}): {glb_path.name}")
 
 				except Exception as e:
 					total_failed += 1
@@ -454,12 +461,15 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 					if not props.continue_on_error:
 						raise
 
+			if discovery.discovered == 0:
+				return self._no_files_found()
+
 			# Save single merged file
 			output_blend_path = output_dir / "all_glb_merged.blend"
 			if props.backup_existing:
 				backup_existing_file(str(output_blend_path))
 
-			bpy.ops.wm.save_as_mainfile(filepath=str(output_blend_path))
+			self._save_blend(output_blend_path)
 
 			if props.show_processing_log:
 				print(f"[INFO] Saved merged file: {output_blend_path.name}")
@@ -481,6 +491,22 @@ class SSTOOL_OT_GLB2BlendOperator(Operator):
 			self.report({'ERROR'}, error_msg)
 			return {'CANCELLED'}
 
+	def _save_blend(self, output_blend_path):
+		"""Save the current file, first swapping its materials for linked library materials when enabled"""
+		if self.material_library is None:
+			bpy.ops.wm.save_as_mainfile(filepath=str(output_blend_path))
+			return
+
+		try:
+			linked = self.material_library.link_materials()
+			if linked:
+				print(f"[DEBUG] Linked {linked} materials from the material library")
+		except Exception as e:
+			print(f"[ERROR] Failed to link library materials, saving embedded materials: {e}")
+		# The library path is made relative to this file already; remapping would move it again
+		self.material_library.make_paths_relative(str(output_blend_path))
+		bpy.ops.wm.save_as_mainfile(filepath=str(output_blend_path), relative_remap=False)
+
 	def _import_glb_with_settings(self, filepath, props):
 		"""Import GLB file with the specified settings"""
 		try:
@@ -23,11 +23,18 @@ class SSTOOL_PG_GLB2BlendProperties(PropertyGroup):
 		items=[
 			('IMPORT', 'Import All', 'Import all materials from GLB'),
 			('NONE', 'Skip Materials', 'Import geometry only, no materials'),
-			('PLACEHOLDER', 'Placeholder Materials', 'Create simple placeholder materials')
+			('PLACEHOLDER', 'Placeholder Materials', 'Create simple placeholder materials'),
+			('LIBRARY', 'Shared Library', 'Store each unique material and image once in a library .blend in the output folder and link it into every output file')
 		],
 		default='IMPORT'
 	) # type: ignore
 
+	material_library_name: StringProperty(
+		name="Library File",
+		description="Name of the material library .blend written to the output folder",
+		default="material_library.blend"
+	) # type: ignore
+
 	import_animations: BoolProperty(
 		name="Import Animations",
 		description="Import animations from GLB files",
@@ -55,6 +55,8 @@ class SSTOOL_OT_GLB2BlendPopup(bpy.types.Operator):
 		left_col.label(text="📥 Import", icon='NONE')
 		box = left_col.box()
 		box.prop(props, "import_materials", text="Materials")
+		if props.import_materials == 'LIBRARY':
+			box.prop(props, "material_library_name", text="Library File")
 		box.prop(props, "import_animations", text="Animations")
 		row = box.row()
 		row.prop(props, "import_cameras", text="Cameras")
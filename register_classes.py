@@ -11,6 +11,7 @@ from .fbx2glb.properties import SSTOOL_PG_FBX2GLBProperties
 from .fbx2glb.operator import SSTOOL_OT_FBX2GLBOperator
 from .fbx2glb.test_operator import SSTOOL_OT_TestFBX2GLBOperator
 from .fbx2glb.preview import SSTOOL_OT_PreviewBatchOperator
+from .fbx2glb.watch import SSTOOL_OT_WatchFolderOperator, stop_folder_watch
 from .fbx2glb.utils.ascii_warning import SSTOOL_OT_ShowFbxAsciiDialog
 
 from .glb2blend.ui import SSTOOL_OT_GLB2BlendPopup
@@ -53,6 +54,7 @@ fbx2glb_classes = (
 	SSTOOL_OT_FBX2GLBOperator,
 	SSTOOL_OT_TestFBX2GLBOperator,
 	SSTOOL_OT_PreviewBatchOperator,
+	SSTOOL_OT_WatchFolderOperator,
 	SSTOOL_PG_FBX2GLBProperties
 )
 
@@ -115,6 +117,7 @@ def unregister():
 	Ensures a clean reload of the addon without leftover classes.
 	"""
 
+	stop_folder_watch()
 
 	for cls in reversed(classes):
 		bpy.utils.unregister_class(cls)
@@ -2,6 +2,7 @@ import bpy
 import os
 from bpy.types import Operator
 from ..utils.blender import clear_scene
+from ..utils.discovery import discover_files
 
 class SSTOOL_OT_ScaleObjectsOperator(Operator):
 	bl_idname = "sstool.scale_objects"
@@ -24,35 +25,24 @@ class SSTOOL_OT_ScaleObjectsOperator(Operator):
 		processed_count = 0
 		error_count = 0
 
-		# Walk through directory
-		if props.include_subfolders:
-			file_iterator = os.walk(props.input_dir)
-		else:
-			# Only process files in the root directory
-			root_files = []
-			if os.path.exists(props.input_dir):
-				for file in os.listdir(props.input_dir):
-					file_path = os.path.join(props.input_dir, file)
-					if os.path.isfile(file_path):
-						root_files.append((props.input_dir, [], [file]))
-			file_iterator = root_files
-
-		for root, dirs, files in file_iterator:
-			for file in files:
-				if file.endswith('.blend'):
-					filepath = os.path.join(root, file)
-					try:
-						if self.process_blend_file(filepath, props):
-							processed_count += 1
-							self.report({'INFO'}, f"Processed: {file}")
-						else:
-							error_count += 1
-							self.report({'WARNING'}, f"No objects to process in: {file}")
-					except Exception as e:
-						error_count += 1
-						self.report({'ERROR'}, f"Failed to process {file}: {str(e)}")
-					finally:
-						clear_scene()
+		# Discover .blend files lazily; processing starts while the walk continues
+		discovery = discover_files(props.input_dir, ".blend", recursive=props.include_subfolders)
+
+		for discovered in discovery:
+			filepath = discovered.path
+			file = os.path.basename(filepath)
+			try:
+				if self.process_blend_file(filepath, props):
+					processed_count += 1
+					self.report({'INFO'}, f"Processed: {file} ({discovery.progress(processed_count + error_count)})")
+				else:
+					error_count += 1
+					self.report({'WARNING'}, f"No objects to process in: {file}")
+			except Exception as e:
+				error_count += 1
+				self.report({'ERROR'}, f"Failed to process {file}: {str(e)}")
+			finally:
+				clear_scene()
 
 		if processed_count > 0:
 			self.report({'INFO'}, f"Successfully scaled objects in {processed_count} files")
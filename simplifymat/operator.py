@@ -1,6 +1,7 @@
 import bpy
 import os
 from bpy.types import Operator
+from ..utils.image_dedup import dedup_images
 
 # -- Custom Utility: Scene Clearing --
 
@@ -29,113 +30,129 @@ def clear_scene():
 
 # -- Material Merge Logic --
 
-def images_are_equal(img1, img2):
-    if img1 is None or img2 is None:
-        return img1 == img2
-    # For embedded images, compare name and resolution
-    return (
-        img1.size == img2.size and
-        img1.source == img2.source and
-        img1.name.split(".")[0] == img2.name.split(".")[0]
-    )
+# BSDF inputs compared between materials, and how close their values must be
+BSDF_KEYS = ("Base Color", "Roughness", "Metallic", "Alpha")
+VALUE_TOLERANCE = 1e-5
+
+def _quantize(value):
+    """
+    Value snapped to the tolerance grid (scalars and colours).
+
+    Snapping makes "equal within tolerance" transitive, so materials can be
+    bucketed by key. It is intentionally a little stricter than the old
+    pairwise check: values in one bucket always differ by less than
+    VALUE_TOLERANCE, but two values closer than that on either side of a
+    grid boundary no longer merge. At 1e-5 that only separates values that
+    already differ, and the pairwise check chained merges depending on the
+    order materials were visited. Node-less diffuse colours, which used to
+    be compared exactly, get the same tolerance.
+    """
+    if isinstance(value, (float, int)):
+        return round(value / VALUE_TOLERANCE)
+    return tuple(round(component / VALUE_TOLERANCE) for component in value)
+
+def _linked_image(bsdf_input):
+    """Image of a texture node feeding the input directly"""
+    if bsdf_input.is_linked:
+        from_node = bsdf_input.links[0].from_node
+        if from_node.type == 'TEX_IMAGE' and from_node.image:
+            return from_node.image
+    return None
 
-def materials_are_duplicates(mat1, mat2):
-    if mat1.use_nodes != mat2.use_nodes:
-        print(f"❌ [{mat1.name} vs {mat2.name}] Node usage mismatch")
-        return False
-
-    if not mat1.use_nodes:
-        result = mat1.diffuse_color == mat2.diffuse_color
-        if not result:
-            print(f"❌ Diffuse color mismatch: {mat1.diffuse_color} vs {mat2.diffuse_color}")
-        return result
-
-    def get_principled_bsdf(mat):
-        for node in mat.node_tree.nodes:
-            if node.type == 'BSDF_PRINCIPLED':
-                return node
+def _normal_map_image(bsdf_input):
+    """Image feeding the input through a Normal Map node"""
+    if not bsdf_input.is_linked:
         return None
-
-    bsdf1 = get_principled_bsdf(mat1)
-    bsdf2 = get_principled_bsdf(mat2)
-
-    if not bsdf1 or not bsdf2:
-        print(f"❌ Missing Principled BSDF in {mat1.name} or {mat2.name}")
-        return False
-
-    # Compare BSDF values: Base Color, Roughness, Metallic, Alpha
-    keys = ["Base Color", "Roughness", "Metallic", "Alpha"]
-    for key in keys:
-        input1 = bsdf1.inputs.get(key)
-        input2 = bsdf2.inputs.get(key)
-        if input1 and input2 and not input1.is_linked and not input2.is_linked:
-            val1 = input1.default_value
-            val2 = input2.default_value
-            if isinstance(val1, (float, int)):
-                if abs(val1 - val2) > 1e-5:
-                    print(f"❌ {mat1.name} vs {mat2.name}: {key} mismatch: {val1} vs {val2}")
-                    return False
-            elif isinstance(val1, (list, tuple)):
-                if any(abs(a - b) > 1e-5 for a, b in zip(val1, val2)):
-                    print(f"❌ {mat1.name} vs {mat2.name}: {key} mismatch: {val1} vs {val2}")
-                    return False
-
-    # Compare Base Color texture image (if linked)
-    def get_texture_name(bsdf_input):
-        if bsdf_input.is_linked:
-            from_node = bsdf_input.links[0].from_node
-            if from_node.type == 'TEX_IMAGE' and from_node.image:
-                return from_node.image.name.split('.')[0]
+    from_node = bsdf_input.links[0].from_node
+    if from_node.type == 'NORMAL_MAP' and from_node.inputs["Color"].is_linked:
+        tex_node = from_node.inputs["Color"].links[0].from_node
+        if tex_node.type == 'TEX_IMAGE' and tex_node.image:
+            return tex_node.image
+    return None
+
+def _linked_source(bsdf_input):
+    """(output socket, image output socket, image) feeding a linked input, through a Separate Color node"""
+    link = bsdf_input.links[0]
+    from_node = link.from_node
+    channel = link.from_socket.name
+    if from_node.type in ('SEPARATE_COLOR', 'SEPRGB') and from_node.inputs[0].is_linked:
+        upstream = from_node.inputs[0].links[0]
+        from_node = upstream.from_node
+        return channel, upstream.from_socket.name, from_node.image if from_node.type == 'TEX_IMAGE' else None
+    if from_node.type == 'TEX_IMAGE':
+        return None, channel, from_node.image
+    return channel, None, None
+
+def material_fingerprint(mat):
+    """
+    Hashable key that is equal for duplicate materials, or None if the material is never merged.
+
+    Covers the unlinked BSDF values (snapped to VALUE_TOLERANCE), the images
+    feeding linked values (with the channel used, e.g. packed ORM maps), the
+    Base Color image and the normal map image. Images compare by identity,
+    so run dedup_images first to make identical pixels one image.
+    """
+    if not mat.use_nodes:
+        return ('flat', _quantize(mat.diffuse_color))
+    if not mat.node_tree:
         return None
-
-    tex1 = get_texture_name(bsdf1.inputs["Base Color"])
-    tex2 = get_texture_name(bsdf2.inputs["Base Color"])
-    if tex1 != tex2:
-        print(f"❌ {mat1.name} vs {mat2.name}: Base Color texture mismatch: {tex1} vs {tex2}")
-        return False
-
-    # Compare Normal Map images (if connected)
-    def get_normal_map_image(bsdf_input):
-        if not bsdf_input.is_linked:
-            return None
-        from_node = bsdf_input.links[0].from_node
-        if from_node.type == 'NORMAL_MAP' and from_node.inputs["Color"].is_linked:
-            tex_node = from_node.inputs["Color"].links[0].from_node
-            if tex_node.type == 'TEX_IMAGE' and tex_node.image:
-                return tex_node.image.name.split('.')[0]
+    bsdf = next((node for node in mat.node_tree.nodes if node.type == 'BSDF_PRINCIPLED'), None)
+    if bsdf is None:
         return None
 
-    norm1 = get_normal_map_image(bsdf1.inputs["Normal"])
-    norm2 = get_normal_map_image(bsdf2.inputs["Normal"])
-    if norm1 != norm2:
-        print(f"❌ {mat1.name} vs {mat2.name}: Normal Map mismatch: {norm1} vs {norm2}")
-        return False
+    values = []
+    for key in BSDF_KEYS:
+        bsdf_input = bsdf.inputs.get(key)
+        if bsdf_input is None:
+            values.append(None)
+        elif bsdf_input.is_linked:
+            source = _linked_source(bsdf_input)
+            values.append(('linked',) + source if source[2] is not None else 'linked')
+        else:
+            values.append(_quantize(bsdf_input.default_value))
+    return ('bsdf', tuple(values), _linked_image(bsdf.inputs["Base Color"]), _normal_map_image(bsdf.inputs["Normal"]))
+
+def materials_are_duplicates(mat1, mat2):
+    fingerprint = material_fingerprint(mat1)
+    return fingerprint is not None and fingerprint == material_fingerprint(mat2)
 
-    return True
+def remap_materials(replacements):
+    """Point every user of the replaced materials (mesh and object slots alike) at their replacement"""
+    if hasattr(bpy.data, 'batch_remap'):
+        bpy.data.batch_remap(replacements)
+    else:
+        for mat, replacement in replacements.items():
+            mat.user_remap(replacement)
 
 
 def merge_duplicate_materials():
-    materials = bpy.data.materials
-    unique = []
-    # Updated replacement mapping
-    replacements = {}
+    # Same pixels under different names become one image first, so materials compare by image identity
+    dedup_images()
+
+    # One bucketing pass instead of comparing every material with every kept one
+    buckets = {}
+    for mat in bpy.data.materials:
+        if mat.get('_synty_cached', False):
+            continue  # Batch-cached template materials aren't in the scene
+        fingerprint = material_fingerprint(mat)
+        if fingerprint is not None:
+            buckets.setdefault(fingerprint, []).append(mat)
 
-    for mat in materials:
-        for ref in unique:
-            if materials_are_duplicates(mat, ref):
-                print(f"[MERGE] Merging {mat.name} into {ref.name}")
-                replacements[mat] = ref
-                break
-        else:
-            print(f"[KEEP] Keeping {mat.name}")
-            unique.append(mat)
-
-    # Swap material slots using object reference, not name
-    for obj in bpy.data.objects:
-        if obj.type == 'MESH':
-            for i, slot in enumerate(obj.material_slots):
-                if slot.material in replacements:
-                    obj.material_slots[i].material = replacements[slot.material]
+    replacements = {}
+    for duplicates in buckets.values():
+        if len(duplicates) < 2:
+            continue
+        # Keep a material something uses, so slots don't move to a leftover import material
+        keep = next((mat for mat in duplicates if mat.users > 0), duplicates[0])
+        for mat in duplicates:
+            if mat != keep:
+                replacements[mat] = keep
+
+    if replacements:
+        print(f"[MERGE] Merging {len(replacements)} duplicate materials into "
+              f"{len(set(replacements.values()))}")
+        remap_materials(replacements)
+    return len(replacements)
 
 
 # -- File Processor --
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test alpha coverage classification (opaque, cutout or blended)
+Run with: blender --background --python test_alpha_classification.py
+"""
+
+import importlib
+import os
+import sys
+import numpy as np
+
+# Make the add-on importable as a package so its relative imports resolve
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(addon_path) not in sys.path:
+    sys.path.append(os.path.dirname(addon_path))
+addon_name = os.path.basename(addon_path)
+
+alpha = importlib.import_module(f"{addon_name}.fbx2glb.textures.alpha")
+
+SIZE = 64
+
+def from_bytes(values):
+    """Alpha as Blender reads an 8-bit image: float32 byte / 255"""
+    return (np.asarray(values, dtype=np.float32) / np.float32(255.0)).astype(np.float32)
+
+def test_opaque():
+    full = np.ones((SIZE, SIZE), dtype=np.float32)
+    near = from_bytes(np.random.default_rng(1).integers(250, 256, (SIZE, SIZE)))
+    passed = (alpha.classify_alpha(full) == alpha.ALPHA_OPAQUE and
+              alpha.classify_alpha(near) == alpha.ALPHA_OPAQUE and
+              alpha.classify_alpha(from_bytes(np.full((SIZE, SIZE), 250))) == alpha.ALPHA_OPAQUE)
+    print(f"Opaque alpha (250/255 and above): {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_cutout_with_fringe():
+    # Opaque disc on a transparent card, with a one-texel anti-aliased edge
+    y, x = np.mgrid[:SIZE, :SIZE]
+    distance = np.hypot(x - SIZE / 2, y - SIZE / 2)
+    values = np.where(distance < 20, 1.0, 0.0).astype(np.float32)
+    values[(distance >= 20) & (distance < 21)] = 0.5
+    passed = alpha.classify_alpha(values) == alpha.ALPHA_CLIP
+    print(f"Cutout with anti-aliased fringe: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_fully_transparent():
+    values = np.zeros((SIZE, SIZE), dtype=np.float32)
+    passed = (alpha.classify_alpha(values) == alpha.ALPHA_CLIP and
+              alpha.classify_alpha(from_bytes(np.full((SIZE, SIZE), 5))) == alpha.ALPHA_CLIP)
+    print(f"Fully transparent alpha: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_gradient():
+    values = np.tile(np.linspace(0.0, 1.0, SIZE, dtype=np.float32), (SIZE, 1))
+    passed = alpha.classify_alpha(values) == alpha.ALPHA_BLEND
+    print(f"Alpha gradient: {'OK' if passed else 'FAILED'}")
+    return passed
+
+if __name__ == "__main__":
+    tests = [test_opaque, test_cutout_with_fringe, test_fully_transparent, test_gradient]
+    results = [test() for test in tests]
+    sys.exit(0 if all(results) else 1)
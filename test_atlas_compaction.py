@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test palette atlas compaction (region labelling, layout, pixel copy and UV remapping)
+Run with: blender --background --python test_atlas_compaction.py
+"""
+
+import importlib
+import os
+import sys
+from collections import deque
+import numpy as np
+
+# Make the add-on importable as a package so its relative imports resolve
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(addon_path) not in sys.path:
+    sys.path.append(os.path.dirname(addon_path))
+addon_name = os.path.basename(addon_path)
+
+compaction = importlib.import_module(f"{addon_name}.fbx2glb.textures.compaction")
+
+ATLAS_SIZE = 1024
+
+def reference_labels(mask):
+    """4-connected labels by flood fill, labelled like label_regions (smallest flat index)"""
+    height, width = mask.shape
+    labels = np.full(mask.shape, mask.size, dtype=np.int64)
+    for start in range(mask.size):
+        y, x = divmod(start, width)
+        if not mask[y, x] or labels[y, x] != mask.size:
+            continue
+        queue = deque([(y, x)])
+        labels[y, x] = start
+        while queue:
+            cy, cx = queue.popleft()
+            for ny, nx in ((cy - 1, cx), (cy + 1, cx), (cy, cx - 1), (cy, cx + 1)):
+                if 0 <= ny < height and 0 <= nx < width and mask[ny, nx] and labels[ny, nx] == mask.size:
+                    labels[ny, nx] = start
+                    queue.append((ny, nx))
+    return labels
+
+def test_label_regions():
+    mask = np.array([[1, 1, 0, 0],
+                     [0, 1, 0, 1],
+                     [0, 0, 0, 1],
+                     [1, 0, 1, 1]], dtype=bool)
+    expected = np.array([[0, 0, 16, 16],
+                         [16, 0, 16, 7],
+                         [16, 16, 16, 7],
+                         [12, 16, 7, 7]])
+    passed = np.array_equal(compaction.label_regions(mask), expected)
+
+    # Random masks include long winding components that need many propagation rounds
+    rng = np.random.default_rng(7)
+    for _ in range(5):
+        mask = rng.random((24, 24)) < 0.55
+        passed = passed and np.array_equal(compaction.label_regions(mask), reference_labels(mask))
+    print(f"Region labelling: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def texel_uvs(x0, y0, x1, y1):
+    """UVs at the centres of the corner and middle texels of a texel rectangle"""
+    xs = np.array([x0, x1, x0, x1, (x0 + x1) // 2])
+    ys = np.array([y0, y0, y1, y1, (y0 + y1) // 2])
+    return np.stack([(xs + 0.5) / ATLAS_SIZE, (ys + 0.5) / ATLAS_SIZE], axis=1)
+
+def sample(pixels, uvs):
+    height, width = pixels.shape[:2]
+    x = np.floor(uvs[:, 0] * width).astype(np.int64)
+    y = np.floor(uvs[:, 1] * height).astype(np.int64)
+    return pixels[y, x]
+
+def test_compacted_atlas_samples_same_texels():
+    # Polygons sampling three separate swatches; the first two share a region
+    rects = [(10, 12, 30, 20), (24, 16, 40, 36), (900, 940, 960, 1000), (500, 100, 520, 110)]
+    polygon_uvs = [texel_uvs(*rect) for rect in rects]
+    bounds = np.array([[uvs[:, 0].min(), uvs[:, 1].min(), uvs[:, 0].max(), uvs[:, 1].max()]
+                       for uvs in polygon_uvs])
+
+    layout = compaction.AtlasLayout.build(ATLAS_SIZE, ATLAS_SIZE, bounds)
+    if layout is None:
+        print("Compacted atlas sampling: FAILED (no layout)")
+        return False
+
+    rng = np.random.default_rng(3)
+    pixels = rng.random((ATLAS_SIZE, ATLAS_SIZE, 4), dtype=np.float32)
+    compacted = layout.compact_pixels(pixels)
+
+    uvs = np.concatenate(polygon_uvs)
+    regions = np.repeat(layout.polygon_regions, [len(polygon) for polygon in polygon_uvs])
+    remapped = layout.remap_uvs(uvs, regions)
+
+    passed = (compacted.shape[:2] == (layout.size[1], layout.size[0]) and
+              layout.size[0] * layout.size[1] < ATLAS_SIZE * ATLAS_SIZE and
+              len(layout.source_rects) == 3 and
+              layout.polygon_regions[0] == layout.polygon_regions[1] and
+              np.all((remapped >= 0.0) & (remapped <= 1.0)) and
+              np.array_equal(sample(compacted, remapped), sample(pixels, uvs)))
+    print(f"Compacted atlas sampling: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_no_layout_when_most_of_the_atlas_is_used():
+    bounds = np.array([[0.0, 0.0, 0.9, 0.9]])
+    passed = compaction.AtlasLayout.build(ATLAS_SIZE, ATLAS_SIZE, bounds) is None
+    print(f"No compaction for a mostly used atlas: {'OK' if passed else 'FAILED'}")
+    return passed
+
+if __name__ == "__main__":
+    tests = [test_label_regions, test_compacted_atlas_samples_same_texels,
+             test_no_layout_when_most_of_the_atlas_is_used]
+    results = [test() for test in tests]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test the streaming ASCII -> binary FBX converter, including its chunked tokenizer
+Run with: blender --background --python test_fbx_ascii_converter.py
+"""
+
+import base64
+import importlib
+import io
+import os
+import sys
+import tempfile
+
+# Make the add-on importable as a package so its relative imports resolve
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(addon_path) not in sys.path:
+    sys.path.append(os.path.dirname(addon_path))
+addon_name = os.path.basename(addon_path)
+
+converter = importlib.import_module(f"{addon_name}.utils.fbx_ascii_converter")
+fbx_reader = importlib.import_module(f"{addon_name}.utils.fbx_reader")
+
+# Chunk sizes small enough to split keys, strings, numbers and arrays mid-token
+CHUNK_SIZES = (1, 2, 3, 7, 16, 61, 4096)
+
+CUBE_VERTICES = ",".join(f"{v:.6e}" if corner % 2 else f"{v:g}"
+                         for corner in range(8) for v in ((corner >> 2) & 1, (corner >> 1) & 1, -0.5 * (corner & 1)))
+CUBE_INDICES = "0,1,3,-3,4,6,7,-6,0,4,5,-2,2,3,7,-7,0,2,6,-5,1,5,7,-4"
+CONTENT = base64.b64encode(b'\x89PNG' + bytes(range(60))).decode('ascii')
+
+ASCII_FBX = f'''; FBX 7.4.0 project file
+; ----------------------------------------------------
+FBXHeaderExtension:  {{
+	FBXHeaderVersion: 1003
+	FBXVersion: 7400
+	Creator: "Test &quot;exporter&quot;"
+}}
+GlobalSettings:  {{
+	Version: 1000
+	Properties70:  {{
+		P: "UpAxis", "int", "Integer", "",1
+		P: "UpAxisSign", "int", "Integer", "",1
+		P: "UnitScaleFactor", "double", "Number", "",2.54
+		P: "TimeSpanStop", "KTime", "Time", "",46186158000
+	}}
+}}
+Objects:  {{
+	Geometry: 100, "Geometry::Cube", "Mesh" {{
+		Vertices: *24 {{
+			a: {CUBE_VERTICES}
+		}}
+		PolygonVertexIndex: *24 {{
+			a: {CUBE_INDICES}
+		}}
+		Edges: *0 {{
+		}}
+	}}
+	Model: 200, "Model::Hips", "LimbNode" {{
+		Properties70:  {{
+			P: "Lcl Translation", "Lcl Translation", "", "A",0,1.5e-3,-2
+		}}
+		Shading: Y
+	}}
+	Texture: 300, "Texture::Palette", "" {{
+		FileName: "C:\\Textures\\Palette.png"
+		RelativeFilename: "..\\Textures\\Palette.png"
+	}}
+	Video: 301, "Video::Palette", "Clip" {{
+		RelativeFilename: "Palette.png"
+		Content: ,
+			"{CONTENT}"
+	}}
+	AnimationCurve: 400, "AnimCurve::", "" {{
+		KeyTime: *2 {{
+			a: 0,46186158000
+		}}
+		KeyValueFloat: *2 {{
+			a: 0.25,-1
+		}}
+	}}
+}}
+Connections:  {{
+	;Model::Hips, Model::RootNode
+	C: "OO",200,0
+}}
+Takes:  {{
+	Current: "Take 001"
+	Take: "Take 001" {{
+		LocalTime: 0,46186158000
+	}}
+}}
+'''.encode('ascii')
+
+def tokens(data, chunk_size):
+    previous = converter.READ_CHUNK_SIZE
+    converter.READ_CHUNK_SIZE = chunk_size
+    try:
+        tokenizer = converter._Tokenizer(io.BytesIO(data))
+        result = []
+        while True:
+            token = tokenizer.next_token()
+            if token is None:
+                return result
+            result.append(token)
+    finally:
+        converter.READ_CHUNK_SIZE = previous
+
+def convert(folder, chunk_size):
+    source = os.path.join(folder, "cube_ascii.fbx")
+    if not os.path.exists(source):
+        with open(source, 'wb') as f:
+            f.write(ASCII_FBX)
+    output = os.path.join(folder, f"cube_{chunk_size}.fbx")
+    previous = converter.READ_CHUNK_SIZE
+    converter.READ_CHUNK_SIZE = chunk_size
+    try:
+        converter.convert_ascii_fbx(source, output)
+    finally:
+        converter.READ_CHUNK_SIZE = previous
+    with open(output, 'rb') as f:
+        return output, f.read()
+
+def test_tokens_independent_of_chunk_size():
+    expected = tokens(ASCII_FBX, len(ASCII_FBX) + 1)
+    passed = all(tokens(ASCII_FBX, size) == expected for size in CHUNK_SIZES)
+    passed = passed and ('number', b'1.5e-3') in expected and ('string', b'Geometry::Cube') in expected
+    print(f"Tokenizer output independent of chunk size: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_conversion_independent_of_chunk_size():
+    folder = tempfile.mkdtemp()
+    _, expected = convert(folder, len(ASCII_FBX) + 1)
+    mismatched = [size for size in CHUNK_SIZES if convert(folder, size)[1] != expected]
+    passed = not mismatched
+    print(f"Converted bytes independent of chunk size: {'OK' if passed else f'FAILED (sizes {mismatched})'}")
+    return passed
+
+def test_converted_file_reads_back():
+    path, _ = convert(tempfile.mkdtemp(), 3)
+    metadata = fbx_reader.read_fbx_metadata(path)
+    passed = (metadata.fbx_version == converter.OUTPUT_FBX_VERSION and
+              metadata.vertex_count == 8 and metadata.polygon_count == 6 and metadata.mesh_count == 1 and
+              metadata.bone_count == 1 and metadata.animation_curve_count == 1 and metadata.take_count == 1 and
+              metadata.texture_files == ['Palette.png'] and
+              metadata.embedded_media == {'Palette.png': 64} and
+              metadata.unit_scale_factor == 2.54 and metadata.axis_settings == {'UpAxis': 1, 'UpAxisSign': 1})
+
+    with fbx_reader.FBXBinaryReader(path) as reader:
+        objects = next(record for record in reader.iter_top_level() if record.name == 'Objects')
+        geometry = reader.find_child(objects, 'Geometry')
+        name = reader.read_properties(geometry, limit=2)[1]
+        vertices = reader.decode_array(reader.read_properties(reader.find_child(geometry, 'Vertices'))[0])
+        curve = [child for child in reader.iter_children(objects) if child.name == 'AnimationCurve'][0]
+        key_time = reader.read_properties(reader.find_child(curve, 'KeyTime'))[0]
+    expected_vertices = [float(value) for value in CUBE_VERTICES.split(',')]
+    passed = (passed and name == b'Cube\x00\x01Geometry' and vertices.tolist() == expected_vertices and
+              key_time.type_code == 'l')
+    print(f"Converted file reads back: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_malformed_arrays_rejected():
+    """Bad values or a wrong element count fail the conversion instead of writing truncated geometry"""
+    cases = {
+        'bad_value': ASCII_FBX.replace(CUBE_INDICES.encode(), b"0,1,3,-3,4,oops,7,-6" + CUBE_INDICES[20:].encode()),
+        'short': ASCII_FBX.replace(CUBE_INDICES.encode(), CUBE_INDICES.rsplit(',', 1)[0].encode()),
+    }
+    folder = tempfile.mkdtemp()
+    passed = True
+    for name, data in cases.items():
+        source = os.path.join(folder, f"{name}.fbx")
+        output = os.path.join(folder, f"{name}_binary.fbx")
+        with open(source, 'wb') as f:
+            f.write(data)
+        try:
+            converter.convert_ascii_fbx(source, output)
+            print(f"FAIL {name}: converted without error")
+            passed = False
+        except converter.FBXConversionError:
+            passed = passed and not os.path.exists(output)
+    print(f"Malformed arrays rejected: {'OK' if passed else 'FAILED'}")
+    return passed
+
+if __name__ == "__main__":
+    tests = [test_tokens_independent_of_chunk_size, test_conversion_independent_of_chunk_size,
+             test_converted_file_reads_back, test_malformed_arrays_rejected]
+    results = [test() for test in tests]
+    sys.exit(0 if all(results) else 1)
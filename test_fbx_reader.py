@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test the binary FBX metadata reader on FBX 7.4 (32-bit) and 7.5 (64-bit) record headers
+Run with: blender --background --python test_fbx_reader.py
+"""
+
+import importlib
+import os
+import struct
+import sys
+import tempfile
+import zlib
+import numpy as np
+
+# Make the add-on importable as a package so its relative imports resolve
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(addon_path) not in sys.path:
+    sys.path.append(os.path.dirname(addon_path))
+addon_name = os.path.basename(addon_path)
+
+fbx_reader = importlib.import_module(f"{addon_name}.utils.fbx_reader")
+
+FBX_BINARY_HEADER = b'Kaydara FBX Binary  \x00\x1a\x00'
+ARRAY_FORMATS = {'d': '<f8', 'i': '<i4'}
+
+def encode_property(type_code, value):
+    if type_code in ('S', 'R'):
+        return type_code.encode() + struct.pack('<I', len(value)) + value
+    if type_code in ARRAY_FORMATS:
+        data = np.asarray(value, dtype=ARRAY_FORMATS[type_code]).tobytes()
+        compressed = zlib.compress(data)
+        return type_code.encode() + struct.pack('<III', len(value), 1, len(compressed)) + compressed
+    fmt = {'I': '<i', 'L': '<q', 'D': '<d'}[type_code]
+    return type_code.encode() + struct.pack(fmt, value)
+
+def encode_records(records, offset, wide):
+    """Binary node records starting at a file offset; wide=True for 7.5 headers"""
+    header_format, header_size = ('<QQQ', 24) if wide else ('<III', 12)
+    out = b''
+    for name, properties, children in records:
+        properties_data = b''.join(encode_property(*prop) for prop in properties)
+        start = offset + len(out)
+        children_offset = start + header_size + 1 + len(name) + len(properties_data)
+        children_data = b''
+        if children:
+            children_data = encode_records(children, children_offset, wide) + b'\x00' * (header_size + 1)
+        end = children_offset + len(children_data)
+        out += struct.pack(header_format, end, len(properties), len(properties_data))
+        out += bytes([len(name)]) + name.encode('ascii') + properties_data + children_data
+    return out
+
+def write_fbx(path, version, records):
+    wide = version >= 7500
+    header = FBX_BINARY_HEADER + struct.pack('<I', version)
+    body = encode_records(records, len(header), wide) + b'\x00' * (25 if wide else 13)
+    with open(path, 'wb') as f:
+        f.write(header + body)
+
+def p70(name, type_name, type_code, value):
+    return ('P', [('S', name.encode()), ('S', type_name.encode()), ('S', b''), ('S', b''),
+                  (type_code, value)], [])
+
+CUBE_VERTICES = [float(v) for corner in range(8) for v in ((corner >> 2) & 1, (corner >> 1) & 1, corner & 1)]
+CUBE_FACES = [[0, 1, 3, 2], [4, 6, 7, 5], [0, 4, 5, 1], [2, 3, 7, 6], [0, 2, 6, 4], [1, 5, 7, 3]]
+CUBE_INDICES = [index if i < 3 else -index - 1 for face in CUBE_FACES for i, index in enumerate(face)]
+
+SCENE = [
+    ('FBXHeaderExtension', [], [('FBXVersion', [('I', 7400)], [])]),
+    ('GlobalSettings', [], [
+        ('Properties70', [], [
+            p70('UpAxis', 'int', 'I', 2),
+            p70('UpAxisSign', 'int', 'I', -1),
+            p70('UnitScaleFactor', 'double', 'D', 2.54),
+        ]),
+    ]),
+    ('Objects', [], [
+        ('Geometry', [('L', 100), ('S', b'Cube\x00\x01Geometry'), ('S', b'Mesh')], [
+            ('Vertices', [('d', CUBE_VERTICES)], []),
+            ('PolygonVertexIndex', [('i', CUBE_INDICES)], []),
+        ]),
+        ('Model', [('L', 200), ('S', b'Cube\x00\x01Model'), ('S', b'Mesh')], []),
+        ('Model', [('L', 201), ('S', b'Hips\x00\x01Model'), ('S', b'LimbNode')], []),
+        ('Deformer', [('L', 300), ('S', b'Skin\x00\x01Deformer'), ('S', b'Skin')], []),
+        ('Deformer', [('L', 301), ('S', b'Hips\x00\x01SubDeformer'), ('S', b'Cluster')], []),
+        ('AnimationStack', [('L', 400), ('S', b'Take 001\x00\x01AnimStack'), ('S', b'')], []),
+        ('AnimationCurve', [('L', 401), ('S', b'\x00\x01AnimCurve'), ('S', b'')], []),
+        ('Texture', [('L', 500), ('S', b'Palette\x00\x01Texture'), ('S', b'')], [
+            ('FileName', [('S', b'C:\\Textures\\Palette.png')], []),
+            ('RelativeFilename', [('S', b'..\\Textures\\Palette.png')], []),
+        ]),
+        ('Video', [('L', 501), ('S', b'Palette\x00\x01Video'), ('S', b'Clip')], [
+            ('RelativeFilename', [('S', b'Palette.png')], []),
+            ('Content', [('R', b'\x89PNG' + b'\x00' * 60)], []),
+        ]),
+    ]),
+    ('Takes', [], [('Current', [('S', b'Take 001')], []), ('Take', [('S', b'Take 001')], [])]),
+]
+
+EXPECTED = {
+    'models': 2, 'meshes': 1, 'bones': 1, 'deformers': 1, 'clusters': 1,
+    'animation_stacks': 1, 'animation_curves': 1, 'takes': 1,
+    'vertices': 8, 'polygons': 6, 'texture_files': ['Palette.png'],
+    'embedded_media': {'Palette.png': 64}, 'unit_scale_factor': 2.54,
+    'axis_settings': {'UpAxis': 2, 'UpAxisSign': -1},
+}
+
+def read_version(version, **kwargs):
+    path = os.path.join(tempfile.mkdtemp(), f"cube_{version}.fbx")
+    write_fbx(path, version, SCENE)
+    return fbx_reader.read_fbx_metadata(path, **kwargs).to_dict()
+
+def test_header_widths():
+    """The same scene reads identically with 32-bit (7.4) and 64-bit (7.5) record headers"""
+    passed = True
+    results = {}
+    for version in (7400, 7500):
+        metadata = read_version(version)
+        results[version] = metadata
+        mismatches = {key: metadata[key] for key, value in EXPECTED.items() if metadata[key] != value}
+        if metadata['fbx_version'] != version or mismatches:
+            print(f"FAIL {version}: version {metadata['fbx_version']}, mismatches {mismatches}")
+            passed = False
+    comparable = [{key: value for key, value in metadata.items() if key not in ('fbx_version', 'file_size')}
+                  for metadata in results.values()]
+    passed = passed and comparable[0] == comparable[1]
+    print(f"FBX 7.4 / 7.5 round trip: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_metadata_options():
+    without_polygons = read_version(7500, count_polygons=False)
+    settings_only = read_version(7400, include_objects=False)
+    passed = (without_polygons['polygons'] is None and without_polygons['vertices'] == 8 and
+              settings_only['meshes'] == 0 and settings_only['unit_scale_factor'] == 2.54)
+    print(f"Metadata read options: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_rejects_non_binary():
+    path = os.path.join(tempfile.mkdtemp(), "ascii.fbx")
+    with open(path, 'w') as f:
+        f.write("; FBX 7.4.0 project file\nFBXHeaderExtension:  {\n}\n")
+    try:
+        fbx_reader.read_fbx_metadata(path)
+        passed = False
+    except fbx_reader.FBXReadError:
+        passed = True
+    print(f"ASCII files rejected: {'OK' if passed else 'FAILED'}")
+    return passed
+
+if __name__ == "__main__":
+    tests = [test_header_widths, test_metadata_options, test_rejects_non_binary]
+    results = [test() for test in tests]
+    sys.exit(0 if all(results) else 1)
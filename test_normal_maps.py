@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test conversion of normal maps to two-channel (RG) normal maps
+Run with: blender --background --python test_normal_maps.py
+"""
+
+import importlib
+import os
+import sys
+import numpy as np
+
+# Make the add-on importable as a package so its relative imports resolve
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(addon_path) not in sys.path:
+    sys.path.append(os.path.dirname(addon_path))
+addon_name = os.path.basename(addon_path)
+
+normal_maps = importlib.import_module(f"{addon_name}.fbx2glb.textures.normal_maps")
+
+def encode(vector):
+    return tuple(component * 0.5 + 0.5 for component in vector)
+
+def convert(*colours, flip_green=False):
+    pixels = np.array([colours], dtype=np.float32)
+    return normal_maps.convert_normal_pixels(pixels, flip_green)[0]
+
+def reconstruct_z(rg):
+    x, y = rg[0] * 2.0 - 1.0, rg[1] * 2.0 - 1.0
+    return np.sqrt(max(0.0, 1.0 - x * x - y * y))
+
+def test_two_channel_layout():
+    vector = np.array([0.48, -0.6, 0.64])
+    result = convert(encode(vector) + (1.0,))
+    passed = (result.shape == (1, 3) and
+              np.allclose(result[0, :2], encode(vector)[:2], atol=1e-6) and
+              result[0, 2] == normal_maps.CONSTANT_BLUE and
+              abs(reconstruct_z(result[0]) - vector[2]) < 1e-5)
+    print(f"Two-channel layout and Z reconstruction: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_renormalizes():
+    # Compression and filtering leave vectors shorter than unit length
+    short = np.array([0.3, 0.0, 0.4])
+    result = convert(encode(short))
+    passed = np.allclose(result[0, :2], encode((0.6, 0.0))[:2], atol=1e-6)
+    print(f"Renormalization: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_flip_green():
+    vector = (0.0, 0.6, 0.8)
+    result = convert(encode(vector), flip_green=True)
+    passed = np.allclose(result[0, :2], encode((0.0, -0.6))[:2], atol=1e-6)
+    print(f"DirectX green flip: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_degenerate_vectors():
+    result = convert(encode((0.0, 0.0, 0.0)),  # Zero vector -> flat
+                     encode((1.0, 0.0, -1.0)))  # Points into the surface -> clamped to the horizon
+    passed = (np.allclose(result[0], (0.5, 0.5, normal_maps.CONSTANT_BLUE)) and
+              np.allclose(result[1, :2], (1.0, 0.5)))
+    print(f"Degenerate vectors: {'OK' if passed else 'FAILED'}")
+    return passed
+
+if __name__ == "__main__":
+    tests = [test_two_channel_layout, test_renormalizes, test_flip_green, test_degenerate_vectors]
+    results = [test() for test in tests]
+    sys.exit(0 if all(results) else 1)
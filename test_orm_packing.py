@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test ORM channel packing (occlusion/roughness/metallic into one image)
+Run with: blender --background --python test_orm_packing.py
+"""
+
+import importlib
+import os
+import sys
+import numpy as np
+
+# Make the add-on importable as a package so its relative imports resolve
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(addon_path) not in sys.path:
+    sys.path.append(os.path.dirname(addon_path))
+addon_name = os.path.basename(addon_path)
+
+orm = importlib.import_module(f"{addon_name}.fbx2glb.textures.orm")
+
+DEFAULTS = {'occlusion': 1.0, 'roughness': 0.5, 'metallic': 0.0}
+
+def test_channel_placement():
+    """Each map lands in its glTF channel, read from the source's first channel"""
+    occlusion = np.zeros((4, 4, 3), dtype=np.float32)
+    occlusion[..., 0] = 0.25
+    occlusion[..., 1:] = 0.9  # Only the first channel is packed
+    roughness = np.linspace(0.0, 1.0, 16, dtype=np.float32).reshape(4, 4, 1)
+    metallic = np.full((4, 4, 1), 0.75, dtype=np.float32)
+
+    packed = orm.pack_orm({'occlusion': occlusion, 'roughness': roughness, 'metallic': metallic}, DEFAULTS)
+    passed = (packed.shape == (4, 4, 3) and
+              np.allclose(packed[..., orm.ORM_CHANNELS['occlusion']], 0.25) and
+              np.allclose(packed[..., orm.ORM_CHANNELS['roughness']], roughness[..., 0]) and
+              np.allclose(packed[..., orm.ORM_CHANNELS['metallic']], 0.75))
+    print(f"ORM channel placement: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_missing_channels_use_defaults():
+    roughness = np.full((2, 2, 1), 0.3, dtype=np.float32)
+    packed = orm.pack_orm({'roughness': roughness, 'metallic': None}, DEFAULTS)
+    passed = (packed.shape == (2, 2, 3) and
+              np.allclose(packed[..., 0], DEFAULTS['occlusion']) and
+              np.allclose(packed[..., 1], 0.3) and
+              np.allclose(packed[..., 2], DEFAULTS['metallic']))
+    print(f"ORM defaults for missing maps: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_sources_resized_to_largest():
+    occlusion = np.full((2, 2, 1), 0.6, dtype=np.float32)
+    roughness = np.full((8, 4, 1), 1.5, dtype=np.float32)  # Out of range, clipped
+    packed = orm.pack_orm({'occlusion': occlusion, 'roughness': roughness}, DEFAULTS)
+    passed = (packed.shape == (8, 4, 3) and
+              np.allclose(packed[..., 0], 0.6, atol=1e-5) and
+              np.allclose(packed[..., 1], 1.0))
+    print(f"ORM sources resized to the largest: {'OK' if passed else 'FAILED'}")
+    return passed
+
+if __name__ == "__main__":
+    tests = [test_channel_placement, test_missing_channels_use_defaults, test_sources_resized_to_largest]
+    results = [test() for test in tests]
+    sys.exit(0 if all(results) else 1)
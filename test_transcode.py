@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test that transcoding keeps texture colours (no view transform applied)
+Run with: blender --background --python test_transcode.py
+"""
+
+import bpy
+import importlib
+import os
+import sys
+import tempfile
+
+# Make the add-on importable as a package so its relative imports resolve
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(addon_path) not in sys.path:
+    sys.path.append(os.path.dirname(addon_path))
+addon_name = os.path.basename(addon_path)
+
+transcode = importlib.import_module(f"{addon_name}.fbx2glb.textures.transcode")
+
+# Flat swatches, large enough that JPEG blocks inside them stay flat
+SWATCHES = [(0.8, 0.2, 0.1), (0.1, 0.6, 0.3), (0.2, 0.3, 0.9), (0.5, 0.5, 0.5)]
+SWATCH_SIZE = 32
+TOLERANCE = 4 / 255
+
+def write_swatch_image(path):
+    """PNG with the swatches side by side; pixel values are the sRGB values as stored"""
+    width = SWATCH_SIZE * len(SWATCHES)
+    image = bpy.data.images.new("Swatches", width, SWATCH_SIZE)
+    row = []
+    for colour in SWATCHES:
+        row.extend((list(colour) + [1.0]) * SWATCH_SIZE)
+    image.pixels = row * SWATCH_SIZE
+    image.filepath_raw = path
+    image.file_format = 'PNG'
+    image.save()
+    bpy.data.images.remove(image)
+
+def swatch_centres(path):
+    image = bpy.data.images.load(path, check_existing=False)
+    width = image.size[0]
+    pixels = list(image.pixels)
+    channels = image.channels
+    centres = []
+    y = SWATCH_SIZE // 2
+    for index in range(len(SWATCHES)):
+        x = index * SWATCH_SIZE + SWATCH_SIZE // 2
+        offset = (y * width + x) * channels
+        centres.append(tuple(pixels[offset:offset + 3]))
+    bpy.data.images.remove(image)
+    return centres
+
+def test_transcode_keeps_colours():
+    # A tone-mapping view transform must not leak into the transcoded file
+    view = bpy.context.scene.view_settings
+    for transform in ('AgX', 'Filmic'):
+        try:
+            view.view_transform = transform
+            break
+        except TypeError:
+            continue
+
+    folder = tempfile.mkdtemp()
+    source = os.path.join(folder, "swatches.png")
+    write_swatch_image(source)
+    passed = True
+    for file_format in transcode.TRANSCODE_FORMATS:
+        target = os.path.join(folder, "swatches" + transcode.TRANSCODE_FORMATS[file_format])
+        transcode._in_process_transcode([[source, target, file_format, 100]])
+        if not os.path.exists(target):
+            print(f"FAIL {file_format}: no output")
+            passed = False
+            continue
+        for expected, actual in zip(SWATCHES, swatch_centres(target)):
+            if any(abs(a - b) > TOLERANCE for a, b in zip(expected, actual)):
+                print(f"FAIL {file_format}: expected {expected}, got {actual}")
+                passed = False
+    print(f"Transcode colours preserved: {'OK' if passed else 'FAILED'}")
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if test_transcode_keeps_colours() else 1)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test palette sampling and the flat-polygon check used to bake vertex colours
+Run with: blender --background --python test_vertex_color_bake.py
+"""
+
+import importlib
+import os
+import sys
+import numpy as np
+
+# Make the add-on importable as a package so its relative imports resolve
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(addon_path) not in sys.path:
+    sys.path.append(os.path.dirname(addon_path))
+addon_name = os.path.basename(addon_path)
+
+vertex_colors = importlib.import_module(f"{addon_name}.fbx2glb.textures.vertex_colors")
+
+RED = (1.0, 0.0, 0.0, 1.0)
+BLUE = (0.0, 0.0, 1.0, 1.0)
+TOLERANCE = vertex_colors.DEFAULT_TOLERANCE
+
+def two_swatch_palette():
+    """8x8 palette: red left half, blue right half"""
+    pixels = np.empty((8, 8, 4), dtype=np.float32)
+    pixels[:, :4] = RED
+    pixels[:, 4:] = BLUE
+    return pixels
+
+def test_sample_nearest():
+    pixels = np.arange(4 * 4, dtype=np.float32).reshape(4, 4, 1)
+    uvs = np.array([[0.1, 0.1], [0.9, 0.1], [0.1, 0.6],
+                    [1.1, -0.9],  # Wraps to (0.1, 0.1)
+                    [1.0, 1.0]])  # Wraps to (0.0, 0.0)
+    expected = np.array([0, 3, 8, 0, 0], dtype=np.float32)
+    passed = np.array_equal(vertex_colors.sample_nearest(pixels, uvs)[:, 0], expected)
+    print(f"Nearest sampling with wrapping: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_flat_polygons():
+    pixels = two_swatch_palette()
+    polygons = [
+        [(0.05, 0.1), (0.4, 0.1), (0.2, 0.9)],              # Inside the red swatch
+        [(0.6, 0.2), (0.9, 0.2), (0.9, 0.8), (0.6, 0.8)],   # Inside the blue swatch
+        [(0.1, 0.5), (0.9, 0.5), (0.5, 0.9)],               # Spans both swatches
+    ]
+    totals = np.array([len(polygon) for polygon in polygons])
+    starts = np.cumsum(totals) - totals
+    uvs = np.array([uv for polygon in polygons for uv in polygon], dtype=np.float32)
+    flat = vertex_colors.flat_polygons(pixels, uvs, starts, totals, TOLERANCE)
+
+    # Corners on red swatches either side of a blue one: only the centroid catches it
+    striped = two_swatch_palette()
+    striped[:, 6:] = RED
+    uvs = np.array([(0.2, 0.2), (0.95, 0.2), (0.95, 0.4), (0.2, 0.4)], dtype=np.float32)
+    straddling = vertex_colors.flat_polygons(striped, uvs, np.array([0]), np.array([4]), TOLERANCE)
+
+    passed = flat.tolist() == [True, True, False] and straddling.tolist() == [False]
+    print(f"Flat polygon detection: {'OK' if passed else 'FAILED'}")
+    return passed
+
+def test_tolerance():
+    pixels = two_swatch_palette()
+    pixels[:, 2:4] = (1.0 - TOLERANCE / 2, 0.0, 0.0, 1.0)  # A shade within tolerance of red
+    uvs = np.array([(0.05, 0.1), (0.45, 0.1), (0.05, 0.9)], dtype=np.float32)
+    flat = vertex_colors.flat_polygons(pixels, uvs, np.array([0]), np.array([3]), TOLERANCE)
+    passed = bool(flat[0])
+    print(f"Flat polygon tolerance: {'OK' if passed else 'FAILED'}")
+    return passed
+
+if __name__ == "__main__":
+    tests = [test_sample_nearest, test_flat_polygons, test_tolerance]
+    results = [test() for test in tests]
+    sys.exit(0 if all(results) else 1)
@@ -36,8 +36,20 @@ def clear_scene():
 		except Exception as e:
 			print(f"[WARNING] Could not remove mesh {mesh.name}: {e}")
 
-	# Clear material data
+	# Clear material data - except materials cached for the batch, and the data they use
+	cached_materials = [material for material in bpy.data.materials if material.get('_synty_cached', False)]
+	kept_node_groups = set()
+	kept_images = set()
+	for material in cached_materials:
+		for node in material.node_tree.nodes if material.node_tree else ():
+			if node.type == 'GROUP' and node.node_tree:
+				kept_node_groups.add(node.node_tree.name)
+			elif node.type == 'TEX_IMAGE' and node.image:
+				kept_images.add(node.image.name)
+
 	for material in list(bpy.data.materials):
+		if material.get('_synty_cached', False):
+			continue
 		try:
 			bpy.data.materials.remove(material)
 		except Exception as e:
@@ -66,6 +78,8 @@ def clear_scene():
 
 	# Clear node groups
 	for node_group in list(bpy.data.node_groups):
+		if node_group.name in kept_node_groups:
+			continue
 		try:
 			bpy.data.node_groups.remove(node_group)
 		except Exception as e:
@@ -79,9 +93,9 @@ def clear_scene():
 
 		images_to_remove = []
 		for image in bpy.data.images:
-			# Skip default images and cached images
+			# Skip default images, cached images and images of cached materials
 			if (image.name not in ['Render Result', 'Viewer Node'] and
-				not image.get('_synty_cached', False)):
+				not image.get('_synty_cached', False) and image.name not in kept_images):
 				images_to_remove.append(image)
 
 		for image in images_to_remove:
@@ -95,7 +109,7 @@ def clear_scene():
 		# Fallback if texture cache not available
 		images_to_remove = []
 		for image in bpy.data.images:
-			if image.name not in ['Render Result', 'Viewer Node']:
+			if image.name not in ['Render Result', 'Viewer Node'] and image.name not in kept_images:
 				images_to_remove.append(image)
 
 		for image in images_to_remove:
@@ -0,0 +1,28 @@
+import os
+import sys
+
+# Location for derived files (converted FBX files, indexes, stores) that can
+# be regenerated at any time. Override with the SYNTY_TOOLBOX_CACHE
+# environment variable.
+CACHE_ENV_VAR = "SYNTY_TOOLBOX_CACHE"
+CACHE_DIR_NAME = "synty_toolbox"
+
+def get_cache_root() -> str:
+    """Return the root cache directory for the add-on"""
+    override = os.environ.get(CACHE_ENV_VAR)
+    if override:
+        return override
+
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, CACHE_DIR_NAME)
+
+def get_cache_dir(name: str) -> str:
+    """Return (and create) a named subdirectory of the cache root"""
+    path = os.path.join(get_cache_root(), name)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,165 @@
+import os
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Lazy file discovery: walk -> filter -> validate -> dispatch.
+#
+# Directories are scanned one at a time with os.scandir and matching files
+# are yielded as soon as their directory has been read. DiscoveryPipeline
+# runs the walk and validation on a worker thread and hands results to the
+# consumer through a bounded queue, so processing starts on the first file
+# while the walk continues and memory does not grow with library size.
+# Validators run on the worker thread and must not touch bpy.
+
+DEFAULT_QUEUE_SIZE = 64
+
+def _normalize_extensions(extensions) -> Tuple[str, ...]:
+    if isinstance(extensions, str):
+        extensions = (extensions,)
+    return tuple(ext.lower() if ext.startswith('.') else f".{ext.lower()}" for ext in extensions)
+
+def iter_folder_batches(root_folder: str, extensions, recursive: bool = True) -> Iterator[Tuple[str, List[str]]]:
+    """Yield (folder, sorted matching files) for every folder containing matches"""
+    extensions = _normalize_extensions(extensions)
+    pending = [root_folder]
+    while pending:
+        folder = pending.pop()
+        files = []
+        subfolders = []
+        try:
+            with os.scandir(folder) as iterator:
+                for entry in iterator:
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                    elif entry.name.lower().endswith(extensions):
+                        files.append(entry.path)
+        except OSError as e:
+            print(f"[WARNING] Cannot scan folder {folder}: {e}")
+            continue
+
+        if files:
+            yield folder, sorted(files)
+        if recursive:
+            # Reversed so folders are visited in sorted order
+            pending.extend(sorted(subfolders, reverse=True))
+
+def iter_files(root_folder: str, extensions, recursive: bool = True) -> Iterator[str]:
+    """Yield matching files one at a time"""
+    for _, files in iter_folder_batches(root_folder, extensions, recursive):
+        yield from files
+
+class DiscoveredFile:
+    """A discovered file and its validation result"""
+    def __init__(self, path: str, is_valid: bool = True, message: str = ""):
+        self.path = path
+        self.is_valid = is_valid
+        self.message = message
+
+class _PipelineError:
+    def __init__(self, error: Exception):
+        self.error = error
+
+_DONE = object()
+
+class DiscoveryPipeline:
+    """
+    Runs a discovery source (and an optional per-item stage) on a worker thread.
+
+    Iterate the pipeline to consume results as they arrive. `discovered`
+    counts the files found so far and `walk_complete` turns True once the
+    walk has finished, so progress reports can show a growing total.
+    """
+
+    def __init__(self, source: Iterable, stage: Optional[Callable] = None,
+                 max_queue: int = DEFAULT_QUEUE_SIZE, count: Optional[Callable] = None):
+        self._source = source
+        self._stage = stage
+        self._count = count or (lambda item: 1)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.discovered = 0
+        self.walk_complete = False
+
+    def __iter__(self):
+        self._thread = threading.Thread(target=self._produce, name="sstool_discovery", daemon=True)
+        self._thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _PipelineError):
+                    raise item.error
+                yield item
+        finally:
+            self.close()
+
+    def progress(self, processed: int) -> str:
+        """Progress label such as '12/40+' while the walk is still running"""
+        return f"{processed}/{self.discovered}" + ("" if self.walk_complete else "+")
+
+    def close(self):
+        """Stop the worker (e.g. when the consumer cancels early)"""
+        self._stop_event.set()
+        # Drain so a producer blocked on a full queue can notice the stop
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def _put(self, item) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            for item in self._source:
+                if self._stop_event.is_set():
+                    return
+                if self._stage is not None:
+                    item = self._stage(item)
+                self.discovered += self._count(item)
+                if not self._put(item):
+                    return
+        except Exception as e:
+            self._put(_PipelineError(e))
+        finally:
+            self.walk_complete = True
+            self._put(_DONE)
+
+def _validated(path: str, validator: Optional[Callable[[str], Tuple[bool, str]]]) -> DiscoveredFile:
+    if validator is None:
+        return DiscoveredFile(path)
+    is_valid, message = validator(path)
+    return DiscoveredFile(path, is_valid, message)
+
+def discover_files(root_folder: str, extensions, recursive: bool = True,
+                   validator: Optional[Callable[[str], Tuple[bool, str]]] = None,
+                   max_queue: int = DEFAULT_QUEUE_SIZE) -> DiscoveryPipeline:
+    """Pipeline yielding a DiscoveredFile per matching file"""
+    return DiscoveryPipeline(iter_files(root_folder, extensions, recursive),
+                             stage=lambda path: _validated(path, validator),
+                             max_queue=max_queue)
+
+def discover_folders(root_folder: str, extensions, recursive: bool = True,
+                     validator: Optional[Callable[[str], Tuple[bool, str]]] = None,
+                     max_queue: int = DEFAULT_QUEUE_SIZE) -> DiscoveryPipeline:
+    """Pipeline yielding (folder, [DiscoveredFile, ...]) per folder with matching files"""
+    def stage(batch):
+        folder, files = batch
+        return folder, [_validated(path, validator) for path in files]
+
+    return DiscoveryPipeline(iter_folder_batches(root_folder, extensions, recursive),
+                             stage=stage, max_queue=max_queue,
+                             count=lambda batch: len(batch[1]))
@@ -0,0 +1,409 @@
+import base64
+import os
+import re
+import struct
+import warnings
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+from .cache_paths import get_cache_dir
+from .file_detection import read_fbx_header, get_fbx_version
+from .hashing import hash_file
+
+# Streaming ASCII -> binary FBX converter.
+#
+# Blender's importer only reads binary FBX. This tokenizes an ASCII FBX 7.x
+# file in fixed-size chunks and writes the equivalent binary node records
+# (FBX 7.4 layout, zlib-compressed arrays). Record sizes are patched in place
+# once each record is complete, and array values are parsed and compressed
+# chunk by chunk, so memory use stays bounded for large files.
+
+CONVERTED_FBX_CACHE = "ascii_fbx"
+CONVERTER_VERSION = 2  # Bump to invalidate previously converted files
+READ_CHUNK_SIZE = 1024 * 1024
+# Bytes that must follow a token before it is accepted (until the end of the file):
+# a chunk can end inside a number's exponent or between a key and its colon
+TOKEN_LOOKAHEAD = 64
+
+OUTPUT_FBX_VERSION = 7400
+MIN_FBX_VERSION = 7000
+FBX_BINARY_HEADER = b'Kaydara FBX Binary  \x00\x1a\x00'
+NULL_RECORD = b'\x00' * 13
+FOOTER_ID = b'\xfa\xbc\xab\x09\xd0\xc8\xd4\x66\xb1\x76\xfb\x83\x1c\xf7\x26\x7e'
+FOOTER_MAGIC = b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b'
+
+TOKEN_RE = re.compile(rb'''
+    (?:\s+|;[^\n]*)
+  | "(?P<string>[^"]*)"
+  | (?P<key>[A-Za-z_][\w|]*)[ \t]*:
+  | \*(?P<count>\d+)
+  | (?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?(?:\#[A-Za-z]+)?)
+  | (?P<word>[A-Za-z_]\w*)
+  | (?P<punct>[{},])
+''', re.VERBOSE)
+
+FLOAT_CHARS_RE = re.compile(rb'[.eE#]')
+
+# Array element types, keyed by record name (as written by the FBX SDK)
+ARRAY_TYPES = {
+    'Vertices': 'd', 'Normals': 'd', 'NormalsW': 'd', 'Binormals': 'd', 'BinormalsW': 'd',
+    'Tangents': 'd', 'TangentsW': 'd', 'UV': 'd', 'Colors': 'd', 'Weights': 'd',
+    'Transform': 'd', 'TransformLink': 'd', 'TransformAssociateModel': 'd', 'Matrix': 'd',
+    'FullWeights': 'd', 'EdgeCrease': 'd', 'VertexCrease': 'd',
+    'PolygonVertexIndex': 'i', 'Edges': 'i', 'UVIndex': 'i', 'ColorIndex': 'i',
+    'NormalsIndex': 'i', 'BinormalsIndex': 'i', 'TangentsIndex': 'i', 'Materials': 'i',
+    'Smoothing': 'i', 'Indexes': 'i', 'KeyAttrFlags': 'i', 'KeyAttrRefCount': 'i',
+    'KeyTime': 'l',
+    'KeyValueFloat': 'f', 'KeyAttrDataFloat': 'f',
+}
+ARRAY_DTYPES = {'d': np.float64, 'f': np.float32, 'i': np.int32, 'l': np.int64, 'b': np.int8}
+
+# Properties70 value types stored as integers (everything else numeric is a double)
+P70_INT_TYPES = {'int', 'Integer', 'enum', 'bool', 'Bool', 'Visibility Inheritance'}
+P70_LONG_TYPES = {'KTime', 'ULongLong'}
+
+# Scalar records whose numbers are always 64-bit (object ids and times)
+SCALAR_LONG_NAMES = {'LocalTime', 'ReferenceTime', 'RootNode', 'Node'}
+SCALAR_DOUBLE_NAMES = {'Default', 'DeformPercent', 'ModelUVTranslation', 'ModelUVScaling'}
+
+class FBXConversionError(Exception):
+    """Raised when an ASCII FBX file cannot be converted"""
+    pass
+
+class _Tokenizer:
+    """Chunked tokenizer over an ASCII FBX stream"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._buffer = b''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        data = self._stream.read(READ_CHUNK_SIZE)
+        if not data:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def next_token(self) -> Optional[Tuple[str, bytes]]:
+        while True:
+            match = TOKEN_RE.match(self._buffer, self._pos)
+            # A token near the end of the buffer may continue in the next chunk
+            if match is None or (len(self._buffer) - match.end() < TOKEN_LOOKAHEAD and not self._eof):
+                if self._fill():
+                    continue
+                if match is None:
+                    if self._pos >= len(self._buffer):
+                        return None
+                    snippet = self._buffer[self._pos:self._pos + 40]
+                    raise FBXConversionError(f"Unexpected data near {snippet!r}")
+            self._pos = match.end()
+            if match.lastgroup is not None:
+                return match.lastgroup, match.group(match.lastgroup)
+
+    def iter_array_text(self) -> Iterator[bytes]:
+        """Yield comma-separated array text up to and including the closing brace"""
+        while True:
+            end = self._buffer.find(b'}', self._pos)
+            if end >= 0:
+                yield self._buffer[self._pos:end]
+                self._pos = end + 1
+                return
+            cut = self._buffer.rfind(b',', self._pos)
+            if cut >= self._pos:
+                yield self._buffer[self._pos:cut]
+                self._pos = cut + 1
+            if not self._fill():
+                raise FBXConversionError("Unterminated array")
+
+class _OpenRecord:
+    """A node record whose header has been written but not yet patched"""
+    def __init__(self, name: str, parent: str, header_offset: int, properties_offset: int):
+        self.name = name
+        self.parent = parent
+        self.header_offset = header_offset
+        self.properties_offset = properties_offset
+        self.pending: List[Tuple[str, bytes]] = []  # Raw scalar tokens not yet written
+        self.num_properties = 0
+        self.properties_done = False
+        self.in_block = False
+        self.array_count: Optional[int] = None
+
+def _parse_float(text: bytes) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        # MSVC-style special values such as -1.#IND or 1.#INF
+        if b'#INF' in text.upper():
+            return float('-inf') if text.startswith(b'-') else float('inf')
+        return float('nan')
+
+def _encode_scalar(type_code: str, value) -> bytes:
+    if type_code == 'S' or type_code == 'R':
+        return type_code.encode() + struct.pack('<I', len(value)) + value
+    fmt = {'C': '<B', 'I': '<i', 'L': '<q', 'D': '<d'}[type_code]
+    return type_code.encode() + struct.pack(fmt, value)
+
+def _parse_array_segment(segment: bytes, parse_dtype, record_name: str) -> np.ndarray:
+    """Comma-separated numbers -> array, failing on anything that isn't a number"""
+    expected = segment.count(b',') + 1
+    try:
+        # Older NumPy only warns on bad data and returns the values parsed so far
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)
+            values = np.fromstring(segment.decode('ascii'), dtype=parse_dtype, sep=',')
+    except (ValueError, DeprecationWarning, UnicodeDecodeError) as e:
+        raise FBXConversionError(f"Invalid array data in '{record_name}': {e}")
+    if len(values) != expected:
+        raise FBXConversionError(f"Invalid array data in '{record_name}' near {segment[:40]!r}")
+    return values
+
+class ASCIIFBXConverter:
+    """Converts a single ASCII FBX 7.x file to binary"""
+
+    def __init__(self, source_path: str, output_path: str):
+        self.source_path = source_path
+        self.output_path = output_path
+        self._out = None
+        self._stack: List[_OpenRecord] = []
+
+    def convert(self):
+        """Write the binary file; the output only appears once conversion succeeded"""
+        version = get_fbx_version(read_fbx_header(self.source_path))
+        if version is not None and version < MIN_FBX_VERSION:
+            raise FBXConversionError(f"FBX {version} is too old, only FBX 7.x ASCII files can be converted")
+
+        temp_path = self.output_path + ".tmp"
+        try:
+            with open(self.source_path, 'rb') as source, open(temp_path, 'wb') as self._out:
+                self._out.write(FBX_BINARY_HEADER + struct.pack('<I', OUTPUT_FBX_VERSION))
+                self._convert_records(_Tokenizer(source))
+                self._out.write(NULL_RECORD)
+                self._write_footer()
+            os.replace(temp_path, self.output_path)
+        except (OSError, struct.error, ValueError, zlib.error) as e:
+            raise FBXConversionError(f"Conversion failed: {e}")
+        finally:
+            self._out = None
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _convert_records(self, tokenizer: _Tokenizer):
+        while True:
+            token = tokenizer.next_token()
+            if token is None:
+                break
+            kind, value = token
+            top = self._stack[-1] if self._stack else None
+
+            if kind == 'key':
+                if top is not None and not top.in_block:
+                    self._close_record()
+                self._open_record(value.decode('ascii'))
+            elif kind == 'punct':
+                if value == b'{':
+                    if top is None:
+                        raise FBXConversionError("Unexpected '{' outside a record")
+                    if top.array_count is not None:
+                        self._write_array(top, tokenizer)
+                    else:
+                        self._end_properties(top)
+                        top.in_block = True
+                elif value == b'}':
+                    if top is not None and not top.in_block:
+                        self._close_record()
+                    if not self._stack:
+                        raise FBXConversionError("Unbalanced '}'")
+                    self._close_record()
+            elif kind == 'count':
+                if top is None or top.in_block:
+                    raise FBXConversionError("Array outside a record")
+                top.array_count = int(value)
+            else:
+                if top is None or top.in_block:
+                    raise FBXConversionError(f"Value {value[:40]!r} outside a record")
+                top.pending.append((kind, value))
+
+        if self._stack and not self._stack[-1].in_block:
+            self._close_record()
+        if self._stack:
+            raise FBXConversionError(f"Unexpected end of file inside '{self._stack[-1].name}'")
+
+    def _open_record(self, name: str):
+        parent = self._stack[-1].name if self._stack else ''
+        encoded = name.encode('ascii')
+        header_offset = self._out.tell()
+        self._out.write(b'\x00' * 12 + bytes([len(encoded)]) + encoded)
+        self._stack.append(_OpenRecord(name, parent, header_offset, self._out.tell()))
+
+    def _flush_properties(self, record: _OpenRecord):
+        for type_code, value in self._type_properties(record):
+            self._out.write(_encode_scalar(type_code, value))
+            record.num_properties += 1
+        record.pending = []
+
+    def _end_properties(self, record: _OpenRecord):
+        if record.properties_done:
+            return
+        self._flush_properties(record)
+        property_list_length = self._out.tell() - record.properties_offset
+        self._patch(record.header_offset + 4, struct.pack('<II', record.num_properties, property_list_length))
+        record.properties_done = True
+
+    def _close_record(self):
+        record = self._stack.pop()
+        self._end_properties(record)
+        if record.in_block:
+            self._out.write(NULL_RECORD)
+        end_offset = self._out.tell()
+        if end_offset >= 2 ** 32:
+            raise FBXConversionError("Converted file exceeds the 4 GB FBX 7.4 limit")
+        self._patch(record.header_offset, struct.pack('<I', end_offset))
+
+    def _patch(self, offset: int, data: bytes):
+        current = self._out.tell()
+        self._out.seek(offset)
+        self._out.write(data)
+        self._out.seek(current)
+
+    def _write_array(self, record: _OpenRecord, tokenizer: _Tokenizer):
+        """Stream an '*N { a: ... }' block into a compressed array property"""
+        token = tokenizer.next_token()
+        if token == ('punct', b'}'):
+            segments = iter(())  # Empty array without an 'a:' key
+        elif token == ('key', b'a'):
+            segments = tokenizer.iter_array_text()
+        else:
+            raise FBXConversionError(f"Malformed array in '{record.name}'")
+
+        self._flush_properties(record)
+        type_code = ARRAY_TYPES.get(record.name)
+        if type_code is None:
+            # Unknown array: buffer it to infer the element type from its contents
+            segments = list(segments)
+            is_float = any(FLOAT_CHARS_RE.search(segment) for segment in segments)
+            type_code = 'd' if is_float else 'i'
+
+        dtype = ARRAY_DTYPES[type_code]
+        parse_dtype = np.float64 if type_code in ('d', 'f') else np.int64
+        compressor = zlib.compressobj()
+        header_offset = self._out.tell()
+        self._out.write(type_code.encode() + b'\x00' * 12)
+
+        length = 0
+        compressed_length = 0
+        for segment in segments:
+            if not segment.strip():
+                continue
+            values = _parse_array_segment(segment, parse_dtype, record.name).astype(dtype, copy=False)
+            length += len(values)
+            chunk = compressor.compress(values.tobytes())
+            compressed_length += len(chunk)
+            self._out.write(chunk)
+        chunk = compressor.flush()
+        compressed_length += len(chunk)
+        self._out.write(chunk)
+
+        if record.array_count is not None and length != record.array_count:
+            raise FBXConversionError(f"'{record.name}' declares {record.array_count} values but has {length}")
+        self._patch(header_offset + 1, struct.pack('<III', length, 1, compressed_length))
+        record.num_properties += 1
+        record.array_count = None
+        self._end_properties(record)
+
+    def _type_properties(self, record: _OpenRecord) -> List[Tuple[str, object]]:
+        """Assign binary property types to a record's raw ASCII values"""
+        raw = record.pending
+        if not raw:
+            return []
+
+        # Embedded media is written as one or more base64 strings
+        if record.name == 'Content' and all(kind == 'string' for kind, _ in raw):
+            return [('R', base64.b64decode(b''.join(value for _, value in raw)))]
+
+        p70_type = None
+        if record.name == 'P' and len(raw) > 1 and raw[1][0] == 'string':
+            p70_type = raw[1][1].decode('utf-8', 'replace')
+
+        typed = []
+        for index, (kind, text) in enumerate(raw):
+            if kind == 'string':
+                value = text.replace(b'&quot;', b'"')
+                # Object names are "Class::Name" in ASCII and "Name\x00\x01Class" in binary
+                if index == 1 and record.parent == 'Objects' and b'::' in value:
+                    cls, _, name = value.partition(b'::')
+                    value = name + b'\x00\x01' + cls
+                typed.append(('S', value))
+            elif kind == 'word':
+                if text.lower() in (b'nan', b'inf'):
+                    typed.append(('D', float(text)))
+                elif len(text) == 1:
+                    typed.append(('C', text[0]))
+                else:
+                    typed.append(('S', text))
+            else:
+                typed.append(self._type_number(record, index, text, p70_type))
+
+        if record.name == 'FBXVersion' and record.parent == 'FBXHeaderExtension':
+            if typed and typed[0][0] == 'I' and typed[0][1] < MIN_FBX_VERSION:
+                raise FBXConversionError(f"FBX {typed[0][1]} is too old, only FBX 7.x ASCII files can be converted")
+        return typed
+
+    def _type_number(self, record: _OpenRecord, index: int, text: bytes,
+                     p70_type: Optional[str]) -> Tuple[str, object]:
+        is_float = FLOAT_CHARS_RE.search(text) is not None
+
+        if p70_type is not None:
+            if p70_type in P70_INT_TYPES:
+                return 'I', int(_parse_float(text)) if is_float else int(text)
+            if p70_type in P70_LONG_TYPES:
+                return 'L', int(_parse_float(text)) if is_float else int(text)
+            return 'D', _parse_float(text)
+
+        is_object_id = index == 0 and (record.parent == 'Objects' or record.name == 'Document')
+        is_connection = record.name == 'C' and record.parent == 'Connections'
+        if not is_float and (is_object_id or is_connection or record.name in SCALAR_LONG_NAMES):
+            return 'L', int(text)
+
+        if is_float or record.name in SCALAR_DOUBLE_NAMES:
+            return 'D', _parse_float(text)
+
+        value = int(text)
+        return ('I', value) if -2 ** 31 <= value < 2 ** 31 else ('L', value)
+
+    def _write_footer(self):
+        # Same footer layout Blender's own FBX writer produces
+        self._out.write(FOOTER_ID)
+        self._out.write(b'\x00' * 4)
+        offset = self._out.tell()
+        padding = ((offset + 15) & ~15) - offset
+        self._out.write(b'\x00' * (padding or 16))
+        self._out.write(struct.pack('<I', OUTPUT_FBX_VERSION))
+        self._out.write(b'\x00' * 120)
+        self._out.write(FOOTER_MAGIC)
+
+def convert_ascii_fbx(source_path: str, output_path: str):
+    """Convert an ASCII FBX file to binary (raises FBXConversionError)"""
+    ASCIIFBXConverter(source_path, output_path).convert()
+
+def get_converted_fbx_path(source_path: str, content_hash: Optional[str] = None) -> str:
+    """
+    Return the path of a binary copy of an ASCII FBX file.
+
+    Converted files live in the add-on cache directory keyed by the source
+    content hash, so unchanged files are only converted once.
+    """
+    content_hash = content_hash or hash_file(source_path)
+    if content_hash is None:
+        raise FBXConversionError(f"Could not read {source_path}")
+
+    cache_dir = get_cache_dir(CONVERTED_FBX_CACHE)
+    output_name = f"{Path(source_path).stem}_{content_hash[:16]}_v{CONVERTER_VERSION}.fbx"
+    output_path = os.path.join(cache_dir, output_name)
+    if not os.path.exists(output_path):
+        convert_ascii_fbx(source_path, output_path)
+    return output_path
@@ -0,0 +1,371 @@
+import os
+import struct
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from .file_detection import FBX_BINARY_MAGIC
+
+# Streaming reader for the binary FBX node-record format.
+#
+# Every record starts with a small header (end offset, property count,
+# property list length, name). The reader walks those headers and seeks past
+# anything the caller does not ask for, so planning code can inspect a file
+# without importing it through bpy.ops.import_scene.fbx and without reading
+# the (often compressed) geometry arrays unless they are actually needed.
+
+FBX_HEADER_LENGTH = 27  # magic (23 bytes) + uint32 version
+
+# Array property type -> NumPy dtype of its decoded elements
+ARRAY_DTYPES = {
+    'f': np.dtype('<f4'),
+    'd': np.dtype('<f8'),
+    'l': np.dtype('<i8'),
+    'i': np.dtype('<i4'),
+    'b': np.dtype('<i1'),
+}
+
+# Scalar property type -> (struct format, size)
+SCALAR_FORMATS = {
+    'Y': ('<h', 2),
+    'C': ('<?', 1),
+    'I': ('<i', 4),
+    'F': ('<f', 4),
+    'D': ('<d', 8),
+    'L': ('<q', 8),
+}
+
+# GlobalSettings properties reported in the metadata
+AXIS_SETTINGS = ('UpAxis', 'UpAxisSign', 'FrontAxis', 'FrontAxisSign', 'CoordAxis', 'CoordAxisSign')
+UNIT_SETTINGS = ('UnitScaleFactor', 'OriginalUnitScaleFactor')
+
+class FBXReadError(Exception):
+    """Raised when a file is not a readable binary FBX"""
+    pass
+
+class FBXArray:
+    """Lazy reference to an array property; decoded only on request"""
+    def __init__(self, type_code: str, length: int, encoding: int, byte_length: int, offset: int):
+        self.type_code = type_code
+        self.length = length
+        self.encoding = encoding  # 0 = raw, 1 = zlib deflate
+        self.byte_length = byte_length
+        self.offset = offset
+
+class FBXBlob:
+    """Lazy reference to a raw ('R') property, e.g. embedded media content"""
+    def __init__(self, length: int, offset: int):
+        self.length = length
+        self.offset = offset
+
+class FBXRecord:
+    """Header of a single node record"""
+    def __init__(self, name: str, end_offset: int, num_properties: int,
+                 property_list_length: int, properties_offset: int):
+        self.name = name
+        self.end_offset = end_offset
+        self.num_properties = num_properties
+        self.property_list_length = property_list_length
+        self.properties_offset = properties_offset
+
+    @property
+    def children_offset(self) -> int:
+        return self.properties_offset + self.property_list_length
+
+def split_name_class(value: bytes) -> Tuple[str, str]:
+    """Split a binary FBX object name ('Name\\x00\\x01Class') into (name, class)"""
+    name, _, cls = value.partition(b'\x00\x01')
+    return name.decode('utf-8', 'replace'), cls.decode('utf-8', 'replace')
+
+class FBXBinaryReader:
+    """Record-level reader over an open binary FBX file"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        header = self._file.read(FBX_HEADER_LENGTH)
+        if len(header) < FBX_HEADER_LENGTH or not header.startswith(FBX_BINARY_MAGIC):
+            self._file.close()
+            raise FBXReadError(f"Not a binary FBX file: {file_path}")
+
+        self.version = struct.unpack('<I', header[23:27])[0]
+        # FBX 7.5+ widened the record header fields to 64 bits
+        if self.version >= 7500:
+            self._header_format, self._header_size = '<QQQ', 24
+        else:
+            self._header_format, self._header_size = '<III', 12
+        self.null_record_length = self._header_size + 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_record(self) -> Optional[FBXRecord]:
+        data = self._file.read(self._header_size + 1)
+        if len(data) < self._header_size + 1:
+            return None
+        end_offset, num_properties, property_list_length = struct.unpack(self._header_format, data[:self._header_size])
+        if end_offset == 0:
+            return None  # Null record terminating a node list
+        name_length = data[self._header_size]
+        name = self._file.read(name_length).decode('ascii', 'replace')
+        return FBXRecord(name, end_offset, num_properties, property_list_length, self._file.tell())
+
+    def iter_top_level(self) -> Iterator[FBXRecord]:
+        """Iterate the root records, skipping over their contents"""
+        self._file.seek(FBX_HEADER_LENGTH)
+        while True:
+            record = self._read_record()
+            if record is None:
+                return
+            yield record
+            self._file.seek(record.end_offset)
+
+    def iter_children(self, record: FBXRecord) -> Iterator[FBXRecord]:
+        """Iterate the direct children of a record, skipping over their contents"""
+        offset = record.children_offset
+        children_end = record.end_offset - self.null_record_length
+        while offset < children_end:
+            self._file.seek(offset)
+            child = self._read_record()
+            if child is None:
+                return
+            yield child
+            offset = child.end_offset
+
+    def find_child(self, record: FBXRecord, name: str) -> Optional[FBXRecord]:
+        for child in self.iter_children(record):
+            if child.name == name:
+                return child
+        return None
+
+    def read_properties(self, record: FBXRecord, limit: Optional[int] = None) -> List:
+        """
+        Read a record's properties.
+
+        Scalars and strings are returned as values; arrays and raw blobs are
+        returned as lazy FBXArray / FBXBlob references that are not read.
+        """
+        f = self._file
+        f.seek(record.properties_offset)
+        count = record.num_properties if limit is None else min(limit, record.num_properties)
+        values = []
+        for _ in range(count):
+            type_code = f.read(1).decode('ascii')
+            if type_code in SCALAR_FORMATS:
+                fmt, size = SCALAR_FORMATS[type_code]
+                values.append(struct.unpack(fmt, f.read(size))[0])
+            elif type_code in ARRAY_DTYPES:
+                length, encoding, byte_length = struct.unpack('<III', f.read(12))
+                values.append(FBXArray(type_code, length, encoding, byte_length, f.tell()))
+                f.seek(byte_length, os.SEEK_CUR)
+            elif type_code == 'S':
+                length = struct.unpack('<I', f.read(4))[0]
+                values.append(f.read(length))
+            elif type_code == 'R':
+                length = struct.unpack('<I', f.read(4))[0]
+                values.append(FBXBlob(length, f.tell()))
+                f.seek(length, os.SEEK_CUR)
+            else:
+                raise FBXReadError(f"Unknown property type {type_code!r} in {record.name}")
+        return values
+
+    def decode_array(self, array: FBXArray) -> np.ndarray:
+        """Read and decode an array property into a NumPy array"""
+        self._file.seek(array.offset)
+        data = self._file.read(array.byte_length)
+        if array.encoding == 1:
+            data = zlib.decompress(data)
+        return np.frombuffer(data, dtype=ARRAY_DTYPES[array.type_code], count=array.length)
+
+    def read_blob(self, blob: FBXBlob) -> bytes:
+        self._file.seek(blob.offset)
+        return self._file.read(blob.length)
+
+    def read_properties70(self, record: FBXRecord) -> Dict[str, object]:
+        """Read a Properties70 block into a name -> value mapping"""
+        properties = {}
+        for child in self.iter_children(record):
+            if child.name != 'P':
+                continue
+            values = self.read_properties(child)
+            if values and isinstance(values[0], bytes):
+                name = values[0].decode('utf-8', 'replace')
+                properties[name] = values[4] if len(values) == 5 else values[4:]
+        return properties
+
+class FBXMetadata:
+    """Planning information extracted from a binary FBX file"""
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.file_size = 0
+        self.fbx_version = None
+        self.object_counts: Dict[str, int] = {}
+        self.model_count = 0
+        self.mesh_count = 0
+        self.bone_count = 0
+        self.deformer_count = 0      # Skin deformers
+        self.cluster_count = 0       # Skin clusters (one per influencing bone)
+        self.blend_shape_count = 0
+        self.animation_stack_count = 0
+        self.animation_curve_count = 0
+        self.take_count = 0
+        self.vertex_count = 0
+        self.polygon_count: Optional[int] = None
+        self.texture_files: List[str] = []
+        self.embedded_media: Dict[str, int] = {}  # filename -> size in bytes
+        self.unit_scale_factor = 1.0
+        self.original_unit_scale_factor = 1.0
+        self.axis_settings: Dict[str, int] = {}
+
+    @property
+    def is_skinned(self) -> bool:
+        return self.deformer_count > 0 or self.cluster_count > 0
+
+    @property
+    def has_animation(self) -> bool:
+        # Takes without curves (common in static exports) carry no animation
+        return self.animation_curve_count > 0
+
+    @property
+    def is_character(self) -> bool:
+        return self.is_skinned and self.bone_count > 0
+
+    @property
+    def embedded_media_bytes(self) -> int:
+        return sum(self.embedded_media.values())
+
+    def to_dict(self) -> Dict:
+        return {
+            'fbx_version': self.fbx_version,
+            'file_size': self.file_size,
+            'object_counts': dict(self.object_counts),
+            'models': self.model_count,
+            'meshes': self.mesh_count,
+            'bones': self.bone_count,
+            'deformers': self.deformer_count,
+            'clusters': self.cluster_count,
+            'blend_shapes': self.blend_shape_count,
+            'animation_stacks': self.animation_stack_count,
+            'animation_curves': self.animation_curve_count,
+            'takes': self.take_count,
+            'vertices': self.vertex_count,
+            'polygons': self.polygon_count,
+            'texture_files': list(self.texture_files),
+            'embedded_media': dict(self.embedded_media),
+            'unit_scale_factor': self.unit_scale_factor,
+            'original_unit_scale_factor': self.original_unit_scale_factor,
+            'axis_settings': dict(self.axis_settings),
+        }
+
+def read_fbx_metadata(file_path: str, include_objects: bool = True,
+                      count_polygons: bool = True) -> FBXMetadata:
+    """
+    Extract planning metadata from a binary FBX file without importing it.
+
+    Only the records needed are read. With include_objects=False just the
+    global settings are inspected; with count_polygons=False no geometry
+    array is decompressed (vertex totals come from array headers alone).
+    Raises FBXReadError for ASCII or otherwise unreadable files.
+    """
+    metadata = FBXMetadata(file_path)
+    metadata.file_size = os.path.getsize(file_path)
+
+    with FBXBinaryReader(file_path) as reader:
+        metadata.fbx_version = reader.version
+        try:
+            for record in reader.iter_top_level():
+                if record.name == 'GlobalSettings':
+                    _read_global_settings(reader, record, metadata)
+                elif record.name == 'Objects' and include_objects:
+                    _read_objects(reader, record, metadata, count_polygons)
+                elif record.name == 'Takes' and include_objects:
+                    metadata.take_count = sum(1 for child in reader.iter_children(record) if child.name == 'Take')
+        except (struct.error, zlib.error, UnicodeDecodeError, ValueError) as e:
+            raise FBXReadError(f"Corrupt FBX record in {file_path}: {e}")
+
+    return metadata
+
+def _read_global_settings(reader: FBXBinaryReader, record: FBXRecord, metadata: FBXMetadata):
+    properties_block = reader.find_child(record, 'Properties70')
+    if properties_block is None:
+        return
+    properties = reader.read_properties70(properties_block)
+    for name in AXIS_SETTINGS:
+        if name in properties:
+            metadata.axis_settings[name] = int(properties[name])
+    if 'UnitScaleFactor' in properties:
+        metadata.unit_scale_factor = float(properties['UnitScaleFactor'])
+    if 'OriginalUnitScaleFactor' in properties:
+        metadata.original_unit_scale_factor = float(properties['OriginalUnitScaleFactor'])
+
+def _read_objects(reader: FBXBinaryReader, record: FBXRecord, metadata: FBXMetadata, count_polygons: bool):
+    counts = metadata.object_counts
+    for obj in reader.iter_children(record):
+        counts[obj.name] = counts.get(obj.name, 0) + 1
+
+        # Objects carry (id, 'Name\x00\x01Class', subclass); only read those three
+        props = reader.read_properties(obj, limit=3)
+        subclass = props[2].decode('utf-8', 'replace') if len(props) > 2 and isinstance(props[2], bytes) else ''
+
+        if obj.name == 'Model':
+            metadata.model_count += 1
+            if subclass in ('LimbNode', 'Limb', 'Root'):
+                metadata.bone_count += 1
+        elif obj.name == 'Geometry':
+            if subclass == 'Mesh':
+                metadata.mesh_count += 1
+                _read_mesh_geometry(reader, obj, metadata, count_polygons)
+            elif subclass == 'Shape':
+                metadata.blend_shape_count += 1
+        elif obj.name == 'Deformer':
+            if subclass == 'Skin':
+                metadata.deformer_count += 1
+            elif subclass == 'Cluster':
+                metadata.cluster_count += 1
+        elif obj.name == 'AnimationStack':
+            metadata.animation_stack_count += 1
+        elif obj.name == 'AnimationCurve':
+            metadata.animation_curve_count += 1
+        elif obj.name in ('Texture', 'Video'):
+            _read_texture_reference(reader, obj, metadata)
+
+def _read_mesh_geometry(reader: FBXBinaryReader, record: FBXRecord, metadata: FBXMetadata, count_polygons: bool):
+    for child in reader.iter_children(record):
+        if child.name == 'Vertices':
+            props = reader.read_properties(child, limit=1)
+            if props and isinstance(props[0], FBXArray):
+                metadata.vertex_count += props[0].length // 3
+        elif child.name == 'PolygonVertexIndex' and count_polygons:
+            props = reader.read_properties(child, limit=1)
+            if props and isinstance(props[0], FBXArray):
+                # The last index of every polygon is stored bit-inverted (negative)
+                indices = reader.decode_array(props[0])
+                metadata.polygon_count = (metadata.polygon_count or 0) + int(np.count_nonzero(indices < 0))
+
+def _read_texture_reference(reader: FBXBinaryReader, record: FBXRecord, metadata: FBXMetadata):
+    filename = None
+    content = None
+    for child in reader.iter_children(record):
+        if child.name in ('RelativeFilename', 'FileName'):
+            props = reader.read_properties(child, limit=1)
+            if props and isinstance(props[0], bytes) and props[0]:
+                # Prefer FileName but fall back to RelativeFilename
+                if filename is None or child.name == 'FileName':
+                    filename = props[0].decode('utf-8', 'replace')
+        elif child.name == 'Content':
+            props = reader.read_properties(child, limit=1)
+            if props and isinstance(props[0], FBXBlob):
+                content = props[0]
+
+    if not filename:
+        return
+    basename = os.path.basename(filename.replace('\\', '/'))
+    if record.name == 'Texture' and basename not in metadata.texture_files:
+        metadata.texture_files.append(basename)
+    if content is not None and content.length > 0:
+        metadata.embedded_media[basename] = content.length
@@ -1,17 +1,56 @@
 import os
+import re
 import bpy
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from ..utils.logging import logger
+from .image_probe import ImageHeader
+from .texture_index import texture_index
 
 # Supported texture formats
 TEXTURE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.tga', '.exr', '.hdr', '.bmp', '.tiff'}
 NORMAL_MAP_KEYWORDS = ['normal', 'nrm', 'norm', 'bump']
 DIFFUSE_KEYWORDS = ['diffuse', 'albedo', 'base', 'color', 'diff']
+OCCLUSION_KEYWORDS = ['occlusion', 'ambientocclusion']
+OCCLUSION_TOKENS = {'ao', 'occ'}
+
+# FBX header detection
+FBX_HEADER_SIZE = 512
+FBX_BINARY_MAGIC = b'Kaydara FBX Binary'
+FBX_ASCII_MAGIC = b'Kaydara FBX ASCII'
+
+def read_fbx_header(file_path: str, size: int = FBX_HEADER_SIZE) -> bytes:
+    """Read the leading bytes of an FBX file (raises OSError on failure)"""
+    with open(file_path, 'rb') as f:
+        return f.read(size)
+
+def is_binary_fbx_header(header: bytes) -> bool:
+    """Check whether an FBX header belongs to a binary file"""
+    return FBX_BINARY_MAGIC in header[:32]
+
+def is_ascii_fbx_header(header: bytes) -> bool:
+    """Check whether an FBX header belongs to an ASCII file"""
+    if FBX_ASCII_MAGIC in header:
+        return True
+    return header.strip().startswith(b';')  # Legacy ASCII FBX signature
+
+def get_fbx_version(header: bytes) -> Optional[int]:
+    """Extract the FBX version (e.g. 7400) from a binary or ASCII header"""
+    if is_binary_fbx_header(header) and len(header) >= 27:
+        return int.from_bytes(header[23:27], 'little')
+
+    # ASCII files start with a comment like "; FBX 7.4.0 project file"
+    first_line = header.lstrip().split(b'\n', 1)[0]
+    for token in first_line.split():
+        parts = token.split(b'.')
+        if len(parts) == 3 and all(p.isdigit() for p in parts):
+            return int(parts[0]) * 1000 + int(parts[1]) * 100 + int(parts[2])
+    return None
 
 class TextureInfo:
     """Information about a detected texture file"""
-    def __init__(self, path: str, texture_type: str, confidence: float = 1.0):
+    def __init__(self, path: str, texture_type: str, confidence: float = 1.0,
+                 probe: Optional[ImageHeader] = None):
         self.path = path
         self.texture_type = texture_type  # 'diffuse', 'normal', 'roughness', etc.
         self.confidence = confidence
@@ -19,9 +58,9 @@ class TextureInfo:
         self.file_size = 0
         self.is_valid = False
 
-        self._validate()
+        self._validate(probe)
 
-    def _validate(self):
+    def _validate(self, probe: Optional[ImageHeader] = None):
         """Validate the texture file"""
         try:
             if not os.path.exists(self.path):
@@ -30,11 +69,26 @@ class TextureInfo:
 
             self.file_size = os.path.getsize(self.path)
 
+            # A header probe (e.g. from the pre-flight scan) already gives us
+            # the resolution, so there is no need to load the image
+            if probe:
+                self.resolution = probe.resolution
+                self.is_valid = True
+                return
+
+            # Textures seen in earlier runs (or probed now) come from the texture index
+            record = texture_index.ensure(self.path, self.texture_type, self.confidence)
+            if record and record.has_dimensions:
+                self.resolution = (record.width, record.height)
+                self.is_valid = True
+                return
+
             # Try to load image to get resolution
             try:
                 # Load without adding to scene
                 temp_image = bpy.data.images.load(self.path, check_existing=False)
                 self.resolution = (temp_image.size[0], temp_image.size[1])
+                texture_index.update_from_image(self.path, temp_image)
                 # Remove temp image
                 bpy.data.images.remove(temp_image)
                 self.is_valid = True
@@ -49,14 +103,21 @@ class TextureDetector:
     """Advanced texture detection and validation"""
 
     @staticmethod
-    def detect_textures_in_folder(folder_path: str) -> Dict[str, List[TextureInfo]]:
-        """Detect all textures in a folder, categorized by type"""
+    def detect_textures_in_folder(folder_path: str,
+                                  probes: Optional[Dict[str, ImageHeader]] = None) -> Dict[str, List[TextureInfo]]:
+        """
+        Detect all textures in a folder, categorized by type.
+
+        If header probes are supplied (keyed by file path), textures found in
+        them are validated from the probe instead of being loaded through bpy.
+        """
         textures = {
             'diffuse': [],
             'normal': [],
             'roughness': [],
             'metallic': [],
             'emission': [],
+            'occlusion': [],
             'other': []
         }
 
@@ -76,7 +137,8 @@ class TextureDetector:
                     continue
 
                 texture_type, confidence = TextureDetector._classify_texture(filename)
-                texture_info = TextureInfo(file_path, texture_type, confidence)
+                probe = probes.get(file_path) if probes else None
+                texture_info = TextureInfo(file_path, texture_type, confidence, probe)
 
                 if texture_info.is_valid:
                     textures[texture_type].append(texture_info)
@@ -97,6 +159,11 @@ class TextureDetector:
             if keyword in name_lower:
                 return 'normal', 0.9
 
+        # Ambient occlusion ('ao' only as a separate word, e.g. Rock_AO.png)
+        tokens = set(re.split(r'[^a-z0-9]+', os.path.splitext(name_lower)[0]))
+        if any(keyword in name_lower for keyword in OCCLUSION_KEYWORDS) or tokens & OCCLUSION_TOKENS:
+            return 'occlusion', 0.8
+
         # Check for diffuse/albedo
         for keyword in DIFFUSE_KEYWORDS:
             if keyword in name_lower:
@@ -133,8 +200,12 @@ class FileValidator:
     """Validates FBX and other input files"""
 
     @staticmethod
-    def validate_fbx_file(file_path: str) -> Tuple[bool, str]:
-        """Validate an FBX file"""
+    def validate_fbx_file(file_path: str, header: Optional[bytes] = None) -> Tuple[bool, str]:
+        """
+        Validate an FBX file.
+
+        Pass an already-read header to avoid opening the file a second time.
+        """
         if not os.path.exists(file_path):
             return False, "File does not exist"
 
@@ -147,11 +218,11 @@ class FileValidator:
 
         # Check if it's ASCII FBX (which often causes issues)
         try:
-            with open(file_path, 'rb') as f:
-                header = f.read(100)
-                if b'Kaydara FBX Binary' not in header:
-                    logger.warning(f"ASCII FBX detected: {file_path}")
-                    return True, "ASCII FBX (may have import issues)"
+            if header is None:
+                header = read_fbx_header(file_path)
+            if not is_binary_fbx_header(header):
+                logger.warning(f"ASCII FBX detected: {file_path}")
+                return True, "ASCII FBX (may have import issues)"
 
         except Exception as e:
             logger.warning(f"Could not read FBX header for {file_path}: {e}")
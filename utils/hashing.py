@@ -0,0 +1,25 @@
+import hashlib
+from typing import Optional
+
+# Files are read in fixed-size chunks so hashing large FBX/texture files
+# never holds more than one chunk in memory. hashlib releases the GIL while
+# digesting, so this is safe and useful to call from worker threads.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def hash_file(file_path: str, algorithm: str = 'sha1', chunk_size: int = HASH_CHUNK_SIZE) -> Optional[str]:
+    """Return the hex digest of a file's contents, or None if it cannot be read"""
+    try:
+        digest = hashlib.new(algorithm)
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+def hash_bytes(data: bytes, algorithm: str = 'sha1') -> str:
+    """Return the hex digest of an in-memory buffer"""
+    return hashlib.new(algorithm, data).hexdigest()
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import bpy
+import numpy as np
+from typing import Dict, List, Optional
+from .texture_cache import texture_cache
+from .texture_index import texture_index
+
+# Pixel-level image deduplication.
+#
+# Images are compared by what they decode to, not by name: the same atlas
+# saved under two names is merged, and two different images that happen to
+# share a name prefix are not. Only images with the same size, channel
+# count, colour space and alpha mode are hashed at all, and the pixel hash
+# of a file-backed image is cached in the texture index under the file's
+# content hash, so unchanged files are decoded for hashing once.
+
+def _file_content_hash(image) -> Optional[str]:
+    if image.packed_file or image.source != 'FILE' or image.is_dirty or not image.filepath:
+        return None
+    return texture_index.get_content_hash(bpy.path.abspath(image.filepath))
+
+def hash_pixels(pixels: np.ndarray, width: int, height: int, channels: int, is_float: bool) -> str:
+    """Digest of decoded pixel values; 8-bit images are quantized back to bytes before hashing"""
+    digest = hashlib.sha1(f"{width}x{height}x{channels}:{int(is_float)}:".encode('ascii'))
+    if is_float:
+        digest.update(np.ascontiguousarray(pixels, dtype=np.float32).tobytes())
+    else:
+        digest.update(np.rint(np.clip(pixels, 0.0, 1.0) * 255.0).astype(np.uint8).tobytes())
+    return digest.hexdigest()
+
+def image_pixel_hash(image) -> Optional[str]:
+    """Hash of an image's decoded pixels, or None if it has no pixel data"""
+    content_hash = _file_content_hash(image)
+    if content_hash is not None:
+        cached = texture_index.get_pixel_hash(content_hash)
+        if cached is not None:
+            return cached
+
+    # Reading the size loads the image buffer; (0, 0) means it couldn't be loaded
+    width, height = image.size
+    channels = image.channels
+    if not width or not height:
+        return None
+    pixels = np.empty(width * height * channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    pixel_hash = hash_pixels(pixels, width, height, channels, image.is_float)
+    if content_hash is not None:
+        texture_index.set_pixel_hash(content_hash, pixel_hash)
+    return pixel_hash
+
+def _is_cached(image) -> bool:
+    """True if the texture cache owns an image (protected or still only in the cache)"""
+    return '_synty_cached' in image or texture_cache.is_image_cached(image.name)
+
+def _canonical(images: List) -> object:
+    """Image to keep: cached by the texture cache, then file-backed on disk, then most used"""
+    def rank(image):
+        on_disk = bool(image.filepath) and not image.packed_file and os.path.exists(bpy.path.abspath(image.filepath))
+        return (not _is_cached(image), not on_disk, -image.users, image.name)
+    return min(images, key=rank)
+
+def dedup_images(images=None) -> int:
+    """
+    Remap every user of a duplicate image to one canonical image.
+
+    Duplicates left without users are removed, except images owned by the
+    texture cache. Returns the number of images remapped.
+    """
+    candidates = {}
+    for image in images if images is not None else bpy.data.images:
+        if image.type != 'IMAGE' or image.source not in ('FILE', 'GENERATED') or image.users == 0:
+            continue
+        width, height = image.size
+        key = (width, height, image.channels, image.colorspace_settings.name, image.alpha_mode)
+        candidates.setdefault(key, []).append(image)
+
+    remapped = 0
+    for group in candidates.values():
+        if len(group) < 2:
+            continue
+        by_pixels: Dict[str, List] = {}
+        for image in group:
+            pixel_hash = image_pixel_hash(image)
+            if pixel_hash is not None:
+                by_pixels.setdefault(pixel_hash, []).append(image)
+        for duplicates in by_pixels.values():
+            if len(duplicates) < 2:
+                continue
+            canonical = _canonical(duplicates)
+            for image in duplicates:
+                if image == canonical:
+                    continue
+                print(f"[INFO] Image {image.name} duplicates {canonical.name}; remapping its users")
+                image.user_remap(canonical)
+                remapped += 1
+                if image.users == 0 and not _is_cached(image):
+                    bpy.data.images.remove(image)
+    return remapped
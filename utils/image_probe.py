@@ -0,0 +1,136 @@
+import os
+import struct
+from typing import Optional
+
+# Header-only image probing.
+#
+# Reads just enough of a texture file to learn its dimensions and channel
+# layout without decoding any pixels and without touching bpy, so it can run
+# on worker threads ahead of the Blender-bound work.
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PNG colour type -> channel count
+PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+
+# JPEG start-of-frame markers that carry image dimensions
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+class ImageHeader:
+    """Dimensions and channel layout read from an image file header"""
+    def __init__(self, file_format: str, width: int, height: int, channels: int,
+                 bit_depth: int = 8, has_alpha: bool = False):
+        self.file_format = file_format  # 'PNG', 'JPEG', 'TARGA', 'BMP'
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.bit_depth = bit_depth
+        self.has_alpha = has_alpha
+
+    @property
+    def resolution(self):
+        return (self.width, self.height)
+
+    def estimated_bytes(self) -> int:
+        """Estimate the decoded in-memory size of the image"""
+        return self.width * self.height * self.channels * max(1, self.bit_depth // 8)
+
+def _probe_png(f) -> Optional[ImageHeader]:
+    f.seek(8)
+    length, chunk_type = struct.unpack('>I4s', f.read(8))
+    if chunk_type != b'IHDR' or length < 13:
+        return None
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', f.read(10))
+    channels = PNG_CHANNELS.get(color_type)
+    if channels is None:
+        return None
+    has_alpha = color_type in (4, 6)
+
+    # Palette and grey images may still carry transparency in a tRNS chunk,
+    # which always precedes the first IDAT chunk.
+    f.seek(8 + 8 + length + 4)
+    while not has_alpha:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            break
+        length, chunk_type = struct.unpack('>I4s', chunk_header)
+        if chunk_type == b'tRNS':
+            has_alpha = True
+        elif chunk_type in (b'IDAT', b'IEND'):
+            break
+        f.seek(length + 4, os.SEEK_CUR)
+
+    if has_alpha and channels in (1, 3):
+        channels += 1
+    return ImageHeader('PNG', width, height, channels, bit_depth, has_alpha)
+
+def _probe_jpeg(f) -> Optional[ImageHeader]:
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        while marker == b'\xff':
+            marker = f.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        if marker == 0xD9:
+            return None
+        segment_length = struct.unpack('>H', f.read(2))[0]
+        if marker in JPEG_SOF_MARKERS:
+            bit_depth, height, width, components = struct.unpack('>BHHB', f.read(6))
+            return ImageHeader('JPEG', width, height, components, bit_depth, False)
+        f.seek(segment_length - 2, os.SEEK_CUR)
+
+def _probe_tga(f) -> Optional[ImageHeader]:
+    f.seek(0)
+    header = f.read(18)
+    if len(header) < 18:
+        return None
+    image_type = header[2]
+    if image_type not in (1, 2, 3, 9, 10, 11):
+        return None
+    width, height, pixel_depth, descriptor = struct.unpack('<HHBB', header[12:18])
+    alpha_bits = descriptor & 0x0F
+    if image_type in (3, 11):
+        channels = 2 if alpha_bits else 1
+    else:
+        channels = 4 if alpha_bits or pixel_depth == 32 else 3
+    return ImageHeader('TARGA', width, height, channels, 8, channels in (2, 4))
+
+def _probe_bmp(f) -> Optional[ImageHeader]:
+    f.seek(14)
+    header = f.read(16)
+    if len(header) < 16:
+        return None
+    width, height, _planes, bits_per_pixel = struct.unpack('<iiHH', header[4:16])
+    channels = 4 if bits_per_pixel == 32 else 3
+    return ImageHeader('BMP', abs(width), abs(height), channels, 8, bits_per_pixel == 32)
+
+def probe_image(file_path: str) -> Optional[ImageHeader]:
+    """
+    Read an image header without decoding pixels.
+
+    Returns None for unsupported formats or unreadable files; callers should
+    then fall back to loading the image through bpy.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            magic = f.read(8)
+            if magic.startswith(PNG_SIGNATURE):
+                return _probe_png(f)
+            if magic.startswith(b'\xff\xd8'):
+                return _probe_jpeg(f)
+            if magic.startswith(b'BM'):
+                return _probe_bmp(f)
+            if file_path.lower().endswith('.tga'):
+                return _probe_tga(f)
+    except (OSError, struct.error):
+        return None
+    return None
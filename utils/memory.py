@@ -1,4 +1,6 @@
 import bpy
+import os
+import sys
 
 def purge_unused_data():
 	"""
@@ -25,3 +27,47 @@ def purge_unused_data():
 	gc.collect()
 
 	print(f"[CLEANUP] Purged {count} unused datablocks.")
+
+
+def get_memory_usage():
+	"""
+	Returns the current resident memory of the Blender process in bytes.
+
+	Returns None when it can't be determined. On macOS this is the peak
+	resident size, as the current size isn't available without extra modules.
+	"""
+	try:
+		if sys.platform.startswith('linux'):
+			with open('/proc/self/statm') as f:
+				return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+		if sys.platform == 'win32':
+			import ctypes
+			from ctypes import wintypes
+
+			class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+				_fields_ = [
+					('cb', wintypes.DWORD),
+					('PageFaultCount', wintypes.DWORD),
+					('PeakWorkingSetSize', ctypes.c_size_t),
+					('WorkingSetSize', ctypes.c_size_t),
+					('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+					('QuotaPagedPoolUsage', ctypes.c_size_t),
+					('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+					('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+					('PagefileUsage', ctypes.c_size_t),
+					('PeakPagefileUsage', ctypes.c_size_t),
+				]
+
+			counters = PROCESS_MEMORY_COUNTERS()
+			counters.cb = ctypes.sizeof(counters)
+			process = ctypes.windll.kernel32.GetCurrentProcess()
+			if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+				return counters.WorkingSetSize
+			return None
+
+		import resource
+		return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # bytes on macOS
+	except Exception as e:
+		print(f"[WARNING] Could not read memory usage: {e}")
+		return None
@@ -1,19 +1,55 @@
 import bpy
 import os
+from collections import OrderedDict
 from typing import Dict, Optional
 from ..utils.logging import logger
+from .texture_index import texture_index
+
+# Default memory budget for cached images
+DEFAULT_BUDGET_BYTES = 2048 * 1024 * 1024
+
+def estimate_image_bytes(image) -> int:
+    """Estimate the decoded size of a loaded image (width x height x channels x depth)"""
+    try:
+        width, height = image.size
+        channels = image.channels or 4
+        bytes_per_channel = 4 if image.is_float else 1
+        return width * height * channels * bytes_per_channel
+    except Exception:
+        return 0
 
 class TextureCache:
-    """Cache system for loaded textures to improve performance"""
+    """
+    Cache system for loaded textures to improve performance.
+
+    Images are kept in least-recently-used order and evicted once their
+    estimated decoded size exceeds the byte budget, so the cache can stay
+    warm across folders without growing without bound. Entries are keyed by
+    content hash (from the texture index), so an atlas copied into many
+    folders is loaded once.
+    """
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance.cache = {}
+            cls._instance.cache = OrderedDict()  # content hash (or path) -> image, least recently used first
+            cls._instance.path_keys = {}  # normalized path -> ((size, mtime), cache key)
             cls._instance.usage_count = {}
+            cls._instance.image_sizes = {}  # cache key -> estimated bytes
+            cls._instance.name_index = {}  # image name -> cache key
+            cls._instance.budget_bytes = DEFAULT_BUDGET_BYTES
+            cls._instance.cached_bytes = 0
+            cls._instance.hits = 0
+            cls._instance.misses = 0
+            cls._instance.evictions = 0
         return cls._instance
 
+    def set_budget(self, budget_bytes: int):
+        """Set the memory budget and evict down to it if needed"""
+        self.budget_bytes = max(0, int(budget_bytes))
+        self._evict_to_budget()
+
     def get_texture(self, texture_path: str) -> Optional[bpy.types.Image]:
         """Get texture from cache or load if not cached"""
         if not os.path.exists(texture_path):
@@ -22,66 +58,135 @@ class TextureCache:
 
         # Normalize path for consistent caching
         normalized_path = os.path.normpath(texture_path)
+        key = self._cache_key(normalized_path)
 
-        if normalized_path in self.cache:
+        if key in self.cache:
             # Check if the cached image is still valid
-            cached_image = self.cache[normalized_path]
+            cached_image = self.cache[key]
             if cached_image and cached_image.name in bpy.data.images:
-                self.usage_count[normalized_path] = self.usage_count.get(normalized_path, 0) + 1
+                self.cache.move_to_end(key)
+                self.usage_count[key] = self.usage_count.get(key, 0) + 1
+                self.hits += 1
                 logger.debug(f"Using cached texture: {texture_path}")
                 return cached_image
             else:
                 # Remove invalid cache entry
-                del self.cache[normalized_path]
-                if normalized_path in self.usage_count:
-                    del self.usage_count[normalized_path]
+                self._forget(key)
 
         # Load new texture
+        self.misses += 1
         try:
             image = bpy.data.images.load(texture_path, check_existing=True)
-            self.cache[normalized_path] = image
-            self.usage_count[normalized_path] = 1
+            self.cache[key] = image
+            self.usage_count[key] = 1
+            self.image_sizes[key] = estimate_image_bytes(image)
+            self.cached_bytes += self.image_sizes[key]
+            self.name_index[image.name] = key
+            texture_index.update_from_image(normalized_path, image)
             logger.debug(f"Loaded and cached texture: {texture_path}")
+            self._evict_to_budget()
             return image
         except Exception as e:
             logger.error(f"Failed to load texture {texture_path}: {e}")
             return None
 
+    def _cache_key(self, normalized_path: str) -> str:
+        """Content hash of a texture file, falling back to its path"""
+        try:
+            stat = os.stat(normalized_path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            return normalized_path
+        cached = self.path_keys.get(normalized_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        key = texture_index.get_content_hash(normalized_path) or normalized_path
+        self.path_keys[normalized_path] = (signature, key)
+        return key
+
+    def _forget(self, key: str):
+        """Drop a cache entry and its bookkeeping, returning the image"""
+        image = self.cache.pop(key, None)
+        self.usage_count.pop(key, None)
+        self.cached_bytes -= self.image_sizes.pop(key, 0)
+        try:
+            if image is not None and self.name_index.get(image.name) == key:
+                del self.name_index[image.name]
+                return image
+        except ReferenceError:
+            pass  # Image was already removed from bpy.data
+        for name, indexed_key in list(self.name_index.items()):
+            if indexed_key == key:
+                del self.name_index[name]
+                break
+        return image
+
+    def _evict_to_budget(self):
+        """Evict least recently used images until the cache fits its budget"""
+        # The most recently used image always stays, even if it alone is over budget
+        while self.cached_bytes > self.budget_bytes and len(self.cache) > 1:
+            key = next(iter(self.cache))
+            image = self._forget(key)
+            self.evictions += 1
+            try:
+                if image and image.name in bpy.data.images:
+                    # Unprotect so the next scene clear frees it; free now if nothing uses it
+                    if '_synty_cached' in image:
+                        del image['_synty_cached']
+                    if image.users == 0:
+                        bpy.data.images.remove(image)
+            except ReferenceError:
+                pass
+            logger.debug(f"Evicted texture from cache: {key}")
+
     def clear_cache(self):
         """Clear the texture cache"""
         logger.info(f"Clearing texture cache ({len(self.cache)} items)")
         self.cache.clear()
         self.usage_count.clear()
+        self.path_keys.clear()
+        self.image_sizes.clear()
+        self.name_index.clear()
+        self.cached_bytes = 0
 
     def get_cache_stats(self) -> Dict[str, int]:
         """Get cache statistics"""
         return {
             'cached_textures': len(self.cache),
             'total_usage': sum(self.usage_count.values()),
-            'cache_hits': sum(count - 1 for count in self.usage_count.values() if count > 1)
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+            'evictions': self.evictions,
+            'cached_bytes': self.cached_bytes,
+            'budget_bytes': self.budget_bytes,
         }
 
     def cleanup_unused(self):
         """Remove unused textures from cache"""
         to_remove = []
-        for path, image in self.cache.items():
+        for key, image in self.cache.items():
             if not image or image.name not in bpy.data.images:
-                to_remove.append(path)
+                to_remove.append(key)
 
-        for path in to_remove:
-            del self.cache[path]
-            if path in self.usage_count:
-                del self.usage_count[path]
+        for key in to_remove:
+            self._forget(key)
 
         if to_remove:
             print(f"[INFO] Cleaned up {len(to_remove)} unused textures from cache")
 
     def is_image_cached(self, image_name: str) -> bool:
         """Check if an image is in the cache by name"""
-        for cached_image in self.cache.values():
-            if cached_image and cached_image.name == image_name:
-                return True
-        return False
+        key = self.name_index.get(image_name)
+        if key is None:
+            return False
+        cached_image = self.cache.get(key)
+        # Images can be renamed after loading; drop the stale name
+        if cached_image is None or cached_image.name != image_name:
+            del self.name_index[image_name]
+            if cached_image is not None:
+                self.name_index[cached_image.name] = key
+            return False
+        return True
 
     def protect_cached_images(self):
         """Mark cached images to prevent them from being cleared"""
@@ -96,4 +201,4 @@ class TextureCache:
             print(f"[DEBUG] Protected {len(protected_images)} cached images from clearing")
 
 # Singleton instance
-texture_cache = TextureCache()
\ No newline at end of file
+texture_cache = TextureCache()
@@ -0,0 +1,260 @@
+import os
+import sqlite3
+import threading
+from typing import Optional
+from .cache_paths import get_cache_dir
+from .hashing import hash_file
+from .image_probe import ImageHeader, probe_image
+from ..utils.logging import logger
+
+# Persistent cross-session texture index.
+#
+# Synty packs ship the same atlas in many folders and many packs. The index
+# maps a texture's content hash to what we know about it (canonical path,
+# dimensions, format, alpha, detected type), and every path ever seen to its
+# content hash keyed by size and mtime. A warm run therefore only stats a
+# texture: it is neither re-hashed nor re-probed nor loaded for validation.
+# Hashes of the decoded pixels (for image deduplication) are kept per
+# content hash as well.
+# Safe to use from worker threads; all access goes through one lock.
+
+TEXTURE_INDEX_FILE = "texture_index.sqlite"
+TEXTURE_INDEX_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS textures (
+    content_hash TEXT PRIMARY KEY,
+    canonical_path TEXT NOT NULL,
+    file_format TEXT,
+    width INTEGER,
+    height INTEGER,
+    channels INTEGER,
+    bit_depth INTEGER,
+    has_alpha INTEGER,
+    alpha_mode TEXT,
+    texture_type TEXT,
+    confidence REAL
+);
+CREATE TABLE IF NOT EXISTS paths (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pixel_hashes (
+    content_hash TEXT PRIMARY KEY,
+    pixel_hash TEXT NOT NULL
+);
+"""
+
+class TextureRecord:
+    """Everything the index knows about one texture content hash"""
+    def __init__(self, content_hash: str, canonical_path: str, file_format: Optional[str] = None,
+                 width: Optional[int] = None, height: Optional[int] = None, channels: Optional[int] = None,
+                 bit_depth: Optional[int] = None, has_alpha: Optional[bool] = None,
+                 alpha_mode: Optional[str] = None, texture_type: Optional[str] = None,
+                 confidence: Optional[float] = None):
+        self.content_hash = content_hash
+        self.canonical_path = canonical_path
+        self.file_format = file_format
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.bit_depth = bit_depth
+        self.has_alpha = None if has_alpha is None else bool(has_alpha)
+        self.alpha_mode = alpha_mode  # Filled in once the pixels have been inspected
+        self.texture_type = texture_type
+        self.confidence = confidence
+
+    @property
+    def has_dimensions(self) -> bool:
+        return bool(self.width and self.height)
+
+    def to_header(self) -> Optional[ImageHeader]:
+        """The record as an image header, or None if dimensions are unknown"""
+        if not self.has_dimensions:
+            return None
+        return ImageHeader(self.file_format or '', self.width, self.height,
+                           self.channels or 4, self.bit_depth or 8, bool(self.has_alpha))
+
+class TextureIndex:
+    """SQLite-backed content hash -> texture info index"""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._connection = None
+            cls._instance._db_path = None
+            cls._instance._lock = threading.RLock()
+        return cls._instance
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        db_path = os.path.join(get_cache_dir("textures"), TEXTURE_INDEX_FILE)
+        if self._connection is not None and self._db_path == db_path:
+            return self._connection
+        self.close()
+        try:
+            connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, TEXTURE_INDEX_VERSION):
+                connection.executescript("DROP TABLE IF EXISTS textures; DROP TABLE IF EXISTS paths; "
+                                         "DROP TABLE IF EXISTS pixel_hashes;")
+            connection.executescript(_SCHEMA)
+            connection.execute(f"PRAGMA user_version = {TEXTURE_INDEX_VERSION}")
+        except sqlite3.Error as e:
+            logger.warning(f"Texture index unavailable: {e}", "TEXTURES")
+            return None
+        self._connection = connection
+        self._db_path = db_path
+        return connection
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get_content_hash(self, file_path: str) -> Optional[str]:
+        """Content hash of a file, re-hashing only if its size or mtime changed"""
+        path = os.path.normpath(os.path.abspath(file_path))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            connection = self._connect()
+            if connection is not None:
+                row = connection.execute("SELECT size, mtime_ns, content_hash FROM paths WHERE path = ?",
+                                         (path,)).fetchone()
+                if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+                    return row[2]
+
+        content_hash = hash_file(path)
+        if content_hash is None:
+            return None
+        with self._lock:
+            connection = self._connect()
+            if connection is not None:
+                try:
+                    connection.execute("INSERT OR REPLACE INTO paths VALUES (?, ?, ?, ?)",
+                                       (path, stat.st_size, stat.st_mtime_ns, content_hash))
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not update texture index: {e}", "TEXTURES")
+        return content_hash
+
+    def find(self, content_hash: str) -> Optional[TextureRecord]:
+        """Look up a texture by content hash"""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return None
+            row = connection.execute("SELECT * FROM textures WHERE content_hash = ?", (content_hash,)).fetchone()
+        return TextureRecord(*row) if row else None
+
+    def lookup(self, file_path: str) -> Optional[TextureRecord]:
+        """Look up the record for a file on disk, without probing it"""
+        content_hash = self.get_content_hash(file_path)
+        return self.find(content_hash) if content_hash else None
+
+    def store(self, record: TextureRecord):
+        """Insert or update a record (the first path seen stays canonical if it still exists)"""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            existing = connection.execute("SELECT canonical_path FROM textures WHERE content_hash = ?",
+                                          (record.content_hash,)).fetchone()
+            if existing and os.path.exists(existing[0]):
+                record.canonical_path = existing[0]
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO textures VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (record.content_hash, record.canonical_path, record.file_format, record.width,
+                     record.height, record.channels, record.bit_depth,
+                     None if record.has_alpha is None else int(record.has_alpha),
+                     record.alpha_mode, record.texture_type, record.confidence))
+            except sqlite3.Error as e:
+                logger.warning(f"Could not update texture index: {e}", "TEXTURES")
+
+    def ensure(self, file_path: str, texture_type: Optional[str] = None,
+               confidence: Optional[float] = None) -> Optional[TextureRecord]:
+        """
+        Return the record for a file, probing its header on first sight.
+
+        Probing reads the image header only. Formats the header probe does
+        not understand get a record without dimensions, which is completed
+        by update_from_image once Blender has loaded the image.
+        """
+        content_hash = self.get_content_hash(file_path)
+        if content_hash is None:
+            return None
+        record = self.find(content_hash)
+        if record is not None:
+            if texture_type and record.texture_type is None:
+                record.texture_type, record.confidence = texture_type, confidence
+                self.store(record)
+            return record
+
+        header = probe_image(file_path)
+        record = TextureRecord(content_hash, os.path.normpath(os.path.abspath(file_path)),
+                               texture_type=texture_type, confidence=confidence)
+        if header is not None:
+            record.file_format = header.file_format
+            record.width, record.height = header.width, header.height
+            record.channels, record.bit_depth = header.channels, header.bit_depth
+            record.has_alpha = header.has_alpha
+        self.store(record)
+        return record
+
+    def probe(self, file_path: str) -> Optional[ImageHeader]:
+        """Header for a texture file, from the index when it has been seen before"""
+        record = self.ensure(file_path)
+        return record.to_header() if record else None
+
+    def update_from_image(self, file_path: str, image):
+        """Fill in dimensions for a record from an image loaded through bpy"""
+        record = self.ensure(file_path)
+        if record is None or record.has_dimensions:
+            return
+        try:
+            record.width, record.height = image.size
+            record.channels = image.channels
+            record.bit_depth = 32 if image.is_float else 8
+            record.file_format = record.file_format or image.file_format
+            record.has_alpha = record.channels in (2, 4)
+        except Exception:
+            return
+        self.store(record)
+
+    def set_alpha_mode(self, content_hash: str, alpha_mode: str):
+        """Record how a texture's alpha channel is actually used"""
+        with self._lock:
+            connection = self._connect()
+            if connection is not None:
+                connection.execute("UPDATE textures SET alpha_mode = ? WHERE content_hash = ?",
+                                   (alpha_mode, content_hash))
+
+    def get_pixel_hash(self, content_hash: str) -> Optional[str]:
+        """Decoded-pixel hash recorded for a file content hash"""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return None
+            row = connection.execute("SELECT pixel_hash FROM pixel_hashes WHERE content_hash = ?",
+                                     (content_hash,)).fetchone()
+        return row[0] if row else None
+
+    def set_pixel_hash(self, content_hash: str, pixel_hash: str):
+        with self._lock:
+            connection = self._connect()
+            if connection is not None:
+                try:
+                    connection.execute("INSERT OR REPLACE INTO pixel_hashes VALUES (?, ?)",
+                                       (content_hash, pixel_hash))
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not update texture index: {e}", "TEXTURES")
+
+# Global texture index instance
+texture_index = TextureIndex()
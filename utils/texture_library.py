@@ -0,0 +1,122 @@
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+from .file_detection import TEXTURE_EXTENSIONS, TextureDetector, TextureInfo
+from .texture_index import texture_index
+from .tree_index import IndexedFile, TreeIndex
+
+# Central texture library.
+#
+# Instead of copying a pack's atlas (and normal map) into every category
+# folder, textures can live once in a library directory. Texture names an
+# FBX references (from the file itself or from the material the importer
+# created) are resolved against the library by file name. Textures placed
+# in an input folder still win for their type, so a folder can override
+# the library. Because each texture then has one path, every folder shares
+# one cached image. The library listing is kept in a persistent tree index,
+# so a warm run only stats the directory.
+
+# Suffix Blender adds to duplicate datablock names ("Atlas.png.001")
+_DUPLICATE_SUFFIX = re.compile(r'\.\d{3}$')
+# Any image file extension: FBX files often reference the .psd/.tga a pack was authored with
+_IMAGE_EXTENSION = re.compile(r'\.[a-z]{3,4}$', re.IGNORECASE)
+
+def _classify_entry(entry: IndexedFile) -> Dict:
+    texture_type, confidence = TextureDetector._classify_texture(os.path.basename(entry.path))
+    return {'type': texture_type, 'confidence': confidence}
+
+def texture_stem(name: str) -> str:
+    """Lowercase file stem of a texture reference (path, file name or Blender image name)"""
+    base = os.path.basename(name.replace('\\', '/'))
+    base = _DUPLICATE_SUFFIX.sub('', base)
+    return _IMAGE_EXTENSION.sub('', base).lower()
+
+class TextureLibrary:
+    """Indexed texture directory, looked up by the texture names FBX files reference"""
+
+    def __init__(self, root_folder: str):
+        self.root_folder = os.path.normpath(root_folder)
+        self.tree = TreeIndex(self.root_folder, TEXTURE_EXTENSIONS)
+        self.by_stem: Dict[str, List[IndexedFile]] = {}
+        self._infos: Dict[str, TextureInfo] = {}
+        self.refresh()
+
+    def refresh(self):
+        """Re-stat the library and classify new or changed files"""
+        folders = self.tree.refresh(recursive=True)
+        self.tree.probe_stale(_classify_entry)
+        self.tree.save()
+        self.by_stem = {}
+        for entries in folders.values():
+            for entry in entries:
+                self.by_stem.setdefault(texture_stem(entry.path), []).append(entry)
+        self._infos = {}
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Library path for a texture reference, preferring the same extension and then the shallowest path"""
+        candidates = self.by_stem.get(texture_stem(name))
+        if not candidates:
+            return None
+        extension = os.path.splitext(name)[1].lower()
+        best = min(candidates, key=lambda entry: (entry.extension != extension,
+                                                  entry.path.count(os.sep), entry.path))
+        return best.path
+
+    def texture_info(self, path: str) -> TextureInfo:
+        info = self._infos.get(path)
+        if info is None:
+            entry = next(entry for entry in self.by_stem[texture_stem(path)] if entry.path == path)
+            probe = entry.probe or _classify_entry(entry)
+            info = TextureInfo(path, probe['type'], probe['confidence'], texture_index.probe(path))
+            self._infos[path] = info
+        return info
+
+    def textures_for(self, names: Iterable[str],
+                     folder_textures: Dict[str, List[TextureInfo]]) -> Dict[str, List[TextureInfo]]:
+        """
+        Folder textures completed with library textures for the referenced names.
+
+        A library texture is only used for a type the folder has no valid
+        texture of (per-folder override).
+        """
+        merged = {texture_type: list(textures) for texture_type, textures in folder_textures.items()}
+        overridden = {texture_type for texture_type, textures in folder_textures.items()
+                      if any(texture.is_valid for texture in textures)}
+        for name in dict.fromkeys(names):
+            path = self.resolve(name)
+            if path is None:
+                continue
+            info = self.texture_info(path)
+            if not info.is_valid or info.texture_type in overridden:
+                continue
+            textures = merged.setdefault(info.texture_type, [])
+            if all(texture.path != path for texture in textures):
+                textures.append(info)
+        return merged
+
+_libraries: Dict[str, TextureLibrary] = {}
+
+def get_texture_library(root_folder: str) -> Optional[TextureLibrary]:
+    """Up-to-date library for a directory (reused and re-stat across batches), or None if it doesn't exist"""
+    if not root_folder or not os.path.isdir(root_folder):
+        return None
+    key = os.path.normpath(os.path.abspath(root_folder))
+    library = _libraries.get(key)
+    if library is None:
+        library = TextureLibrary(key)
+        _libraries[key] = library
+    else:
+        library.refresh()
+    return library
+
+def referenced_texture_names(obj) -> List[str]:
+    """Texture file names referenced by the materials an importer created for an object"""
+    names = []
+    for slot in obj.material_slots:
+        material = slot.material
+        if material is None or not material.use_nodes or not material.node_tree:
+            continue
+        for node in material.node_tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image is not None:
+                names.append(node.image.filepath or node.image.name)
+    return names
@@ -0,0 +1,94 @@
+import os
+import shutil
+from typing import Optional
+from .hashing import hash_bytes
+from .texture_index import texture_index
+from ..utils.logging import logger
+
+# Write-once, content-addressed texture directory.
+#
+# Every texture is stored as <hash>.<ext> under the store root, so an atlas
+# used by hundreds of exported models is written (and encoded) exactly once
+# and every model's image URI points at the same file.
+
+TEXTURE_STORE_DIR = "textures"
+HASH_NAME_LENGTH = 16
+
+MIME_EXTENSIONS = {
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/webp': '.webp',
+    'image/ktx2': '.ktx2',
+}
+
+class TextureStore:
+    """Content-addressed texture files under one root folder"""
+
+    def __init__(self, root_folder: str):
+        self.root_folder = os.path.join(root_folder, TEXTURE_STORE_DIR)
+        self._known = set()  # File names known to exist in the store
+        self.written = 0
+        self.reused = 0
+
+    def _path_for(self, content_hash: str, extension: str) -> str:
+        return os.path.join(self.root_folder, f"{content_hash[:HASH_NAME_LENGTH]}{extension.lower()}")
+
+    def _exists(self, path: str) -> bool:
+        name = os.path.basename(path)
+        if name in self._known:
+            return True
+        if os.path.exists(path):
+            self._known.add(name)
+            return True
+        return False
+
+    def add_bytes(self, data: bytes, extension: str) -> str:
+        """Store encoded image bytes, returning the stored path"""
+        path = self._path_for(hash_bytes(data), extension)
+        if self._exists(path):
+            self.reused += 1
+            return path
+        os.makedirs(self.root_folder, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        self._known.add(os.path.basename(path))
+        self.written += 1
+        return path
+
+    def add_file(self, file_path: str, move: bool = False) -> Optional[str]:
+        """
+        Store an image file, returning the stored path.
+
+        With move=True the source is moved into the store (or deleted if the
+        store already has its content) instead of copied.
+        """
+        content_hash = texture_index.get_content_hash(file_path)
+        if content_hash is None:
+            logger.warning(f"Could not read texture for the shared store: {file_path}", "EXPORT")
+            return None
+        path = self._path_for(content_hash, os.path.splitext(file_path)[1])
+        if os.path.normcase(os.path.abspath(path)) == os.path.normcase(os.path.abspath(file_path)):
+            return path
+
+        if self._exists(path):
+            self.reused += 1
+            if move:
+                os.remove(file_path)
+            return path
+
+        os.makedirs(self.root_folder, exist_ok=True)
+        temp_path = path + ".tmp"
+        if move:
+            shutil.move(file_path, temp_path)
+        else:
+            shutil.copyfile(file_path, temp_path)
+        os.replace(temp_path, path)
+        self._known.add(os.path.basename(path))
+        self.written += 1
+        return path
+
+    def relative_uri(self, stored_path: str, from_folder: str) -> str:
+        """URI of a stored texture relative to an exported file's folder"""
+        return os.path.relpath(stored_path, from_folder).replace(os.sep, '/')
@@ -0,0 +1,116 @@
+import json
+import os
+from typing import List, Optional, Tuple
+from .cache_paths import get_cache_dir
+from ..utils.logging import logger
+
+# Per-file processing times and memory use from previous runs, used to
+# estimate how long a batch will take before it starts. Samples are kept per
+# category (the FBX import profile) and modelled as a linear function of the
+# FBX file size.
+
+TIMING_HISTORY_FILE = "timing_history.json"
+MAX_SAMPLES_PER_CATEGORY = 500
+
+# Used until a category has enough history of its own
+DEFAULT_BASE_SECONDS = 0.5
+DEFAULT_SECONDS_PER_MB = 1.0
+DEFAULT_MEMORY_PER_BYTE = 8.0
+
+class TimingHistory:
+    """Persistent store of per-file processing samples"""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.samples = None  # category -> [[file_size, seconds, memory_bytes], ...]
+            cls._instance._dirty = False
+        return cls._instance
+
+    def _history_path(self) -> str:
+        return os.path.join(get_cache_dir("history"), TIMING_HISTORY_FILE)
+
+    def _ensure_loaded(self):
+        if self.samples is not None:
+            return
+        self.samples = {}
+        try:
+            with open(self._history_path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.samples = {category: [list(sample) for sample in samples]
+                            for category, samples in data.get('samples', {}).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read timing history, starting fresh: {e}", "HISTORY")
+
+    def record(self, category: str, file_size: int, seconds: float, memory_bytes: Optional[int] = None):
+        """Record one processed file"""
+        self._ensure_loaded()
+        samples = self.samples.setdefault(category, [])
+        samples.append([file_size, seconds, memory_bytes])
+        if len(samples) > MAX_SAMPLES_PER_CATEGORY:
+            del samples[:len(samples) - MAX_SAMPLES_PER_CATEGORY]
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            path = self._history_path()
+            temp_path = path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'samples': self.samples}, f)
+            os.replace(temp_path, path)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Could not save timing history: {e}", "HISTORY")
+
+    def _samples_for(self, category: str, index: int) -> List[Tuple[float, float]]:
+        """(file_size, value) pairs for a category, falling back to all categories"""
+        self._ensure_loaded()
+        pairs = [(s[0], s[index]) for s in self.samples.get(category, []) if s[index] is not None]
+        if len(pairs) < 2:
+            pairs = [(s[0], s[index]) for samples in self.samples.values()
+                     for s in samples if s[index] is not None]
+        return pairs
+
+    def estimate_seconds(self, category: str, file_size: int) -> float:
+        pairs = self._samples_for(category, 1)
+        fit = _fit_linear(pairs)
+        if fit is None:
+            return DEFAULT_BASE_SECONDS + DEFAULT_SECONDS_PER_MB * file_size / (1024 * 1024)
+        intercept, slope = fit
+        return max(min(value for _, value in pairs), intercept + slope * file_size)
+
+    def estimate_memory(self, category: str, file_size: int) -> int:
+        pairs = self._samples_for(category, 2)
+        fit = _fit_linear(pairs)
+        if fit is None:
+            return int(DEFAULT_MEMORY_PER_BYTE * file_size)
+        intercept, slope = fit
+        return int(max(0.0, intercept + slope * file_size))
+
+    def sample_count(self, category: Optional[str] = None) -> int:
+        self._ensure_loaded()
+        if category is not None:
+            return len(self.samples.get(category, []))
+        return sum(len(samples) for samples in self.samples.values())
+
+def _fit_linear(pairs: List[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """Least-squares fit of value = intercept + slope * size"""
+    if not pairs:
+        return None
+    count = len(pairs)
+    mean_size = sum(size for size, _ in pairs) / count
+    mean_value = sum(value for _, value in pairs) / count
+    variance = sum((size - mean_size) ** 2 for size, _ in pairs)
+    if count < 2 or variance == 0:
+        return mean_value, 0.0
+    covariance = sum((size - mean_size) * (value - mean_value) for size, value in pairs)
+    slope = max(0.0, covariance / variance)
+    return mean_value - slope * mean_size, slope
+
+# Global timing history instance
+timing_history = TimingHistory()
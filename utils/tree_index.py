@@ -0,0 +1,128 @@
+import json
+import os
+from typing import Callable, Dict, List, Optional
+from .cache_paths import get_cache_dir
+from .hashing import hash_bytes
+from ..utils.logging import logger
+
+# Cached index of an input folder tree.
+#
+# Remembers the size and mtime of every indexed file together with whatever
+# probe results were computed for it (FBX header status, image headers, ...).
+# Refreshing the index only stats files; probes are re-run only for files
+# whose size or mtime changed, so repeated previews of a large pack never
+# reopen unchanged files.
+
+TREE_INDEX_CACHE = "tree_index"
+TREE_INDEX_VERSION = 1
+
+class IndexedFile:
+    """A file in the tree index with its cached probe result"""
+    def __init__(self, path: str, size: int, mtime_ns: int, probe: Optional[Dict] = None):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.probe = probe
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.path)[1].lower()
+
+class TreeIndex:
+    """Persistent size/mtime/probe index for one root folder"""
+
+    def __init__(self, root_folder: str, extensions: set):
+        self.root_folder = os.path.normpath(root_folder)
+        self.extensions = {ext.lower() for ext in extensions}
+        self.folders: Dict[str, List[IndexedFile]] = {}
+        self._cached: Dict[str, IndexedFile] = {}
+        self._dirty = False
+
+        root_key = hash_bytes(os.path.abspath(self.root_folder).encode('utf-8'))[:16]
+        self.index_path = os.path.join(get_cache_dir(TREE_INDEX_CACHE), f"{root_key}.json")
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable tree index: {e}", "INDEX")
+            return
+        if data.get('version') != TREE_INDEX_VERSION:
+            return
+        for path, (size, mtime_ns, probe) in data.get('files', {}).items():
+            self._cached[path] = IndexedFile(path, size, mtime_ns, probe)
+
+    def save(self):
+        if not self._dirty:
+            return
+        files = {entry.path: [entry.size, entry.mtime_ns, entry.probe]
+                 for entries in self.folders.values() for entry in entries}
+        try:
+            temp_path = self.index_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': TREE_INDEX_VERSION, 'root': self.root_folder, 'files': files}, f)
+            os.replace(temp_path, self.index_path)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Could not save tree index: {e}", "INDEX")
+
+    def refresh(self, recursive: bool = True) -> Dict[str, List[IndexedFile]]:
+        """
+        Re-stat the tree and return indexed files grouped by folder.
+
+        Cached probe results are kept for files whose size and mtime are
+        unchanged; everything else has its probe cleared.
+        """
+        folders: Dict[str, List[IndexedFile]] = {}
+        pending = [self.root_folder]
+        while pending:
+            folder = pending.pop()
+            entries = []
+            try:
+                with os.scandir(folder) as iterator:
+                    for dir_entry in iterator:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                pending.append(dir_entry.path)
+                            continue
+                        if os.path.splitext(dir_entry.name)[1].lower() not in self.extensions:
+                            continue
+                        stat = dir_entry.stat()
+                        cached = self._cached.get(dir_entry.path)
+                        if cached and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+                            entries.append(cached)
+                        else:
+                            entries.append(IndexedFile(dir_entry.path, stat.st_size, stat.st_mtime_ns))
+                            self._dirty = True
+            except OSError as e:
+                logger.error(f"Error indexing folder {folder}: {e}", "INDEX")
+                continue
+            if entries:
+                entries.sort(key=lambda entry: entry.path)
+                folders[folder] = entries
+
+        if set(self._cached) != {entry.path for entries in folders.values() for entry in entries}:
+            self._dirty = True  # Files were removed
+        self.folders = folders
+        self._cached = {entry.path: entry for entries in folders.values() for entry in entries}
+        return folders
+
+    def stale_entries(self) -> List[IndexedFile]:
+        """Indexed files without a cached probe result"""
+        return [entry for entries in self.folders.values() for entry in entries if entry.probe is None]
+
+    def set_probe(self, entry: IndexedFile, probe: Dict):
+        entry.probe = probe
+        self._dirty = True
+
+    def probe_stale(self, probe_func: Callable[[IndexedFile], Dict], pool=None):
+        """Run probe_func for every stale entry, optionally on a thread pool"""
+        stale = self.stale_entries()
+        results = pool.map(probe_func, stale) if pool is not None else map(probe_func, stale)
+        for entry, probe in zip(stale, results):
+            self.set_probe(entry, probe)
+        return len(stale)